@@ -0,0 +1,130 @@
+# analitik_diff.py
+# Perbandingan antar periode untuk hasil olahan Analitik Produk Shopee (lihat shopee.process_analitik).
+# Setiap periode = satu export yang sudah diolah (baris total produk + variasi + Grand Total).
+# Semua periode digabung dengan satu hash-join (groupby ngroup atas kunci Kode Produk × NamaVariasiBase),
+# nilai metrik diisi ke array [kunci, periode, metrik], lalu Δ, Δ% dan perubahan rasio dihitung vektor.
+# Baris yang tidak ada di suatu periode bernilai 0 dan ditandai di kolom "Status" (baru / hilang).
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+COL_KODE, COL_VARIASI, COL_BASE = "Kode Produk", "Nama Variasi", "NamaVariasiBase"
+KEYS = [COL_KODE, COL_BASE]
+COL_STATUS, COL_TIPE = "Status", "Tipe Baris"
+TEXT_COLS = ["Produk", "SKU Induk"]
+GRAND_TOTAL = "Total"
+
+
+def keyed(df_final: pd.DataFrame, metrics: Sequence[str]) -> pd.DataFrame:
+    # Hasil olahan -> kunci join + metrik numerik; baris Grand Total dibuang (dihitung ulang setelah join)
+    df = df_final[df_final[COL_KODE].astype(str) != GRAND_TOTAL]
+    out = pd.DataFrame({COL_KODE: df[COL_KODE].astype(str).to_numpy(),
+                        COL_BASE: df[COL_VARIASI].astype(str).str.strip().replace({"-": ""}).to_numpy()})
+    for c in TEXT_COLS:
+        if c in df.columns:
+            out[c] = df[c].to_numpy()
+    for c in metrics:
+        out[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy(dtype="float64") if c in df.columns else 0.0
+    return out
+
+
+def delta_columns(metric: str) -> Tuple[str, str]:
+    return f"Δ {metric}", f"Δ% {metric}"
+
+
+def rate_change_column(rate: str) -> str:
+    return f"Δ {rate} (poin)"
+
+
+def compare(frames: List[pd.DataFrame], labels: List[str], metrics: Sequence[str],
+            rates: Dict[str, Tuple[str, str]], base: int = -2, sort_metric: str = None,
+            show: Sequence[str] = None) -> pd.DataFrame:
+    # frames: hasil keyed() per periode, urut lama -> baru. Periode terakhir dibandingkan dengan frames[base].
+    # show: metrik yang dikeluarkan kolomnya (default semua); rasio tetap dihitung dari semua metrik.
+    # Kolom hasil: kunci, teks, "<metrik> [<label>]" per periode, Δ / Δ% (terakhir vs base),
+    # "<rasio> [<label>]" (angka pecahan) per periode + perubahan rasio dalam poin persen, Status, Tipe Baris.
+    metrics = list(metrics)
+    n = len(frames)
+    cur = n - 1
+    base = base % n
+    long = pd.concat([f.assign(_periode=i) for i, f in enumerate(frames)], ignore_index=True, sort=False)
+    code = long.groupby(KEYS, sort=False, dropna=False).ngroup().to_numpy()
+    n_keys = int(code.max()) + 1 if len(code) else 0
+    period = long["_periode"].to_numpy()
+
+    values = np.zeros((n_keys, n, len(metrics)))
+    np.add.at(values, (code, period), long[metrics].to_numpy(dtype="float64"))
+    present = np.zeros((n_keys, n), dtype=bool)
+    present[code, period] = True
+
+    # Kunci & teks diambil dari periode terbaru yang memuat baris tersebut
+    latest = long.assign(_code=code).sort_values("_periode", ascending=False, kind="stable").drop_duplicates("_code")
+    latest = latest.set_index("_code").sort_index()
+    base_name = latest[COL_BASE].to_numpy()
+    is_total = base_name == ""
+    # Urutan kolom seperti hasil olahan: Kode Produk, Produk, Nama Variasi, SKU Induk
+    out = pd.DataFrame({COL_KODE: latest[COL_KODE].to_numpy()})
+    if "Produk" in latest.columns:
+        out["Produk"] = latest["Produk"].to_numpy()
+    out[COL_VARIASI] = np.where(is_total, "-", base_name)
+    for c in TEXT_COLS:
+        if c in latest.columns and c not in out.columns:
+            out[c] = latest[c].to_numpy()
+
+    show = metrics if show is None else [m for m in metrics if m in set(show)]
+    for m in show:
+        k = metrics.index(m)
+        for i, label in enumerate(labels):
+            out[f"{m} [{label}]"] = values[:, i, k]
+        d_col, pct_col = delta_columns(m)
+        a, b = values[:, cur, k], values[:, base, k]
+        out[d_col] = a - b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[pct_col] = np.where(b != 0, (a - b) / np.abs(b), np.nan)
+
+    rates = {r: nd for r, nd in rates.items() if nd[0] in metrics and nd[1] in metrics}
+    for rate, (num, den) in rates.items():
+        nk, dk = metrics.index(num), metrics.index(den)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.where(values[:, :, dk] != 0, values[:, :, nk] / values[:, :, dk], 0.0)
+        for i, label in enumerate(labels):
+            out[f"{rate} [{label}]"] = r[:, i]
+        out[rate_change_column(rate)] = r[:, cur] - r[:, base]
+
+    out[COL_STATUS] = np.select([present[:, cur] & ~present[:, base], ~present[:, cur] & present[:, base]], ["baru", "hilang"], "")
+    out[COL_TIPE] = np.where(is_total, "Total", "~")
+
+    # Urutan seperti hasil olahan: produk menurut metrik urut (periode terbaru) pada baris totalnya, total di atas variasinya
+    sort_k = metrics.index(sort_metric) if sort_metric in metrics else 0
+    sales = values[:, cur, sort_k]
+    product_codes, product_idx = np.unique(out[COL_KODE].to_numpy(dtype=str), return_inverse=True)
+    product_sales = np.zeros(len(product_codes))
+    np.maximum.at(product_sales, product_idx[is_total], sales[is_total])
+    order = np.lexsort((-sales, ~is_total, product_idx, -product_sales[product_idx]))
+    out = out.iloc[order].reset_index(drop=True)
+    return pd.concat([out, grand_total(out, values[order][is_total[order]], metrics, show, labels, rates, cur, base)],
+                     ignore_index=True)
+
+
+def grand_total(out: pd.DataFrame, total_values: np.ndarray, metrics: List[str], show: List[str], labels: List[str],
+                rates: Dict[str, Tuple[str, str]], cur: int, base: int) -> pd.DataFrame:
+    # Jumlah baris total produk; rasio dihitung ulang dari jumlah (bukan rata-rata rasio)
+    sums = total_values.sum(axis=0)  # [periode, metrik]
+    row = {c: "-" for c in out.columns}
+    row.update({COL_KODE: GRAND_TOTAL, COL_STATUS: "", COL_TIPE: "Total"})
+    for m in show:
+        k = metrics.index(m)
+        for i, label in enumerate(labels):
+            row[f"{m} [{label}]"] = sums[i, k]
+        d_col, pct_col = delta_columns(m)
+        row[d_col] = sums[cur, k] - sums[base, k]
+        row[pct_col] = (sums[cur, k] - sums[base, k]) / abs(sums[base, k]) if sums[base, k] else np.nan
+    for rate, (num, den) in rates.items():
+        nk, dk = metrics.index(num), metrics.index(den)
+        r = np.where(sums[:, dk] != 0, sums[:, nk] / np.where(sums[:, dk] != 0, sums[:, dk], 1), 0.0)
+        for i, label in enumerate(labels):
+            row[f"{rate} [{label}]"] = r[i]
+        row[rate_change_column(rate)] = r[cur] - r[base]
+    return pd.DataFrame([row])
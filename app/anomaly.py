@@ -0,0 +1,212 @@
+# anomaly.py
+# Deteksi anomali harian per entitas × metrik di atas kubus 3-D [entitas, hari, metrik] (float32, NaN = tidak ada data).
+# Nilai hari d dibandingkan dengan baseline W hari sebelumnya (hari d sendiri tidak ikut):
+#   "mad"    -> median & MAD (robust, tahan lonjakan satu hari); skala = 1.4826 × MAD
+#   "zscore" -> rata-rata & standar deviasi dari prefix-sum (O(1) per sel, paling cepat)
+# Skor z = (nilai - baseline) / skala. Sel dengan histori < min_periods atau skala 0 tidak diberi skor.
+#
+# Median bergulir tidak memakai np.nanmedian (sort per jendela, lambat): W irisan hari digeser diurutkan
+# sekaligus dengan sorting network (odd-even transposition) berbasis np.minimum/np.maximum elemen-per-elemen,
+# NaN diganti +inf agar selalu di ujung, lalu median diambil sesuai jumlah nilai valid tiap sel.
+# Kubus diproses per blok entitas supaya array kerja muat di cache CPU.
+
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import exporter
+import xlstyle
+
+METHODS = {"mad": "Median/MAD (robust)", "zscore": "Rata-rata/std (z-score)"}
+MAD_SCALE = 1.4826        # MAD -> setara standar deviasi untuk data normal
+MEAN_AD_SCALE = 1.2533    # mean absolute deviation -> setara standar deviasi (cadangan saat MAD = 0)
+BLOCK = 64                # entitas per blok
+
+
+def build_cube(table: pd.DataFrame, entity_col: str, date_col: str,
+               metrics: List[str]) -> Tuple[np.ndarray, pd.Index, pd.DatetimeIndex]:
+    # Tabel panjang (satu baris per entitas × tanggal) -> kubus [entitas, hari, metrik] di sumbu tanggal kontinu
+    dates = pd.to_datetime(table[date_col]).dt.normalize()
+    codes, entities = pd.factorize(table[entity_col], sort=True)
+    if not len(table):
+        return np.empty((0, 0, len(metrics)), dtype=np.float32), entities, pd.DatetimeIndex([])
+    axis = pd.date_range(dates.min(), dates.max(), freq="D")
+    day = (dates - axis[0]).dt.days.to_numpy()
+    cube = np.full((len(entities), len(axis), len(metrics)), np.nan, dtype=np.float32)
+    cube[codes, day] = table[metrics].to_numpy(dtype="float32", na_value=np.nan)
+    return cube, entities, axis
+
+
+def _sort_lanes(lanes: List[np.ndarray]) -> None:
+    # Odd-even transposition sort di tempat: setelah len(lanes) ronde, lanes[0] <= lanes[1] <= ... per elemen
+    n = len(lanes)
+    for r in range(n):
+        for i in range(r % 2, n - 1, 2):
+            lo = np.minimum(lanes[i], lanes[i + 1])
+            np.maximum(lanes[i], lanes[i + 1], out=lanes[i + 1])
+            lanes[i] = lo
+
+
+def _median_sorted(lanes: List[np.ndarray], count: np.ndarray) -> np.ndarray:
+    # Median dari lanes terurut dengan jumlah nilai valid berbeda per sel (nilai valid ada di depan).
+    # Sel dengan jendela penuh (mayoritas) langsung dari dua lane tengah; sisanya diambil per sel.
+    n = len(lanes)
+    med = (lanes[(n - 1) // 2] + lanes[n // 2]) * 0.5
+    partial = count < n
+    if partial.any():
+        sub = np.stack([lane[partial] for lane in lanes])
+        c = count[partial].astype(np.intp)
+        lo, hi = np.maximum(c - 1, 0) // 2, c // 2
+        cols = np.arange(len(c))
+        with np.errstate(invalid="ignore"):
+            vals = (sub[lo, cols] + sub[np.minimum(hi, n - 1), cols]) * 0.5
+        vals[c == 0] = np.nan
+        med[partial] = vals
+    return med
+
+
+def _shifted(block: np.ndarray, window: int) -> List[np.ndarray]:
+    # lanes[k][:, d] = nilai hari d - window + k (NaN sebelum awal data)
+    n_days = block.shape[1]
+    pad = np.concatenate([np.full((block.shape[0], window, block.shape[2]), np.nan, dtype=block.dtype), block], axis=1)
+    return [pad[:, k:k + n_days] for k in range(window)]
+
+
+def _mad_block(block: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    count = np.zeros(block.shape, dtype=np.int8)
+    lanes = []
+    for s in _shifted(block, window):
+        missing = np.isnan(s)
+        count += ~missing
+        lanes.append(np.where(missing, np.float32(np.inf), s))
+    _sort_lanes(lanes)
+    center = _median_sorted(lanes, count)
+
+    # Deviasi nilai kosong tetap +inf (inf - median); sel tanpa median (NaN) tidak dipakai pemanggil
+    dev = [np.abs(lane - center) for lane in lanes]
+    _sort_lanes(dev)
+    scale = _median_sorted(dev, count) * MAD_SCALE
+
+    # MAD = 0 (lebih dari separuh jendela bernilai sama, mis. banyak hari 0): pakai mean absolute deviation
+    flat = (scale == 0) & (count > 0)
+    if flat.any():
+        total = sum(np.where(np.isinf(d[flat]), 0, d[flat]) for d in dev)
+        scale[flat] = total / count[flat] * MEAN_AD_SCALE
+    return center, scale, count
+
+
+def _zscore_block(block: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Jumlah, jumlah kuadrat, dan jumlah nilai valid di [d - window, d) dari prefix-sum sepanjang sumbu hari
+    valid = ~np.isnan(block)
+    x = np.where(valid, block, 0).astype(np.float64)
+
+    def window_sum(a):
+        c = np.zeros((a.shape[0], a.shape[1] + 1, a.shape[2]), dtype=a.dtype)
+        np.cumsum(a, axis=1, out=c[:, 1:])
+        end = np.arange(a.shape[1])
+        return c[:, end] - c[:, np.maximum(end - window, 0)]
+
+    count = window_sum(valid.astype(np.int64))
+    s, s2 = window_sum(x), window_sum(x * x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        center = s / count
+        var = np.maximum(s2 / count - center * center, 0) * count / (count - 1)
+    return center, np.sqrt(var), count
+
+
+class AnomalyScan:
+    def __init__(self, table: pd.DataFrame, entity_col: str, date_col: str, metrics: List[str],
+                 window: int = 7, method: str = "mad", min_periods: int = 3):
+        if method not in METHODS:
+            raise ValueError(f"Metode anomali tidak dikenal: {method}")
+        self.entity_col, self.metrics = entity_col, list(metrics)
+        self.window, self.method, self.min_periods = window, method, max(min_periods, 2)
+        self.values, self.entities, self.dates = build_cube(table, entity_col, date_col, self.metrics)
+
+        self.center = np.full(self.values.shape, np.nan, dtype=np.float32)
+        self.z = np.full(self.values.shape, np.nan, dtype=np.float32)
+        baseline = _mad_block if method == "mad" else _zscore_block
+        for i in range(0, len(self.entities), BLOCK):
+            block = self.values[i:i + BLOCK]
+            center, scale, count = baseline(block, window)
+            ok = (count >= self.min_periods) & (scale > 0) & ~np.isnan(block)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.z[i:i + BLOCK] = np.where(ok, (block - center) / scale, np.nan)
+            self.center[i:i + BLOCK] = np.where(count >= self.min_periods, center, np.nan)
+
+    def alerts(self, threshold: float = 3.0, latest_only: bool = False, direction: Optional[str] = None) -> pd.DataFrame:
+        # Satu baris per sel anomali, diurutkan dari |z| terbesar; direction: None / "naik" / "turun"
+        score = np.abs(self.z)
+        with np.errstate(invalid="ignore"):
+            mask = score >= threshold
+        if latest_only:
+            mask[:, :-1] = False
+        if direction == "naik":
+            mask &= self.z > 0
+        elif direction == "turun":
+            mask &= self.z < 0
+        e, d, m = np.nonzero(mask)
+        order = np.argsort(-score[e, d, m], kind="stable")
+        e, d, m = e[order], d[order], m[order]
+
+        nilai = self.values[e, d, m].astype(np.float64)
+        baseline = self.center[e, d, m].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(baseline != 0, (nilai - baseline) / np.abs(baseline), np.nan)
+        z = self.z[e, d, m].astype(np.float64)
+        return pd.DataFrame({
+            self.entity_col: self.entities[e],
+            "Tanggal": self.dates[d],
+            "Metrik": np.asarray(self.metrics, dtype=object)[m],
+            "Nilai": nilai,
+            "Baseline": baseline,
+            "Perubahan %": pct,
+            "Skor z": z,
+            "Arah": np.where(z > 0, "naik", "turun"),
+        })
+
+    def workbook(self, alerts: pd.DataFrame, percent_metrics: Tuple[str, ...] = ()) -> bytes:
+        # Sheet ALERT (berwarna naik/turun) + satu sheet per metrik: entitas yang punya alert × tanggal,
+        # sel anomali diberi warna. percent_metrics memakai format persen.
+        styles = xlstyle.OpenpyxlStyles()
+        out = BytesIO()
+        with pd.ExcelWriter(out, engine="openpyxl") as writer:
+            alerts.to_excel(writer, sheet_name="ALERT", index=False)
+            ws = writer.sheets["ALERT"]
+            exporter.autofit(ws, alerts, min_width=10)
+            cols = {c: i + 1 for i, c in enumerate(alerts.columns)}
+            styles.apply_range(ws, "tanggal", min_col=cols["Tanggal"], max_col=cols["Tanggal"])
+            styles.apply_range(ws, "ribuan", min_col=cols["Nilai"], max_col=cols["Baseline"])
+            styles.apply_range(ws, "persen", min_col=cols["Perubahan %"], max_col=cols["Perubahan %"])
+            styles.apply_range(ws, "desimal", min_col=cols["Skor z"], max_col=cols["Skor z"])
+            for r, arah in enumerate(alerts["Arah"], start=2):
+                styles.apply_row(ws, r, arah)
+
+            flagged = np.zeros(self.values.shape, dtype=bool)
+            if len(alerts):
+                e = self.entities.get_indexer(alerts[self.entity_col])
+                d = self.dates.get_indexer(alerts["Tanggal"])
+                m = pd.Index(self.metrics).get_indexer(alerts["Metrik"])
+                flagged[e, d, m] = True
+            used = set()
+            for k, metric in enumerate(self.metrics):
+                rows = np.flatnonzero(flagged[:, :, k].any(axis=1))
+                if not len(rows):
+                    continue
+                name = metric[:31]
+                while name in used:
+                    name = f"{metric[:28]}_{len(used)}"
+                used.add(name)
+                wide = pd.DataFrame(self.values[rows, :, k], index=pd.Index(self.entities[rows], name=self.entity_col),
+                                    columns=self.dates.strftime("%Y-%m-%d"))
+                wide.to_excel(writer, sheet_name=name)
+                ws = writer.sheets[name]
+                exporter.autofit(ws, wide.reset_index(), min_width=10)
+                num = "persen" if metric in percent_metrics else "ribuan"
+                styles.apply_range(ws, num, min_col=2)
+                sign = np.sign(self.z[rows, :, k])
+                for r, c in zip(*np.nonzero(flagged[rows, :, k])):
+                    styles.apply(ws.cell(row=r + 2, column=c + 2), num, "naik" if sign[r, c] > 0 else "turun")
+        return out.getvalue()
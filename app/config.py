@@ -0,0 +1,57 @@
+# config.py
+# Pengaturan global dashboard yang bisa diubah lewat environment variable.
+
+import os
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Instrumentasi per tahap (timing, baris, RSS). Bisa juga dinyalakan dari sidebar.
+PERF_DEFAULT = _env_flag("ADS_PERF", False)
+# Opsional: tulis log JSON instrumentasi ke file ini (selain ke stderr).
+PERF_LOG_FILE = os.environ.get("ADS_PERF_LOG_FILE", "")
+
+# Jumlah baris per halaman untuk preview tabel di UI.
+PREVIEW_PAGE_SIZE = int(os.environ.get("ADS_PREVIEW_ROWS", "100"))
+
+# Jumlah worker process untuk pemrosesan banyak file (0 = otomatis, maks 4).
+MAX_WORKERS = int(os.environ.get("ADS_MAX_WORKERS", "0"))
+
+# Folder data lokal (histori, cache, job). Default: app/.data
+DATA_DIR = os.environ.get("ADS_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data"))
+
+# Export streaming: jumlah baris per chunk & batas memori sebelum file sementara dipindah ke disk.
+EXPORT_CHUNK_ROWS = int(os.environ.get("ADS_EXPORT_CHUNK_ROWS", "50000"))
+SPOOL_MAX_MB = int(os.environ.get("ADS_SPOOL_MAX_MB", "16"))
+
+# Job latar belakang (export berat): jumlah worker (0 = otomatis), retensi hasil, interval refresh panel.
+JOB_WORKERS = int(os.environ.get("ADS_JOB_WORKERS", "0"))
+JOB_RETENTION_HOURS = float(os.environ.get("ADS_JOB_RETENTION_HOURS", "24"))
+JOB_POLL_SECONDS = float(os.environ.get("ADS_JOB_POLL_SECONDS", "1.5"))
+
+# Autofit lebar kolom Excel: maksimal baris yang diambil sebagai sampel per kolom teks.
+AUTOFIT_SAMPLE_ROWS = int(os.environ.get("ADS_AUTOFIT_SAMPLE_ROWS", "2000"))
+
+# Cache Daily Ads Comparator TikTok: budget memori (MB, dihitung dari memory_usage(deep=True))
+# dan kebijakan eviksi saat budget terlampaui: "lru" atau "oldest" (tanggal laporan paling tua).
+COMPARATOR_CACHE_MB = float(os.environ.get("ADS_COMPARATOR_CACHE_MB", "512"))
+COMPARATOR_EVICTION = os.environ.get("ADS_COMPARATOR_EVICTION", "lru").strip().lower()
+
+# Cache hasil parse upload lintas sesi (upload_cache.py): budget memori tabel Arrow (MB),
+# spill ke <DATA_DIR>/upload_cache + memory-map (dipakai bersama worker process), retensi file spill.
+UPLOAD_CACHE_MB = float(os.environ.get("ADS_UPLOAD_CACHE_MB", "256"))
+UPLOAD_CACHE_SPILL = _env_flag("ADS_UPLOAD_CACHE_SPILL", False)
+UPLOAD_CACHE_RETENTION_HOURS = float(os.environ.get("ADS_UPLOAD_CACHE_RETENTION_HOURS", "24"))
+
+# Data lake lokal (lake.py): frame akhir tiap pipeline disimpan sebagai Parquet di <DATA_DIR>/lake
+# dan bisa di-query dengan DuckDB dari halaman Query. Set ADS_LAKE=0 untuk mematikan penyimpanan.
+LAKE_ENABLED = _env_flag("ADS_LAKE", True)
+
+# Backend baca Excel (excel_reader.py): "openpyxl" (default), "calamine", atau "auto" (calamine bila python-calamine
+# terpasang). calamine bersifat opt-in sampai benchmarks/bench_excel_reader.py lolos parity di export asli.
+EXCEL_READER = os.environ.get("ADS_EXCEL_READER", "openpyxl").strip().lower()
@@ -0,0 +1,116 @@
+# dtype_plan.py
+# Rencana dtype hemat memori untuk frame hasil loader.
+# - Kolom kategori yang dikenal (Channel, Status, Produk, Kode Produk, ...) -> category
+# - Kolom ID -> string kompak (Arrow-backed jika pyarrow tersedia)
+# - Metrik numerik -> int32/float32 selama tidak mengubah nilai (lossless);
+#   float32 "lossy" hanya untuk kolom rasio/persentase yang memang diizinkan.
+# Kolom teks lain dengan kardinalitas rendah ikut dijadikan category.
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+KNOWN_CATEGORICAL = [
+    "Channel", "Status", "Produk", "Kode Produk", "SKU Induk", "Nama Produk",
+    "Nama Iklan", "Nama Kampanye", "Nama akun", "Mode Bidding", "Penempatan Iklan",
+]
+KNOWN_ID = ["ID", "ID Campaign", "ID Kampanye", "ID Produk", "Kode Variasi"]
+RATIO_KEYWORDS = ["rasio", "persentase", "konversi", "ctr", "ratio", "tingkat", "%"]
+
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+AUTO_CATEGORY_MAX_RATIO = 0.5
+
+
+def compact_string_dtype():
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype("pyarrow")
+    except ImportError:
+        return pd.StringDtype()
+
+
+def is_ratio_col(name) -> bool:
+    low = str(name).lower()
+    return any(k in low for k in RATIO_KEYWORDS)
+
+
+def _all_str(s: pd.Series) -> bool:
+    vals = s.dropna()
+    if pd.api.types.is_string_dtype(s.dtype) and not pd.api.types.is_object_dtype(s.dtype):
+        return True
+    return bool(vals.map(type).eq(str).all()) if len(vals) else False
+
+
+def _numeric_target(s: pd.Series, allow_lossy_float: bool) -> Optional[str]:
+    if pd.api.types.is_bool_dtype(s.dtype):
+        return None
+    if pd.api.types.is_integer_dtype(s.dtype):
+        if s.dtype.itemsize <= 4 or s.empty:
+            return None
+        return "int32" if INT32_MIN <= s.min() and s.max() <= INT32_MAX else None
+    if not pd.api.types.is_float_dtype(s.dtype) or s.dtype.itemsize <= 4:
+        return None
+    arr = s.to_numpy(dtype="float64", na_value=np.nan)
+    finite = arr[~np.isnan(arr)]
+    if finite.size == len(arr) and finite.size and np.all(finite == np.round(finite)) \
+            and finite.min() >= INT32_MIN and finite.max() <= INT32_MAX:
+        return "int32"
+    if allow_lossy_float:
+        return "float32"
+    # float32 hanya jika semua nilai kembali persis sama (tidak ada nilai yang berubah)
+    return "float32" if np.array_equal(arr.astype("float32").astype("float64"), arr, equal_nan=True) else None
+
+
+def plan_dtypes(
+    df: pd.DataFrame,
+    categorical: Iterable = KNOWN_CATEGORICAL,
+    ids: Iterable = KNOWN_ID,
+    exclude: Iterable = (),
+    lossy_float_cols: Iterable = (),
+    auto_categorical: bool = True,
+) -> Dict[str, object]:
+    categorical, ids, exclude, lossy = set(categorical), set(ids), set(exclude), set(lossy_float_cols)
+    plan = {}
+    n_rows = len(df)
+    for col in df.columns:
+        if col in exclude:
+            continue
+        s = df[col]
+        if isinstance(s, pd.DataFrame):  # nama kolom duplikat
+            continue
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            continue
+        if col in ids:
+            if not pd.api.types.is_numeric_dtype(s.dtype):
+                plan[col] = compact_string_dtype()
+            continue
+        if pd.api.types.is_numeric_dtype(s.dtype):
+            target = _numeric_target(s, col in lossy)
+            if target:
+                plan[col] = target
+            continue
+        if not (pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype)):
+            continue
+        # Hanya kolom yang isinya murni teks (campuran angka/teks dibiarkan apa adanya)
+        if not _all_str(s):
+            continue
+        if col in categorical:
+            plan[col] = "category"
+        elif auto_categorical and n_rows and s.nunique(dropna=True) <= AUTO_CATEGORY_MAX_RATIO * n_rows:
+            plan[col] = "category"
+    return plan
+
+
+def apply_plan(df: pd.DataFrame, plan: Dict[str, object]) -> pd.DataFrame:
+    if not plan:
+        return df
+    return df.astype({c: t for c, t in plan.items() if c in df.columns})
+
+
+def optimize(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    return apply_plan(df, plan_dtypes(df, **kwargs))
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
@@ -0,0 +1,76 @@
+# excel_reader.py
+# Satu pintu baca Excel untuk semua loader (Shopee Out, Analitik, Meta KPI, TikTok Fixer & Daily).
+#
+# Backend dipilih lewat config.EXCEL_READER (env ADS_EXCEL_READER):
+#   "openpyxl" -> jalur lama (default)
+#   "calamine" -> calamine; jika belum terpasang diberi peringatan lalu memakai openpyxl
+#   "auto"     -> calamine bila python-calamine terpasang, selain itu openpyxl
+# calamine opsional (pip install python-calamine, tidak ada di requirements.txt) dan baru diaktifkan setelah
+# benchmarks/bench_excel_reader.py dijalankan dengan export asli dan parity-nya lolos.
+# calamine (Rust) mem-parse XML sheet jauh lebih cepat daripada openpyxl dan juga membaca .xls/.xlsb/.ods.
+# pandas menyediakannya sebagai engine="calamine", jadi hasilnya tetap DataFrame pandas yang sama
+# (angka bulat -> int, tanggal -> datetime, seperti openpyxl). Jalur openpyxl memakai engine bawaan pandas
+# (openpyxl untuk .xlsx, xlrd untuk .xls), sama seperti sebelumnya.
+
+import warnings
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+READERS = ("auto", "calamine", "openpyxl")
+
+
+def _resolve(reader: str) -> Optional[str]:
+    # Nilai selain "auto"/"calamine" (termasuk kosong / salah ketik) -> openpyxl
+    if reader not in ("auto", "calamine"):
+        return None
+    if HAS_CALAMINE:
+        return "calamine"
+    if reader == "calamine":
+        warnings.warn("ADS_EXCEL_READER=calamine tetapi python-calamine belum terpasang; memakai openpyxl.")
+    return None
+
+
+ENGINE = _resolve(config.EXCEL_READER)
+
+
+def backend() -> str:
+    return ENGINE or "openpyxl"
+
+
+def _source(src):
+    return BytesIO(src) if isinstance(src, (bytes, bytearray)) else src
+
+
+def read_excel(src, engine: Optional[str] = ENGINE, **kwargs) -> pd.DataFrame:
+    # src: bytes, file-like, path, atau pd.ExcelFile (engine-nya mengikuti ExcelFile tersebut)
+    if isinstance(src, pd.ExcelFile):
+        return src.parse(**kwargs)
+    return pd.read_excel(_source(src), engine=engine, **kwargs)
+
+
+def excel_file(src, engine: Optional[str] = ENGINE) -> pd.ExcelFile:
+    # Workbook dibuka sekali untuk membaca beberapa sheet
+    return pd.ExcelFile(_source(src), engine=engine)
+
+
+def first_cell(src, sheet_name=0, engine: Optional[str] = ENGINE):
+    # Nilai A1 (mis. tanggal laporan TikTok) tanpa memuat seluruh workbook; kosong -> None
+    df = read_excel(src, engine=engine, sheet_name=sheet_name, header=None, nrows=1)
+    if df.empty or pd.isna(df.iat[0, 0]):
+        return None
+    value = df.iat[0, 0]
+    # Tipe Python biasa seperti sel openpyxl (bukan numpy / Timestamp)
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,198 @@
+# exporter.py
+# Jalur export bertahap (streaming) untuk output besar.
+# DataFrame ditulis per chunk ke SpooledTemporaryFile: kecil tetap di memori, besar otomatis
+# dipindah ke disk. Jadi teks CSV lengkap tidak pernah dibuat sebagai satu string + satu bytes.
+# st.download_button tetap butuh bytes, jadi isi file hanya dibaca sekali di akhir (read_bytes).
+
+import gzip
+import tempfile
+import zipfile
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+
+CSV_MIME = "text/csv"
+GZIP_MIME = "application/gzip"
+PARQUET_MIME = "application/vnd.apache.parquet"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MIME = "application/zip"
+
+# Tipe hasil infer_dtype yang bisa langsung ditulis Arrow tanpa diubah
+_ARROW_OK = {"string", "empty", "integer", "floating", "mixed-integer-float", "boolean", "datetime", "datetime64", "date", "decimal", "bytes"}
+
+
+def spooled_file():
+    return tempfile.SpooledTemporaryFile(max_size=config.SPOOL_MAX_MB * 1024 * 1024, mode="w+b")
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: Optional[int] = None, index: bool = False,
+                    encoding: str = "utf-8", **to_csv_kwargs) -> Iterator[bytes]:
+    # Header hanya di chunk pertama; tiap chunk di-encode lalu langsung dilepas
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    if df.empty:
+        yield df.to_csv(index=index, **to_csv_kwargs).encode(encoding)
+        return
+    for start in range(0, len(df), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        yield part.to_csv(index=index, header=(start == 0), **to_csv_kwargs).encode(encoding)
+
+
+def csv_file(df: pd.DataFrame, compress: bool = False, chunk_rows: Optional[int] = None, **kwargs):
+    out = spooled_file()
+    sink = gzip.GzipFile(fileobj=out, mode="wb") if compress else out
+    try:
+        for chunk in iter_csv_chunks(df, chunk_rows=chunk_rows, **kwargs):
+            sink.write(chunk)
+    finally:
+        if compress:
+            sink.close()
+    out.seek(0)
+    return out
+
+
+def arrow_ready(df: pd.DataFrame) -> pd.DataFrame:
+    # Kolom object campuran (mis. "Kode Produk" berisi angka + "Total") dijadikan teks agar bertipe tetap.
+    # Nama kolom dijadikan str dan dibuat unik (Arrow tidak menerima nama kolom ganda).
+    out = df.copy(deep=False)
+    names, seen = [], {}
+    for c in map(str, df.columns):
+        n = seen.get(c, 0)
+        seen[c] = n + 1
+        names.append(c if n == 0 else f"{c}.{n}")
+    out.columns = names
+    for i, c in enumerate(names):
+        s = out.iloc[:, i]
+        if s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) not in _ARROW_OK:
+            out[c] = s.map(lambda v: v if pd.isna(v) else str(v)).astype("string")
+    return out
+
+
+def parquet_file(df: pd.DataFrame, chunk_rows: Optional[int] = None, compression: str = "snappy"):
+    # Satu row group per chunk; skema diambil dari chunk pertama supaya semua chunk konsisten
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    out = spooled_file()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema, compression=compression) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            part = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+    out.seek(0)
+    return out
+
+
+def parquet_bytes(df: pd.DataFrame, **kwargs) -> bytes:
+    return read_bytes(parquet_file(arrow_ready(df), **kwargs))
+
+
+def parquet_zip_bytes(frames: dict) -> bytes:
+    # Beberapa frame (mis. satu per sheet Excel) -> 1 ZIP berisi <nama>.parquet
+    out = spooled_file()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, df in frames.items():
+            zf.writestr(f"{name}.parquet", parquet_bytes(df))
+    return read_bytes(out)
+
+
+def excel_file(write: Callable):
+    # write(fileobj) menulis workbook, mis. lambda f: wb.save(f) atau pd.ExcelWriter(f, ...)
+    out = spooled_file()
+    write(out)
+    out.seek(0)
+    return out
+
+
+def read_bytes(f) -> bytes:
+    try:
+        f.seek(0)
+        return f.read()
+    finally:
+        f.close()
+
+
+def _sample_rows(n: int, cap: int) -> np.ndarray:
+    # Posisi baris sampel: kepala, ekor, dan baris tersebar merata di tengah (deterministik)
+    if n <= cap:
+        return np.arange(n)
+    edge = cap // 4
+    middle = np.linspace(edge, n - edge - 1, cap - 2 * edge).astype(np.int64)
+    return np.unique(np.concatenate([np.arange(edge), middle, np.arange(n - edge, n)]))
+
+
+def _digits(v) -> int:
+    # Panjang tampilan angka (tanpa pemisah ribuan) untuk estimasi lebar kolom numerik
+    if pd.isna(v):
+        return 0
+    v = float(v)
+    whole = len(str(int(abs(v)))) if np.isfinite(v) else 3
+    return whole + (v < 0)
+
+
+def column_widths(df: pd.DataFrame, min_width: float = 8, max_width: float = 60,
+                  sample_rows: Optional[int] = None, padding: float = 2) -> list:
+    # Estimasi lebar kolom Excel tanpa membuat salinan teks seluruh frame:
+    # - angka: dari min/max (vektor, murah); tanggal/boolean: lebar tetap (tanggal tanpa jam lebih sempit)
+    # - kategori: panjang teks kategori (bukan per baris)
+    # - teks: str.len pada sampel baris (maks AUTOFIT_SAMPLE_ROWS), object campuran di-str-kan di sampel saja
+    sample_rows = sample_rows or config.AUTOFIT_SAMPLE_ROWS
+    pos = _sample_rows(len(df), sample_rows)
+    widths = []
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        dtype = s.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            data_len = 5
+        elif pd.api.types.is_numeric_dtype(dtype):
+            lo, hi = (s.min(), s.max()) if len(s) else (np.nan, np.nan)
+            data_len = max(_digits(lo), _digits(hi))
+            if pd.api.types.is_float_dtype(dtype):
+                data_len += 3
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            part = s.iloc[pos].dropna()
+            data_len = 10 if (part == part.dt.normalize()).all() else 19
+        elif isinstance(dtype, pd.CategoricalDtype):
+            cats = dtype.categories
+            data_len = int(pd.Series(cats.astype(str)).str.len().max()) if len(cats) else 0
+        else:
+            part = s.iloc[pos].dropna()
+            if dtype == object or not pd.api.types.is_string_dtype(dtype):
+                part = part.map(str)
+            data_len = int(part.str.len().max()) if len(part) else 0
+        width = max(data_len, len(str(col))) + padding
+        widths.append(float(max(min(width, max_width), min_width)))
+    return widths
+
+
+def apply_column_widths(ws, widths, start_col: int = 0, formats: Optional[dict] = None):
+    # ws boleh worksheet xlsxwriter (set_column) atau openpyxl (column_dimensions); start_col 0-based.
+    # formats (xlsxwriter): {indeks kolom: Format} karena set_column menimpa format kolom sebelumnya.
+    if hasattr(ws, "set_column"):
+        formats = formats or {}
+        for i, w in enumerate(widths, start=start_col):
+            ws.set_column(i, i, w, formats.get(i))
+        return
+    from openpyxl.utils import get_column_letter
+    for i, w in enumerate(widths, start=start_col + 1):
+        ws.column_dimensions[get_column_letter(i)].width = w
+
+
+def autofit(ws, df: pd.DataFrame, **kwargs) -> list:
+    widths = column_widths(df, **kwargs)
+    apply_column_widths(ws, widths)
+    return widths
+
+
+def csv_bytes(df: pd.DataFrame, compress: bool = False, **kwargs) -> bytes:
+    return read_bytes(csv_file(df, compress=compress, **kwargs))
+
+
+def csv_download_args(base_name: str, compress: bool) -> dict:
+    # Nama file & mime untuk st.download_button sesuai pilihan gzip
+    if compress:
+        return {"file_name": f"{base_name}.csv.gz", "mime": GZIP_MIME}
+    return {"file_name": f"{base_name}.csv", "mime": CSV_MIME}
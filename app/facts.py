@@ -0,0 +1,128 @@
+# facts.py
+# Tabel fakta iklan lintas platform: setiap export (Shopee Ads, Meta, TikTok) dipetakan ke satu skema
+# bertipe yang sama, sehingga ROAS gabungan dsb. cukup dihitung dengan satu agregasi vektor.
+#   date, platform, account, campaign, product       -> tanggal / teks
+#   spend, revenue, orders, impressions, clicks      -> float64 (kosong = NaN, bukan 0)
+# Deteksi kolom tetap milik tiap platform (konstanta Shopee, find_campaign_col/account_name Meta,
+# find_column TikTok); modul ini hanya menerima hasil deteksinya lewat build().
+# Hasil disimpan ke lake sebagai dataset "fakta_iklan" oleh pipeline masing-masing, satu partisi per tanggal
+# laporan. Tanggal selalu berasal dari export (kolom tanggal / tanggal laporan); baris tanpa tanggal tidak disimpan.
+
+from datetime import date
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import lake
+
+DATASET = "fakta_iklan"
+TEXT_COLS = ["platform", "account", "campaign", "product"]
+METRIC_COLS = ["spend", "revenue", "orders", "impressions", "clicks"]
+COLUMNS = ["date"] + TEXT_COLS + METRIC_COLS
+
+# Kolom metrik tambahan (impresi/klik/pesanan) per platform; dicari persis dulu, baru berdasarkan kata kunci
+IMPRESSION_KEYS = ["impresi", "dilihat", "impressions", "tayangan"]
+CLICK_KEYS = ["jumlah klik", "klik tautan", "klik", "clicks", "link clicks"]
+ORDER_KEYS = ["pesanan", "konversi langsung", "konversi", "pembelian", "purchases", "conversions"]
+
+# Kolom rasio/nilai yang memuat kata kunci di atas tapi bukan hitungan (mis. "Biaya per klik", "ROAS Pembelian")
+EXCLUDE_KEYS = ("rasio", "tingkat", "per ", "ctr", "cpc", "cpm", "roas", "nilai", "biaya")
+
+# Kolom tanggal laporan per baris (mis. export TikTok per hari); tanggal mulai/selesai campaign bukan tanggal laporan
+DATE_KEYS = ["tanggal", "date"]
+DATE_EXCLUDE_KEYS = ("mulai", "selesai", "akhir", "start", "end", "dibuat", "created", "update")
+
+Value = Union[str, pd.Series, float, None]
+
+
+def pick(df: pd.DataFrame, keywords: Iterable[str], exclude: Iterable[str] = EXCLUDE_KEYS) -> Optional[str]:
+    # Nama kolom yang persis sama (tanpa beda huruf besar/kecil) diutamakan, lalu kolom yang memuat kata kunci.
+    # Pada pencarian kata kunci, kolom rasio/biaya-per-x dilewati agar "Biaya per klik" tidak terbaca sebagai jumlah klik.
+    lower = {c: str(c).strip().lower() for c in df.columns}
+    keywords = [k.lower() for k in keywords]
+    for kw in keywords:
+        for c, low in lower.items():
+            if low == kw:
+                return c
+    for kw in keywords:
+        for c, low in lower.items():
+            if kw in low and not any(x in low for x in exclude):
+                return c
+    return None
+
+
+def report_dates(df: pd.DataFrame) -> Optional[pd.Series]:
+    # Tanggal per baris dari kolom tanggal export; None jika tidak ada kolom yang isinya terbaca sebagai tanggal
+    col = pick(df, DATE_KEYS, exclude=DATE_EXCLUDE_KEYS)
+    if col is None:
+        return None
+    dates = pd.to_datetime(df[col], errors="coerce", format="mixed").dt.normalize()
+    return dates if dates.notna().any() else None
+
+
+def single_date(dates: Optional[pd.Series]) -> Optional[date]:
+    # Satu tanggal laporan untuk seluruh file (partisi lake); None jika tidak ada atau lebih dari satu tanggal
+    unique = dates.dropna().unique() if dates is not None else []
+    return pd.Timestamp(unique[0]).date() if len(unique) == 1 else None
+
+
+def _values(df: pd.DataFrame, value: Value, numeric: bool) -> pd.Series:
+    if isinstance(value, pd.Series):
+        s = value.reindex(df.index)
+    elif isinstance(value, str) and value in df.columns:
+        s = df[value]
+    elif value is None or (isinstance(value, str) and numeric):
+        s = pd.Series(np.nan if numeric else pd.NA, index=df.index)
+    else:
+        s = pd.Series(value, index=df.index)
+    if numeric:
+        return pd.to_numeric(s, errors="coerce").astype("float64")
+    return s.astype("string").str.strip()
+
+
+def build(df: pd.DataFrame, platform: str, date=None, account: Value = None, campaign: Value = None,
+          product: Value = None, spend: Value = None, revenue: Value = None, orders: Value = None,
+          impressions: Value = None, clicks: Value = None) -> pd.DataFrame:
+    # Tiap argumen boleh nama kolom, Series (sudah dinormalisasi pemanggil), atau nilai tunggal (mis. tanggal laporan).
+    # Metrik yang sudah di-parse pemanggil (mis. series_to_numeric_like TikTok) dikirim sebagai Series.
+    if isinstance(date, pd.Series):
+        dates = date.reindex(df.index)
+    elif isinstance(date, str) and date in df.columns:
+        dates = df[date]
+    else:
+        dates = pd.Series(date, index=df.index)
+    out = pd.DataFrame({"date": pd.to_datetime(dates, errors="coerce").dt.normalize()}, index=df.index)
+    out["platform"] = pd.Series(platform, index=df.index, dtype="string")
+    for name, value in [("account", account), ("campaign", campaign), ("product", product)]:
+        out[name] = _values(df, value, numeric=False)
+    for name, value in [("spend", spend), ("revenue", revenue), ("orders", orders), ("impressions", impressions), ("clicks", clicks)]:
+        out[name] = _values(df, value, numeric=True)
+    return out.reset_index(drop=True)
+
+
+def blended(facts: pd.DataFrame, by: Optional[List[str]] = None) -> pd.DataFrame:
+    # Satu groupby-sum untuk semua platform lalu rasio dihitung dari total (bukan rata-rata rasio):
+    # ROAS = revenue / spend, CTR = clicks / impressions, CPC = spend / clicks, CPM = spend / impressions * 1000
+    by = by or ["platform"]
+    if facts.empty:
+        return pd.DataFrame(columns=by + METRIC_COLS + ["roas", "ctr", "cpc", "cpm", "aov"])
+    g = facts.groupby(by, dropna=False, observed=True, sort=True)[METRIC_COLS].sum(min_count=1).reset_index()
+
+    def ratio(num, den, scale=1.0):
+        return (g[num] / g[den].where(g[den] > 0)) * scale
+
+    g["roas"] = ratio("revenue", "spend")
+    g["ctr"] = ratio("clicks", "impressions")
+    g["cpc"] = ratio("spend", "clicks")
+    g["cpm"] = ratio("spend", "impressions", 1000.0)
+    g["aov"] = ratio("revenue", "orders")
+    return g
+
+
+def save(fact: pd.DataFrame, sumber: str, signature: Optional[str] = None) -> int:
+    # Satu partisi lake per tanggal di kolom date. Baris tanpa aktivitas sama sekali, dan baris tanpa tanggal
+    # laporan (tidak diberi tanggal proses agar tidak masuk ke hari yang salah), tidak disimpan.
+    keep = fact[METRIC_COLS].fillna(0).ne(0).any(axis=1) & fact["date"].notna()
+    return sum(lake.save(DATASET, part, day, sumber, signature=signature)
+               for day, part in fact[keep].groupby("date", sort=True))
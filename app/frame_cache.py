@@ -0,0 +1,138 @@
+# frame_cache.py
+# Cache DataFrame per sesi dengan batas memori (bukan batas jumlah entri).
+# Frame disimpan sebagai Arrow IPC terkompresi (zstd) sehingga yang tinggal di session_state hanya
+# bytes ringkas; ukuran "memori" tiap entri = df.memory_usage(deep=True) saat disimpan, yaitu biaya
+# sebenarnya ketika frame dibuka kembali untuk dianalisis. Jika total melewati budget, entri dibuang
+# menurut kebijakan ("lru" = paling lama tidak dipakai, "oldest" = tanggal/urutan paling tua) dan
+# dicatat di log eviksi agar UI bisa menampilkannya (tidak ada tanggal yang hilang diam-diam).
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+import dtype_plan
+
+POLICIES = ("lru", "oldest")
+
+
+def encode_frame(df: pd.DataFrame, compression: str = "zstd") -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=compression)) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_frame(blob: bytes) -> pd.DataFrame:
+    import pyarrow as pa
+
+    # Kolom teks Arrow dibuka sebagai string kompak (bukan object) seperti hasil dtype_plan
+    table = pa.ipc.open_stream(pa.py_buffer(blob)).read_all()
+    return table.to_pandas(types_mapper={pa.string(): dtype_plan.compact_string_dtype(),
+                                         pa.large_string(): dtype_plan.compact_string_dtype()}.get)
+
+
+class FrameCache:
+    def __init__(self, budget_bytes: int, policy: str = "lru"):
+        self.budget_bytes = int(budget_bytes)
+        self.policy = policy if policy in POLICIES else "lru"
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.evictions: List[dict] = []
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[str]:
+        return list(self._entries.keys())
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(e["mem_bytes"] for e in self._entries.values())
+
+    @property
+    def stored_bytes(self) -> int:
+        return sum(len(e["blob"]) for e in self._entries.values())
+
+    def put(self, key, df: pd.DataFrame, order_key=None) -> List[dict]:
+        # order_key: nilai urut untuk kebijakan "oldest" (mis. tanggal laporan); default = waktu simpan.
+        # Hasil: daftar entri yang dibuang karena budget (juga ditambahkan ke self.evictions)
+        key = str(key)
+        now = time.time()
+        self._entries.pop(key, None)
+        self._entries[key] = {
+            "blob": encode_frame(df),
+            "mem_bytes": int(df.memory_usage(deep=True).sum()),
+            "rows": len(df),
+            "order_key": now if order_key is None else order_key,
+            "last_used": now,
+        }
+        return self._enforce_budget(protect=key)
+
+    def get(self, key) -> Optional[pd.DataFrame]:
+        entry = self._entries.get(str(key))
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        return decode_frame(entry["blob"])
+
+    def frames(self, keys: Optional[Iterable] = None) -> "OrderedDict[str, pd.DataFrame]":
+        # Hanya entri yang diminta yang dibuka (default: semua), urut sesuai waktu simpan.
+        # Entri yang dibuka dihitung "dipakai" untuk kebijakan LRU, sama seperti get().
+        wanted = None if keys is None else {str(k) for k in keys}
+        now, out = time.time(), OrderedDict()
+        for k, e in self._entries.items():
+            if wanted is None or k in wanted:
+                e["last_used"] = now
+                out[k] = decode_frame(e["blob"])
+        return out
+
+    def rows(self) -> Dict[str, int]:
+        # Jumlah baris per entri tanpa membuka frame (mis. untuk tanda tangan isi cache)
+        return {k: e["rows"] for k, e in self._entries.items()}
+
+    def pop(self, key):
+        self._entries.pop(str(key), None)
+
+    def clear(self):
+        self._entries.clear()
+        self.evictions.clear()
+
+    def set_policy(self, policy: str, budget_bytes: Optional[int] = None) -> List[dict]:
+        self.policy = policy if policy in POLICIES else self.policy
+        if budget_bytes is not None:
+            self.budget_bytes = int(budget_bytes)
+        return self._enforce_budget()
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {"key": k, "rows": e["rows"], "memori (MB)": round(e["mem_bytes"] / 1e6, 2),
+             "tersimpan (MB)": round(len(e["blob"]) / 1e6, 2)}
+            for k, e in self._entries.items()
+        ])
+
+    def _victim(self, protect: Optional[str]) -> Optional[str]:
+        candidates: Dict[str, dict] = {k: e for k, e in self._entries.items() if k != protect}
+        if not candidates:
+            return None
+        field = "last_used" if self.policy == "lru" else "order_key"
+        return min(candidates, key=lambda k: candidates[k][field])
+
+    def _enforce_budget(self, protect: Optional[str] = None) -> List[dict]:
+        # Entri yang baru disimpan tidak pernah dibuang, walau sendirian sudah melebihi budget
+        evicted = []
+        while self.used_bytes > self.budget_bytes:
+            key = self._victim(protect)
+            if key is None:
+                break
+            entry = self._entries.pop(key)
+            evicted.append({"key": key, "rows": entry["rows"], "mem_bytes": entry["mem_bytes"],
+                            "policy": self.policy, "time": time.time()})
+        self.evictions.extend(evicted)
+        return evicted
@@ -0,0 +1,319 @@
+# jobs.py
+# Antrian job lokal untuk export berat (tanpa broker): job dijalankan di process pool dan
+# status/progres/hasilnya dicatat di tabel SQLite <DATA_DIR>/jobs/jobs.sqlite.
+# File hasil disimpan di <DATA_DIR>/jobs/<job_id>/ sehingga tetap bisa di-download setelah
+# rerun, pindah tab, atau klik widget lain. Sesi Streamlit hanya menyimpan daftar job_id miliknya.
+#
+# Fungsi job harus berada di level modul (agar bisa di-pickle) dengan bentuk fn(ctx, **kwargs),
+# memakai ctx.progress(...) untuk progres dan ctx.add_file(...) untuk hasil.
+# Beberapa job berjalan bersamaan di worker process berbeda: job yang menulis file bersama di luar folder
+# job-nya (mis. histori Shopee Ads, lihat shopee_history._store_lock) wajib memakai kunci lintas proses.
+
+import functools
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+import streamlit as st
+
+import config
+import parallel
+import perf
+
+JOBS_DIR = os.path.join(config.DATA_DIR, "jobs")
+DB_PATH = os.path.join(JOBS_DIR, "jobs.sqlite")
+PREVIEW_FILE = "__preview.parquet"
+ACTIVE = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    label TEXT,
+    status TEXT NOT NULL,
+    progress REAL DEFAULT 0,
+    message TEXT,
+    created REAL,
+    started REAL,
+    finished REAL,
+    server_pid INTEGER,
+    result TEXT,
+    error TEXT
+)
+"""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@contextmanager
+def _connect():
+    # Koneksi pendek per operasi (aman dipakai lintas proses); commit lalu tutup
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _update(job_id: str, **fields):
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    with _connect() as conn:
+        conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+
+def job_dir(job_id: str) -> str:
+    return os.path.join(JOBS_DIR, job_id)
+
+
+class JobContext:
+    # Diberikan ke fungsi job: pencatat progres, file hasil, pesan, dan timing per tahap.
+    def __init__(self, job_id: str, kind: str, perf_enabled: bool = False):
+        self.job_id = job_id
+        self.dir = job_dir(job_id)
+        self.files = []
+        self.notes = []
+        self.tracker = perf.PerfTracker(kind, enabled=perf_enabled)
+        self._last_write = 0.0
+        os.makedirs(self.dir, exist_ok=True)
+
+    def progress(self, frac: float, message: str = ""):
+        # Ditulis ke SQLite maksimal ~5x per detik agar loop rapat tidak terhambat I/O
+        now = time.monotonic()
+        if frac < 1 and now - self._last_write < 0.2:
+            return
+        self._last_write = now
+        _update(self.job_id, progress=max(0.0, min(1.0, float(frac))), message=message)
+
+    def add_file(self, name: str, data, mime: str, label: Optional[str] = None):
+        # data boleh bytes atau file-like (mis. exporter.spooled_file()); disalin langsung ke disk
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as out:
+            if isinstance(data, (bytes, bytearray)):
+                out.write(data)
+            else:
+                data.seek(0)
+                shutil.copyfileobj(data, out)
+        self.files.append({"name": name, "mime": mime, "label": label or f"⬇️ {name}", "size": os.path.getsize(path)})
+
+    def add_preview(self, df, rows: int = 10):
+        import exporter
+        with open(os.path.join(self.dir, PREVIEW_FILE), "wb") as out:
+            out.write(exporter.parquet_bytes(df.head(rows)))
+
+    def note(self, text: str, level: str = "info"):
+        self.notes.append({"level": level, "text": text})
+
+
+def _execute(job_id: str, kind: str, fn: Callable, kwargs: dict, perf_enabled: bool):
+    # Dijalankan di worker process (atau thread cadangan)
+    _update(job_id, status="running", started=time.time(), message="Memulai...")
+    ctx = JobContext(job_id, kind, perf_enabled)
+    try:
+        fn(ctx, **kwargs)
+    except Exception as e:
+        traceback.print_exc()
+        _update(job_id, status="error", finished=time.time(), error=str(e) or type(e).__name__,
+                result=json.dumps({"files": ctx.files, "notes": ctx.notes, "perf": ctx.tracker.records}, default=str))
+        return
+    _update(job_id, status="done", progress=1.0, finished=time.time(), message="Selesai",
+            result=json.dumps({"files": ctx.files, "notes": ctx.notes, "perf": ctx.tracker.records}, default=str))
+
+
+def cleanup(max_age_hours: Optional[float] = None):
+    # Hapus job (baris + folder) yang lebih tua dari batas retensi
+    cutoff = time.time() - 3600 * (config.JOB_RETENTION_HOURS if max_age_hours is None else max_age_hours)
+    with _connect() as conn:
+        old = [r["id"] for r in conn.execute("SELECT id FROM jobs WHERE created < ?", (cutoff,))]
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(i,) for i in old])
+    for job_id in old:
+        shutil.rmtree(job_dir(job_id), ignore_errors=True)
+
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        pass
+    return True
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Job queued/running milik proses server yang sudah mati tidak akan pernah selesai
+            with _connect() as conn:
+                stale = [(time.time(), r["id"]) for r in conn.execute(
+                    "SELECT id, server_pid FROM jobs WHERE status IN ('queued', 'running')") if not _pid_alive(r["server_pid"])]
+                conn.executemany(
+                    "UPDATE jobs SET status = 'error', error = 'Server dimulai ulang sebelum job selesai.', finished = ? WHERE id = ?", stale)
+            cleanup()
+            workers = config.JOB_WORKERS if config.JOB_WORKERS > 0 else parallel.default_workers()
+            # "spawn" aman dipakai dari thread script Streamlit (lihat parallel.py)
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _on_done(job_id: str):
+    def callback(fut):
+        exc = fut.exception()
+        if exc is None:
+            return
+        # Worker mati (mis. kehabisan memori) sebelum sempat mencatat status
+        _update(job_id, status="error", finished=time.time(), error=f"Worker berhenti: {exc}")
+        if isinstance(exc, BrokenProcessPool):
+            global _executor
+            with _executor_lock:
+                _executor = None
+    return callback
+
+
+def submit(kind: str, label: str, fn: Callable, perf_enabled: bool = False, **kwargs) -> str:
+    job_id = uuid.uuid4().hex[:12]
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, label, status, progress, message, created, server_pid) VALUES (?, ?, ?, 'queued', 0, ?, ?, ?)",
+            (job_id, kind, label, "Menunggu worker...", time.time(), os.getpid()))
+    try:
+        fut = _get_executor().submit(_execute, job_id, kind, fn, kwargs, perf_enabled)
+        fut.add_done_callback(_on_done(job_id))
+    except (BrokenProcessPool, OSError, NotImplementedError, RuntimeError):
+        # Process pool tidak tersedia: tetap di latar belakang lewat thread
+        threading.Thread(target=_execute, args=(job_id, kind, fn, kwargs, perf_enabled), daemon=True).start()
+    return job_id
+
+
+def get_jobs(job_ids: List[str]) -> List[dict]:
+    if not job_ids:
+        return []
+    with _connect() as conn:
+        rows = conn.execute(f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(job_ids))})", list(job_ids)).fetchall()
+    by_id = {r["id"]: dict(r) for r in rows}
+    out = []
+    for job_id in job_ids:
+        job = by_id.get(job_id)
+        if job is None:
+            continue
+        job["result"] = json.loads(job["result"]) if job["result"] else {"files": [], "notes": [], "perf": []}
+        out.append(job)
+    return out
+
+
+def delete(job_id: str):
+    with _connect() as conn:
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+    shutil.rmtree(job_dir(job_id), ignore_errors=True)
+
+
+# ==========================================
+# UI (Streamlit)
+# ==========================================
+def _owned(kind: str) -> list:
+    return st.session_state.setdefault("jobs_owned", {}).setdefault(kind, [])
+
+
+def enqueue(kind: str, label: str, fn: Callable, **kwargs) -> str:
+    # submit() + catat job_id di sesi agar panel job menampilkannya di setiap rerun
+    job_id = submit(kind, label, fn, perf_enabled=perf.perf_enabled(), **kwargs)
+    _owned(kind).insert(0, job_id)
+    return job_id
+
+
+def latest_job(kind: str) -> Optional[dict]:
+    jobs = get_jobs(_owned(kind)[:1])
+    return jobs[0] if jobs else None
+
+
+def _elapsed(job) -> str:
+    start = job["started"] or job["created"]
+    end = job["finished"] or time.time()
+    return f"{max(0.0, end - start):,.1f} dtk"
+
+
+def _read_result(path: str) -> bytes:
+    # Job bisa sudah dihapus (tombol Hapus / retensi) di antara render dan klik
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return b""
+
+
+def _render_job(job: dict, key: str):
+    status = job["status"]
+    icon = {"queued": "⏳", "running": "⚙️", "done": "✅", "error": "❌"}.get(status, "•")
+    st.markdown(f"**{icon} {job['label']}** — {status} ({_elapsed(job)})")
+    if status in ACTIVE:
+        st.progress(job["progress"] or 0.0, text=job["message"] or "")
+        return
+
+    result = job["result"]
+    if status == "error":
+        st.error(f"Job gagal: {job['error']}")
+    for n in result.get("notes", []):
+        getattr(st, n["level"], st.info)(n["text"])
+
+    preview_path = os.path.join(job_dir(job["id"]), PREVIEW_FILE)
+    if os.path.exists(preview_path):
+        import pandas as pd
+        st.dataframe(pd.read_parquet(preview_path), use_container_width=True)
+
+    for i, f in enumerate(result.get("files", [])):
+        path = os.path.join(job_dir(job["id"]), f["name"])
+        if not os.path.exists(path):
+            continue
+        # File baru dibaca saat tombol diklik (deferred download), bukan di setiap rerun / polling panel
+        st.download_button(f["label"], functools.partial(_read_result, path), f["name"], mime=f["mime"],
+                           key=f"{key}_dl_{job['id']}_{i}", on_click="ignore")
+
+    if result.get("perf"):
+        tracker = perf.PerfTracker(job["kind"], enabled=True)
+        tracker.records = result["perf"]
+        tracker.render()
+
+
+def render_jobs(kind: str, key: str, title: str = "🧵 Job latar belakang", limit: int = 5):
+    # Panel status job milik sesi ini. Selama ada job aktif panel me-refresh diri sendiri
+    # (st.fragment), jadi bagian lain halaman tidak ikut dijalankan ulang.
+    owned = _owned(kind)
+    if not owned:
+        return
+    jobs_now = get_jobs(owned[:limit])
+    active_now = any(j["status"] in ACTIVE for j in jobs_now)
+
+    @st.fragment(run_every=config.JOB_POLL_SECONDS if active_now else None)
+    def panel():
+        jobs = get_jobs(_owned(kind)[:limit])
+        st.markdown(f"##### {title}")
+        for job in jobs:
+            with st.container(border=True):
+                _render_job(job, key)
+                if job["status"] not in ACTIVE and st.button("🗑️ Hapus", key=f"{key}_del_{job['id']}"):
+                    delete(job["id"])
+                    _owned(kind).remove(job["id"])
+                    st.rerun()
+        # Semua job selesai: rerun penuh sekali agar bagian halaman lain (mis. histori) ikut segar
+        if active_now and not any(j["status"] in ACTIVE for j in jobs):
+            st.rerun()
+
+    panel()
@@ -0,0 +1,321 @@
+# lake.py
+# Data lake lokal untuk frame akhir semua pipeline: Parquet di disk + DuckDB embedded untuk query
+# (tanpa server database). Setiap pipeline memanggil save() setelah hasilnya jadi:
+#   <DATA_DIR>/lake/<dataset>/_tanggal=YYYY-MM-DD/<sumber>.parquet
+# - _tanggal = tanggal laporan dari isi export; _sumber = nama file upload
+# - export tanpa tanggal laporan TIDAK diberi tanggal proses: disimpan di partisi _tanggal=NULL dengan nama file
+#   = tanda tangan isinya, jadi memproses ulang file yang sama di hari lain tidak menggandakan data
+#   (di DuckDB _tanggal bernilai NULL, sehingga tidak ikut filter rentang tanggal)
+# - file yang sama diproses ulang menimpa file-nya (idempoten); isi yang identik tidak ditulis ulang
+# - kolom turunan berawalan "_" (mis. _roi, _campaign) ditambahkan pipeline agar template query
+#   tidak bergantung pada variasi nama kolom di export asli
+# DuckDB membaca file Parquet langsung lewat satu view per dataset (vektor & paralel, hanya kolom
+# dan partisi tanggal yang dipakai query), jadi SQL cukup "SELECT ... FROM shopee_ads WHERE _tanggal >= ...".
+# Menyimpan hanya butuh pyarrow; duckdb baru di-import saat halaman Query dipakai.
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+import config
+
+LAKE_DIR = os.path.join(config.DATA_DIR, "lake")
+PARTITION = "_tanggal"
+COL_SUMBER = "_sumber"
+UNDATED = "NULL"  # nilai partisi untuk export tanpa tanggal laporan (dibaca DuckDB sebagai NULL)
+_META_KEY = b"ads_lake_signature"
+
+logger = logging.getLogger("ads.lake")
+
+DATASETS: Dict[str, str] = {
+    "shopee_ads": "Shopee Ads — DATA_IKLAN + Kategori per laporan",
+    "shopee_performa": "Shopee Out — Performa Produk (sorted, kolom Toko)",
+    "shopee_analitik": "Shopee Analitik Produk — baris Total + variasi",
+    "meta_kpi": "Meta Ads KPI — CPAS & Whatsapp Ads",
+    "tiktok_campaign": "TikTok Fixer — campaign (ID aman, angka diperbaiki)",
+    "tiktok_daily": "TikTok Daily Comparator — metrik per produk per hari",
+    "fakta_iklan": "Fakta iklan lintas platform (skema seragam, lihat facts.py)",
+}
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", str(text)).strip("._") or "data"
+
+
+def _as_date(value) -> Optional[date]:
+    # Tanggal laporan; None jika tidak ada / tidak terbaca (tidak pernah diganti tanggal hari ini)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    parsed = pd.to_datetime(str(value).split("~")[0].strip(), errors="coerce") if value else pd.NaT
+    return parsed.date() if pd.notna(parsed) else None
+
+
+def _partition_dir(dataset: str, d: Optional[date]) -> str:
+    return os.path.join(LAKE_DIR, dataset, f"{PARTITION}={d.isoformat() if d else UNDATED}")
+
+
+def frame_signature(df: pd.DataFrame) -> str:
+    # Tanda tangan isi frame (nama kolom + nilai), untuk export tanpa tanggal yang tidak membawa signature
+    h = hashlib.sha256("\x1f".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return f"frame-{h.hexdigest()[:40]}"
+
+
+def _prepare(df: pd.DataFrame, sumber: str, derived: Optional[dict]) -> pd.DataFrame:
+    # Kolom object campuran (mis. angka + "" / "-" di Analitik) dibuat bertipe agar bisa ditulis & di-query:
+    # jika semua isi non-kosong berupa angka -> numerik, selain itu -> teks
+    import pyarrow as pa
+
+    out = df.copy()
+    out.columns = [str(c) for c in out.columns]
+    out = out.loc[:, ~out.columns.duplicated()]
+    for c in out.columns:
+        s = out[c]
+        if s.dtype != object:
+            continue
+        try:
+            pa.array(s, from_pandas=True)
+            continue
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        num = pd.to_numeric(s, errors="coerce")
+        blank = s.isna() | s.astype(str).str.strip().isin(["", "-"])
+        out[c] = num if (num.notna() | blank).all() else s.astype("string")
+    for name, values in (derived or {}).items():
+        out[name] = values
+    out[COL_SUMBER] = sumber
+    return out.reset_index(drop=True)
+
+
+def _signature(path: str) -> Optional[bytes]:
+    import pyarrow.parquet as pq
+
+    try:
+        return (pq.read_schema(path).metadata or {}).get(_META_KEY)
+    except Exception:
+        return None
+
+
+def save(dataset: str, df: pd.DataFrame, tanggal=None, sumber: str = "", derived: Optional[dict] = None,
+         signature: Optional[str] = None) -> int:
+    # Simpan frame akhir pipeline; hasil = jumlah baris yang ditulis (0 jika dilewati/dimatikan/gagal).
+    # signature (mis. upload_cache.content_key): jika sama dengan file yang sudah ada, tidak ditulis ulang.
+    # Tanpa tanggal laporan: partisi UNDATED, nama file = signature (dihitung dari isi frame jika tidak diberikan).
+    # Best-effort: kegagalan menulis ke lake tidak boleh menggagalkan export yang sudah jadi.
+    if not config.LAKE_ENABLED or df is None or df.empty:
+        return 0
+    try:
+        d = _as_date(tanggal)
+        if d is None:
+            signature = signature or frame_signature(df)
+        path = os.path.join(_partition_dir(dataset, d), f"{_slug(sumber if d else signature)}.parquet")
+        if signature and os.path.exists(path) and _signature(path) == signature.encode():
+            return 0
+        return _write(path, _prepare(df, sumber, derived), signature)
+    except Exception as e:
+        logger.warning("lake: gagal menyimpan %s (%s): %s", dataset, sumber, e)
+        return 0
+
+
+def _write(path: str, df: pd.DataFrame, signature: Optional[str]) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if signature:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: signature.encode()})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return table.num_rows
+
+
+def _files(dataset: str) -> List[str]:
+    root = os.path.join(LAKE_DIR, dataset)
+    if not os.path.isdir(root):
+        return []
+    return sorted(os.path.join(root, part, name)
+                  for part in os.listdir(root) if part.startswith(f"{PARTITION}=")
+                  for name in os.listdir(os.path.join(root, part)) if name.endswith(".parquet"))
+
+
+def available() -> List[str]:
+    return [name for name in DATASETS if _files(name)]
+
+
+def catalog() -> pd.DataFrame:
+    # Ringkasan isi lake dari metadata Parquet saja (tanpa membaca data)
+    import pyarrow.parquet as pq
+
+    rows = []
+    for name in DATASETS:
+        files = _files(name)
+        if not files:
+            continue
+        parts = [os.path.basename(os.path.dirname(p)).split("=", 1)[1] for p in files]
+        dates = sorted(set(parts) - {UNDATED})
+        rows.append({
+            "dataset": name, "keterangan": DATASETS[name], "file": len(files),
+            "baris": sum(pq.read_metadata(p).num_rows for p in files),
+            "dari": dates[0] if dates else "-", "sampai": dates[-1] if dates else "-",
+            "file tanpa tanggal": parts.count(UNDATED),
+            "ukuran (MB)": round(sum(os.path.getsize(p) for p in files) / 1e6, 2),
+        })
+    return pd.DataFrame(rows)
+
+
+def dates(dataset: str) -> List[str]:
+    # Tanggal partisi (YYYY-MM-DD), ditambah UNDATED di akhir jika ada export tanpa tanggal
+    return sorted({os.path.basename(os.path.dirname(p)).split("=", 1)[1] for p in _files(dataset)})
+
+
+def delete_date(dataset: str, tanggal):
+    # tanggal == UNDATED menghapus partisi export tanpa tanggal
+    d = _as_date(tanggal)
+    if d is None and tanggal != UNDATED:
+        return
+    shutil.rmtree(_partition_dir(dataset, d), ignore_errors=True)
+
+
+def connect():
+    # Koneksi DuckDB in-memory baru per query; satu view per dataset yang ada di lake.
+    # union_by_name: export lama/baru dengan kolom berbeda tetap bisa digabung.
+    # Setelah view dibuat, akses file/jaringan ditutup kecuali folder lake dan konfigurasi dikunci:
+    # SQL pengguna tidak bisa membaca file lain lewat read_csv/read_text/... (mis. /etc/passwd, /proc).
+    import duckdb
+
+    con = duckdb.connect()
+    for name in available():
+        glob = os.path.join(LAKE_DIR, name, f"{PARTITION}=*", "*.parquet").replace("'", "''")
+        con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{glob}', hive_partitioning = true, "
+                    f"union_by_name = true, hive_types = {{'{PARTITION}': DATE}})")
+    lake_dir = os.path.join(os.path.realpath(LAKE_DIR), "").replace("'", "''")
+    con.execute(f"SET allowed_directories = ['{lake_dir}']")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+    return con
+
+
+def columns(dataset: str) -> pd.DataFrame:
+    con = connect()
+    try:
+        return con.execute(f"DESCRIBE {dataset}").df()[["column_name", "column_type"]]
+    finally:
+        con.close()
+
+
+def check_read_only(sql: str):
+    # Kotak SQL hanya menerima satu statement SELECT (termasuk WITH ... / FROM ... / PIVOT)
+    import duckdb
+
+    statements = duckdb.extract_statements(sql)
+    if len(statements) != 1:
+        raise ValueError("Masukkan tepat satu query.")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError("Hanya query SELECT yang diizinkan.")
+
+
+def query(sql: str, params: Optional[dict] = None, limit: Optional[int] = None) -> pd.DataFrame:
+    check_read_only(sql)
+    con = connect()
+    try:
+        if limit:
+            sql = f"SELECT * FROM ({sql.strip().rstrip(';')}) LIMIT {int(limit)}"
+        return con.execute(sql, params or {}).df()
+    finally:
+        con.close()
+
+
+# Template query ber-parameter. Tipe parameter: "date" (default dari hari ini - days), "float", "int".
+TEMPLATES: Dict[str, dict] = {
+    "Shopee & TikTok sama-sama lemah": {
+        "datasets": ["shopee_ads", "tiktok_campaign"],
+        "help": "Iklan Shopee dengan ROAS gabungan < batas dan campaign TikTok (nama memuat Nama Ringkasan iklan) dengan ROI < batas, pada rentang yang sama.",
+        "params": {"dari": ("date", 7), "sampai": ("date", 0), "batas_roas": ("float", 8.0), "batas_roi": ("float", 10.0)},
+        "sql": """
+WITH shopee AS (
+    SELECT "Nama Ringkasan" AS produk, sum("Biaya") AS biaya_shopee,
+           sum("Penjualan Langsung (GMV Langsung)") / nullif(sum("Biaya"), 0) AS roas_shopee
+    FROM shopee_ads
+    WHERE _tanggal BETWEEN $dari AND $sampai AND NOT coalesce("IS_AGGREGATE", false)
+    GROUP BY 1
+), tiktok AS (
+    SELECT _campaign AS campaign, sum(_biaya) AS biaya_tiktok, sum(_pendapatan) / nullif(sum(_biaya), 0) AS roi_tiktok
+    FROM tiktok_campaign
+    WHERE _tanggal BETWEEN $dari AND $sampai
+    GROUP BY 1
+)
+SELECT s.produk, t.campaign, s.roas_shopee, t.roi_tiktok, s.biaya_shopee, t.biaya_tiktok
+FROM shopee s JOIN tiktok t ON contains(lower(t.campaign), lower(s.produk))
+WHERE s.roas_shopee < $batas_roas AND t.roi_tiktok < $batas_roi
+ORDER BY s.biaya_shopee + t.biaya_tiktok DESC""",
+    },
+    "Shopee: iklan dengan ROAS di bawah batas": {
+        "datasets": ["shopee_ads"],
+        "help": "ROAS gabungan (total GMV / total biaya) per iklan selama rentang tanggal.",
+        "params": {"dari": ("date", 7), "sampai": ("date", 0), "batas_roas": ("float", 8.0)},
+        "sql": """
+SELECT "Nama Iklan", count(DISTINCT _tanggal) AS hari, sum("Biaya") AS biaya,
+       sum("Penjualan Langsung (GMV Langsung)") AS gmv, sum("Produk Terjual") AS terjual,
+       sum("Penjualan Langsung (GMV Langsung)") / nullif(sum("Biaya"), 0) AS roas
+FROM shopee_ads
+WHERE _tanggal BETWEEN $dari AND $sampai AND NOT coalesce("IS_AGGREGATE", false)
+GROUP BY 1
+HAVING roas < $batas_roas
+ORDER BY biaya DESC""",
+    },
+    "TikTok: campaign dengan ROI di bawah batas": {
+        "datasets": ["tiktok_campaign"],
+        "help": "ROI gabungan (total pendapatan / total biaya) per campaign selama rentang tanggal.",
+        "params": {"dari": ("date", 7), "sampai": ("date", 0), "batas_roi": ("float", 10.0)},
+        "sql": """
+SELECT _campaign AS campaign, count(DISTINCT _tanggal) AS hari, sum(_biaya) AS biaya, sum(_pendapatan) AS pendapatan,
+       sum(_pendapatan) / nullif(sum(_biaya), 0) AS roi
+FROM tiktok_campaign
+WHERE _tanggal BETWEEN $dari AND $sampai AND _biaya > 0
+GROUP BY 1
+HAVING roi < $batas_roi
+ORDER BY biaya DESC""",
+    },
+    "TikTok: produk dengan GMV harian tertinggi": {
+        "datasets": ["tiktok_daily"],
+        "help": "Total & rata-rata GMV harian per produk dari Daily Ads Comparator.",
+        "params": {"dari": ("date", 30), "sampai": ("date", 0), "top_n": ("int", 20)},
+        "sql": """
+SELECT "Produk", count(DISTINCT _tanggal) AS hari, sum("GMV") AS gmv, sum("GMV") / count(DISTINCT _tanggal) AS gmv_per_hari,
+       sum("Pesanan") AS pesanan
+FROM tiktok_daily
+WHERE _tanggal BETWEEN $dari AND $sampai
+GROUP BY 1
+ORDER BY gmv DESC
+LIMIT $top_n""",
+    },
+    "Meta: kampanye dengan ROAS di bawah batas": {
+        "datasets": ["meta_kpi"],
+        "help": "Rata-rata ROAS pembelian dan total biaya per kampanye (CPAS & Whatsapp Ads).",
+        "params": {"dari": ("date", 7), "sampai": ("date", 0), "batas_roas": ("float", 10.0)},
+        "sql": """
+SELECT _mode AS mode, _campaign AS kampanye, count(DISTINCT _tanggal) AS hari, sum(_biaya) AS biaya,
+       avg(_roas) AS roas_rata2
+FROM meta_kpi
+WHERE _tanggal BETWEEN $dari AND $sampai
+GROUP BY 1, 2
+HAVING roas_rata2 < $batas_roas
+ORDER BY biaya DESC""",
+    },
+}
@@ -0,0 +1,242 @@
+# meta_kpi.py
+# Logika KPI Highlight META (CPAS & Whatsapp Ads) di level modul, supaya bisa dipakai
+# untuk satu file maupun banyak file sekaligus (diproses paralel di process pool).
+
+import re
+import zipfile
+from io import BytesIO
+from typing import Optional
+
+import pandas as pd
+from openpyxl import Workbook
+
+import dtype_plan
+import excel_reader
+import exporter
+import facts
+import lake
+import upload_cache
+import xlstyle
+
+KEEP_DECIMAL_COLS = ["Frekuensi", "Tingkat klik tayang outbound"]
+TARGET_ROAS_COLS = ["ROAS Pembelian Khusus untuk Item Bersama", "ROAS pembelian khusus untuk item bersama"]
+ACCOUNT_COLS = ["nama akun", "account name", "nama akun iklan"]
+SOURCE_COL = "Sumber File"
+
+# mode -> (judul sheet, baris header Excel, header pandas saat membaca)
+MODES = {
+    "cpas": ("KPI Highlight", 1, 0),
+    "whatsapp": ("KPI Highlight Custom", 3, 2),
+}
+
+
+def is_number(x):
+    try:
+        if pd.isna(x): return False
+        float(x)
+        return True
+    except:
+        return False
+
+
+def find_campaign_col(df):
+    return next((c for c in df.columns if "kampanye" in str(c).lower() or "campaign" in str(c).lower()), None)
+
+
+def load_meta_frame(file_bytes: bytes, mode: str) -> pd.DataFrame:
+    df = excel_reader.read_excel(file_bytes, header=MODES[mode][2])
+    if mode == "whatsapp":
+        # Hanya hapus kolom yang header-nya tidak punya nama (Unnamed) atau kosong
+        df = df.loc[:, ~df.columns.str.contains('^Unnamed', na=False)]
+        df = df.loc[:, df.columns.notna()]
+        df = df.loc[:, df.columns != ""]
+    num_cols = df.select_dtypes(include="number").columns
+    df[num_cols] = df[num_cols].fillna(0)
+    return dtype_plan.optimize(df)
+
+
+def report_date(df: pd.DataFrame) -> str:
+    # Isi kolom "Awal pelaporan" (YYYY-MM-DD jika datetime), dipakai untuk nama file/sheet
+    if "Awal pelaporan" in df.columns and not df["Awal pelaporan"].dropna().empty:
+        raw_tgl = df["Awal pelaporan"].dropna().iloc[0]
+        if pd.notna(raw_tgl):
+            return raw_tgl.strftime("%Y-%m-%d") if hasattr(raw_tgl, 'strftime') else str(raw_tgl).replace("/", "-")
+    return ""
+
+
+def account_name(df: pd.DataFrame, fallback: str) -> str:
+    for col in df.columns:
+        if str(col).strip().lower() in ACCOUNT_COLS:
+            vals = df[col].dropna()
+            if not vals.empty:
+                return str(vals.iloc[0]).strip()
+    return fallback
+
+
+def output_filename(base_name: str, tgl: str) -> str:
+    return f"{base_name}_{tgl}_sorted.xlsx" if tgl else f"{base_name}_sorted.xlsx"
+
+
+def save_to_lake(df: pd.DataFrame, mode: str, file_name: str, file_bytes: bytes) -> int:
+    # Frame KPI ke lake (dataset meta_kpi) + kolom turunan yang seragam untuk CPAS & Whatsapp Ads,
+    # lalu dipetakan ke tabel fakta lintas platform (facts.py)
+    def num(col):
+        return pd.to_numeric(df[col], errors="coerce").astype("float64") if col else pd.Series(float("nan"), index=df.index)
+
+    camp = find_campaign_col(df)
+    spend = next((c for c in df.columns if any(k in str(c).lower() for k in ("dibelanjakan", "amount spent"))), None)
+    roas = next((c for c in TARGET_ROAS_COLS if c in df.columns), None)
+    tgl = report_date(df)
+    signature = upload_cache.content_key(f"meta_{mode}", file_bytes)
+    derived = {
+        "_mode": mode,
+        "_campaign": df[camp].astype(str) if camp else pd.Series("", index=df.index),
+        "_biaya": num(spend),
+        "_roas": num(roas),
+    }
+    n = lake.save("meta_kpi", df, tgl, f"{mode}_{file_name}", derived=derived, signature=signature)
+
+    # Pendapatan: nilai konversi pembelian jika ada di export, selain itu biaya x ROAS
+    value_col = facts.pick(df, ["nilai konversi pembelian", "purchases conversion value"], exclude=())
+    fact = facts.build(
+        df, "meta", date="Awal pelaporan" if "Awal pelaporan" in df.columns else tgl,
+        account=account_name(df, file_name.rsplit(".", 1)[0]), campaign=camp, spend=spend,
+        revenue=num(value_col) if value_col else derived["_biaya"] * derived["_roas"],
+        orders=facts.pick(df, facts.ORDER_KEYS), impressions=facts.pick(df, facts.IMPRESSION_KEYS),
+        clicks=facts.pick(df, facts.CLICK_KEYS),
+    )
+    facts.save(fact, f"meta_{mode}_{file_name}", signature=signature)
+    return n
+
+
+def write_kpi_sheet(ws, df: pd.DataFrame, mode: str, styles: Optional[xlstyle.OpenpyxlStyles] = None):
+    # styles boleh dibagi antar sheet dalam satu workbook (lihat build_combined_workbook)
+    styles = styles or xlstyle.OpenpyxlStyles()
+    header_row = MODES[mode][1]
+    for c_idx, col in enumerate(df.columns, start=1):
+        ws.cell(row=header_row, column=c_idx, value=col)
+
+    camp_col = find_campaign_col(df) if mode == "whatsapp" else None
+
+    for r_idx, (_, row) in enumerate(df.iterrows(), start=header_row + 1):
+        for c_idx, col in enumerate(df.columns, start=1):
+            raw_val = row[col]
+            cell = ws.cell(row=r_idx, column=c_idx)
+
+            if is_number(raw_val):
+                v = float(raw_val)
+                if "%ATC" in str(col):
+                    cell.value = v / 100.0 if v > 1 else v
+                    num_style = "persen"
+                elif col in KEEP_DECIMAL_COLS:
+                    cell.value = v
+                    num_style = "desimal"
+                else:
+                    cell.value = v
+                    num_style = "bulat"
+
+                kpi = None
+                if col == "CPM (Biaya Per 1.000 Tayangan)" and v > 15000: kpi = "kpi_merah"
+                if col == "CTR (Rasio Klik Tayang Tautan)" and v < 0.5: kpi = "kpi_merah"
+                if col == "Frekuensi" and v > 3: kpi = "kpi_merah"
+
+                if mode == "cpas":
+                    if col in TARGET_ROAS_COLS and v >= 10: kpi = "kpi_hijau"
+                elif col == "Biaya per hasil" and camp_col is not None:
+                    camp_name = str(row[camp_col]).lower()
+                    batas = 500 if "visit" in camp_name else 5000
+                    if v > batas: kpi = "kpi_merah"
+                styles.apply(cell, num_style, kpi)
+            else:
+                cell.value = raw_val
+
+    exporter.autofit(ws, df, min_width=15, max_width=50)
+
+
+def excel_highlight_and_write(df: pd.DataFrame, mode: str) -> BytesIO:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = MODES[mode][0]
+    write_kpi_sheet(ws, df, mode)
+
+    out = BytesIO()
+    wb.save(out)
+    out.seek(0)
+    return out
+
+
+def process_meta_file(file_name: str, file_bytes: bytes, mode: str) -> dict:
+    # Worker untuk process pool: baca satu file, siapkan label sheet & export per-file
+    base_name = file_name.rsplit(".", 1)[0]
+    try:
+        df = upload_cache.frame(f"meta_{mode}", file_bytes, lambda: load_meta_frame(file_bytes, mode))
+        tgl = report_date(df)
+        akun = account_name(df, base_name)
+        save_to_lake(df, mode, file_name, file_bytes)
+        return {
+            "file_name": file_name,
+            "label": f"{akun}_{tgl}" if tgl else akun,
+            "output_name": output_filename(base_name, tgl),
+            "df": df,
+            "xlsx": excel_highlight_and_write(df, mode).getvalue(),
+            "error": None,
+        }
+    except Exception as e:
+        return {"file_name": file_name, "error": str(e)}
+
+
+def safe_sheet_name(label: str, used: set) -> str:
+    name = re.sub(r"[\[\]:*?/\\]", "-", str(label)).strip() or "Sheet"
+    name = name[:31]
+    candidate, n = name, 2
+    while candidate.upper() in used or candidate.upper() == "ALL":
+        suffix = f"~{n}"
+        candidate = name[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.upper())
+    return candidate
+
+
+def stacked_frame(results: list) -> pd.DataFrame:
+    # Semua file berhasil ditumpuk jadi satu frame, kolom pertama = Sumber File (label akun/tanggal)
+    ok = [r for r in results if not r.get("error")]
+    if not ok:
+        return pd.DataFrame(columns=[SOURCE_COL])
+    stacked = pd.concat(
+        [r["df"].assign(**{SOURCE_COL: r["label"]}) for r in ok],
+        ignore_index=True, sort=False,
+    )
+    return stacked[[SOURCE_COL] + [c for c in stacked.columns if c != SOURCE_COL]]
+
+
+def build_combined_workbook(results: list, mode: str) -> bytes:
+    # Satu workbook: sheet "ALL" (semua file ditumpuk + kolom Sumber File) lalu satu sheet per akun/tanggal
+    ok = [r for r in results if not r.get("error")]
+    wb = Workbook()
+    ws_all = wb.active
+    ws_all.title = "ALL"
+    styles = xlstyle.OpenpyxlStyles()
+    if ok:
+        write_kpi_sheet(ws_all, stacked_frame(results), mode, styles)
+
+    used = set()
+    for r in ok:
+        ws = wb.create_sheet(safe_sheet_name(r["label"], used))
+        write_kpi_sheet(ws, r["df"], mode, styles)
+
+    return exporter.read_bytes(exporter.excel_file(wb.save))
+
+
+def build_zip(results: list) -> bytes:
+    out = exporter.spooled_file()
+    used = set()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for r in results:
+            if r.get("error"): continue
+            name, n = r["output_name"], 2
+            while name in used:
+                name = r["output_name"].replace("_sorted.xlsx", f"_{n}_sorted.xlsx")
+                n += 1
+            used.add(name)
+            zf.writestr(name, r["xlsx"])
+    return exporter.read_bytes(out)
@@ -0,0 +1,48 @@
+# parallel.py
+# Helper kecil untuk menjalankan pekerjaan berat (parse/export per file) di process pool.
+# Fungsi yang dijalankan harus berada di level modul agar bisa di-pickle.
+# Jika pool tidak tersedia (mis. lingkungan terbatas), otomatis jatuh ke mode sekuensial.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Sequence
+
+import config
+
+
+def default_workers() -> int:
+    if config.MAX_WORKERS > 0:
+        return config.MAX_WORKERS
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _run_sequential(fn, arg_list, on_progress):
+    results = []
+    for i, args in enumerate(arg_list, start=1):
+        results.append(fn(*args))
+        if on_progress: on_progress(i, len(arg_list))
+    return results
+
+
+def run_parallel(fn: Callable, arg_list: Sequence[tuple], max_workers: Optional[int] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None) -> list:
+    # Hasil dikembalikan sesuai urutan input. on_progress(selesai, total) dipanggil di thread pemanggil.
+    arg_list = list(arg_list)
+    workers = min(max_workers or default_workers(), len(arg_list))
+    if workers <= 1:
+        return _run_sequential(fn, arg_list, on_progress)
+
+    results = [None] * len(arg_list)
+    try:
+        # "spawn" aman dipakai dari thread script Streamlit (fork dari proses multi-thread bisa deadlock)
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+            futures = {ex.submit(fn, *args): i for i, args in enumerate(arg_list)}
+            for done, fut in enumerate(as_completed(futures), start=1):
+                results[futures[fut]] = fut.result()
+                if on_progress: on_progress(done, len(arg_list))
+    except (BrokenProcessPool, OSError, NotImplementedError):
+        return _run_sequential(fn, arg_list, on_progress)
+    return results
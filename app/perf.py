@@ -0,0 +1,141 @@
+# perf.py
+# Instrumentasi opsional per tahap pipeline: wall time, baris yang diproses, dan puncak RSS.
+# Setiap tahap dicatat sebagai satu baris log JSON di logger "ads.perf" dan bisa ditampilkan
+# sebagai tabel di UI (expander "⏱️ Timings").
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+import streamlit as st
+
+import config
+
+logger = logging.getLogger("ads.perf")
+_logger_ready = False
+_SAMPLE_INTERVAL = 0.02
+
+
+def _setup_logger():
+    global _logger_ready
+    if _logger_ready:
+        return
+    _logger_ready = True
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        if config.PERF_LOG_FILE:
+            file_handler = logging.FileHandler(config.PERF_LOG_FILE, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(file_handler)
+
+
+def current_rss() -> Optional[int]:
+    # RSS proses saat ini dalam byte (Linux: /proc, lainnya: fallback ke ru_maxrss)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def perf_enabled() -> bool:
+    try:
+        return bool(st.session_state.get("perf_enabled", config.PERF_DEFAULT))
+    except Exception:
+        return config.PERF_DEFAULT
+
+
+class _PeakSampler(threading.Thread):
+    # Thread kecil yang mem-polling RSS selama satu tahap berjalan untuk mencari puncaknya.
+    def __init__(self, start_rss):
+        super().__init__(daemon=True)
+        self.peak = start_rss or 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(_SAMPLE_INTERVAL):
+            rss = current_rss()
+            if rss and rss > self.peak:
+                self.peak = rss
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1)
+        rss = current_rss()
+        if rss and rss > self.peak:
+            self.peak = rss
+        return self.peak
+
+
+def _mb(n):
+    return None if n is None else round(n / (1024 * 1024), 1)
+
+
+class PerfTracker:
+    def __init__(self, pipeline: str, enabled: Optional[bool] = None):
+        self.pipeline = pipeline
+        self.enabled = perf_enabled() if enabled is None else enabled
+        self.records = []
+        if self.enabled:
+            _setup_logger()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        # Isi rec["rows"] di dalam blok with jika jumlah baris baru diketahui setelah tahap selesai.
+        rec = {"pipeline": self.pipeline, "stage": name, "rows": rows}
+        if not self.enabled:
+            yield rec
+            return
+
+        start_rss = current_rss()
+        sampler = _PeakSampler(start_rss)
+        sampler.start()
+        status = "ok"
+        t0 = time.perf_counter()
+        try:
+            yield rec
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            wall = time.perf_counter() - t0
+            peak = sampler.stop()
+            rec.update({
+                "wall_ms": round(wall * 1000, 1),
+                "rss_start_mb": _mb(start_rss),
+                "rss_peak_mb": _mb(peak),
+                "rss_delta_mb": _mb(peak - start_rss) if start_rss is not None and peak else None,
+                "status": status,
+                "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            })
+            self.records.append(rec)
+            try:
+                logger.info(json.dumps(rec, default=str))
+            except Exception:
+                pass
+
+    def render(self, title: Optional[str] = None):
+        if not self.enabled or not self.records:
+            return
+        import pandas as pd
+        cols = ["stage", "wall_ms", "rows", "rss_start_mb", "rss_peak_mb", "rss_delta_mb", "status"]
+        table = pd.DataFrame(self.records).reindex(columns=cols)
+        total_ms = table["wall_ms"].sum()
+        with st.expander(title or f"⏱️ Timings — {self.pipeline} ({total_ms:,.0f} ms)", expanded=False):
+            st.dataframe(table, use_container_width=True, hide_index=True)
@@ -0,0 +1,18 @@
+# platforms
+# Satu modul per halaman. Modul halaman baru di-import saat halamannya pertama kali dibuka,
+# jadi landing page (Panduan) tidak ikut memuat pandas/openpyxl. Setelah itu modul tersimpan
+# di sys.modules sehingga rerun berikutnya tidak mendefinisikan ulang helper apa pun.
+
+import importlib
+
+PAGE_MODULES = {
+    "Panduan": "panduan",
+    "Shopee": "shopee",
+    "Meta": "meta",
+    "TikTok": "tiktok",
+    "Query": "query",
+}
+
+
+def load_page(page: str):
+    return importlib.import_module(f"{__name__}.{PAGE_MODULES[page]}")
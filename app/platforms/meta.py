@@ -0,0 +1,232 @@
+# meta.py
+# Halaman META Ads KPI Highlighter (CPAS & Whatsapp Ads). Logika KPI ada di meta_kpi.py.
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+import exporter
+import meta_kpi
+import parallel
+import perf
+import preview
+import upload_cache
+
+
+META_CSS = """
+<style>
+    /* Scoped META styling */
+    html, body, .stApp, .reportview-container, .main, .block-container { background-color: #0066E7 !important; }
+    section[data-testid="stSidebar"] > div:first-child { background-color: #0066E7 !important; }
+    section[data-testid="stSidebar"] * { color: #ffffff !important; }
+    div[data-testid="stFileUploader"] .upload-container,
+    .stFileUploader > div {
+        background-color: #ffffff !important;
+        color: #0066E7 !important;
+        border-radius: 8px !important;
+        border: 1px solid rgba(0,102,231,0.18) !important;
+    }
+    .stFileUploader p, .stFileUploader label, .stFileUploader span { color: #0066E7 !important; }
+    .stFileUploader button { background-color: #ffffff !important; color: #0066E7 !important; border: 1px solid #0066E7 !important; }
+    .stDataFrame, .stDataFrame table, .ag-root { background-color: #ffffff !important; color: #000000 !important; }
+    div[data-testid="stTabs"] button { color: #ffffff !important; font-weight: bold; }
+    div[data-testid="stTabs"] button[aria-selected="true"] { color: #FFD700 !important; border-bottom-color: #FFD700 !important; }
+</style>
+"""
+
+
+# Hasil parse dibagi lintas sesi (upload_cache): ganti halaman preview atau rekan yang meng-upload
+# file yang sama tidak mem-parse ulang
+def load_meta_excel(file_bytes: bytes, mode: str) -> pd.DataFrame:
+    return upload_cache.frame(f"meta_{mode}", file_bytes, lambda: meta_kpi.load_meta_frame(file_bytes, mode))
+
+
+@st.cache_data(show_spinner=False)
+def excel_highlight_and_write(df: pd.DataFrame, mode: str) -> bytes:
+    return meta_kpi.excel_highlight_and_write(df, mode).getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def parquet_export(df: pd.DataFrame) -> bytes:
+    return exporter.parquet_bytes(df)
+
+
+KEEP_DECIMAL_COLS = meta_kpi.KEEP_DECIMAL_COLS
+
+
+def format_cells_for_preview(val, column):
+    if pd.isna(val): return ""
+    try: v = float(val)
+    except: return val
+
+    if "%ATC" in str(column):
+        if v <= 1: v = v * 100
+        return f"{v:.2f}%"
+
+    if column in KEEP_DECIMAL_COLS: 
+        return f"{v:.2f}"
+    return f"{v:.0f}"
+
+
+def kpi_css_lama(df):
+    # Mask highlight dihitung sekali untuk seluruh frame (vektor), bukan per sel
+    css = preview.empty_css(df)
+    red, green = "background-color: #ffc7ce", "background-color: #c6efce"
+    preview.paint(css, preview.numeric(df, "CPM (Biaya Per 1.000 Tayangan)") > 15000, red, ["CPM (Biaya Per 1.000 Tayangan)"])
+    preview.paint(css, preview.numeric(df, "CTR (Rasio Klik Tayang Tautan)") < 0.5, red, ["CTR (Rasio Klik Tayang Tautan)"])
+    preview.paint(css, preview.numeric(df, "Frekuensi") > 3, red, ["Frekuensi"])
+    preview.paint(css, preview.numeric(df, "ROAS Pembelian Khusus untuk Item Bersama") >= 10, green, ["ROAS Pembelian Khusus untuk Item Bersama"])
+    return css
+
+
+def kpi_css_baru(df):
+    css = preview.empty_css(df)
+    red = "background-color: #ffc7ce"
+    camp_col = meta_kpi.find_campaign_col(df)
+
+    preview.paint(css, preview.numeric(df, "CPM (Biaya Per 1.000 Tayangan)") > 15000, red, ["CPM (Biaya Per 1.000 Tayangan)"])
+    preview.paint(css, preview.numeric(df, "CTR (Rasio Klik Tayang Tautan)") < 0.5, red, ["CTR (Rasio Klik Tayang Tautan)"])
+    preview.paint(css, preview.numeric(df, "Frekuensi") > 3, red, ["Frekuensi"])
+    if camp_col is not None and "Biaya per hasil" in df.columns:
+        # Kampanye "visit" memakai ambang 500, selain itu 5000
+        is_visit = df[camp_col].astype(str).str.lower().str.contains("visit", regex=False).to_numpy()
+        batas = np.where(is_visit, 500, 5000)
+        preview.paint(css, preview.numeric(df, "Biaya per hasil") > batas, red, ["Biaya per hasil"])
+    return css
+
+
+def render_single(uploaded_file, mode, kpi_css, subheader, download_label, key_suffix, error_hint=""):
+    tracker = perf.PerfTracker(f"meta_{mode}")
+    try:
+        with tracker.stage("load xlsx") as rec:
+            df = load_meta_excel(uploaded_file.getvalue(), mode)
+            rec["rows"] = len(df)
+        with tracker.stage("simpan ke lake (parquet)", rows=len(df)):
+            meta_kpi.save_to_lake(df, mode, uploaded_file.name, uploaded_file.getvalue())
+
+        # Nama file final: <nama asli>_<Awal pelaporan>_sorted.xlsx
+        base_name = uploaded_file.name.rsplit(".", 1)[0]
+        final_filename = meta_kpi.output_filename(base_name, meta_kpi.report_date(df))
+
+        with tracker.stage("preview (Styler)", rows=len(df)):
+            st.subheader(subheader)
+            preview.render_preview(
+                df, key=f"meta_preview_{key_suffix}", css=kpi_css(df),
+                formatters={col: (lambda v, c=col: format_cells_for_preview(v, c)) for col in df.columns},
+            )
+
+        with tracker.stage("export xlsx", rows=len(df)):
+            excel_bytes = excel_highlight_and_write(df, mode)
+        with tracker.stage("export parquet", rows=len(df)):
+            parquet_bytes = parquet_export(df)
+
+        col_xlsx, col_pq = st.columns(2)
+        with col_xlsx:
+            st.download_button(
+                label=download_label,
+                data=excel_bytes,
+                file_name=final_filename,
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key=f"download_meta_{key_suffix}"
+            )
+        with col_pq:
+            st.download_button(
+                label="⬇️ Download Parquet",
+                data=parquet_bytes,
+                file_name=final_filename.replace(".xlsx", ".parquet"),
+                mime=exporter.PARQUET_MIME,
+                key=f"download_meta_parquet_{key_suffix}"
+            )
+    except Exception as e:
+        st.error(f"Gagal membaca file: {e}{error_hint}")
+
+    tracker.render()
+
+
+def render_batch(uploaded_files, mode, key_suffix):
+    # Mode banyak file: diproses paralel, hasil berupa 1 workbook gabungan atau ZIP per file
+    st.info(f"📚 {len(uploaded_files)} file diunggah — mode banyak file.")
+    output_mode = st.radio(
+        "Format hasil",
+        ["Workbook gabungan (sheet ALL + 1 sheet per akun/tanggal)", "ZIP (1 file Excel per upload)"],
+        key=f"meta_batch_output_{key_suffix}",
+    )
+    state_key = f"meta_batch_result_{key_suffix}"
+    signature = (mode, output_mode, tuple((f.name, f.size) for f in uploaded_files))
+
+    if st.button("🚀 Proses semua file", key=f"meta_batch_btn_{key_suffix}"):
+        tracker = perf.PerfTracker(f"meta_{mode}_batch")
+        progress = st.progress(0.0, text="Memproses file...")
+        with tracker.stage("parse + export per file (paralel)", rows=len(uploaded_files)):
+            results = parallel.run_parallel(
+                meta_kpi.process_meta_file,
+                [(f.name, f.getvalue(), mode) for f in uploaded_files],
+                on_progress=lambda done, total: progress.progress(done / total, text=f"Memproses file {done}/{total}..."),
+            )
+        with tracker.stage("susun output", rows=sum(len(r["df"]) for r in results if not r.get("error"))):
+            if output_mode.startswith("ZIP"):
+                data, file_name, mime = meta_kpi.build_zip(results), f"meta_kpi_{mode}_{len(results)}_files.zip", "application/zip"
+            else:
+                data = meta_kpi.build_combined_workbook(results, mode)
+                file_name = f"meta_kpi_{mode}_{len(results)}_files.xlsx"
+                mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        with tracker.stage("export parquet (ALL)"):
+            parquet_all = exporter.parquet_bytes(meta_kpi.stacked_frame(results))
+        progress.empty()
+        st.session_state[state_key] = {
+            "signature": signature, "data": data, "file_name": file_name, "mime": mime, "parquet": parquet_all,
+            "errors": [(r["file_name"], r["error"]) for r in results if r.get("error")],
+            "summary": pd.DataFrame([
+                {"File": r["file_name"], "Sheet / Label": r.get("label", "-"), "Baris": len(r["df"]) if not r.get("error") else 0}
+                for r in results
+            ]),
+        }
+        tracker.render()
+
+    result = st.session_state.get(state_key)
+    if result and result["signature"] == signature:
+        for fname, err in result["errors"]:
+            st.error(f"Gagal memproses {fname}: {err}")
+        st.dataframe(result["summary"], use_container_width=True, hide_index=True)
+        st.download_button(
+            label="⬇️ Download hasil gabungan",
+            data=result["data"],
+            file_name=result["file_name"],
+            mime=result["mime"],
+            key=f"download_meta_batch_{key_suffix}",
+        )
+        st.download_button(
+            label="⬇️ Download Parquet (ALL + Sumber File)",
+            data=result["parquet"],
+            file_name=f"meta_kpi_{mode}_{len(uploaded_files)}_files.parquet",
+            mime=exporter.PARQUET_MIME,
+            key=f"download_meta_batch_parquet_{key_suffix}",
+        )
+
+
+def render():
+    st.title("META Ads KPI Highlighter")
+    st.markdown(META_CSS, unsafe_allow_html=True)
+
+    tab_lama, tab_baru = st.tabs(["CPAS", "Whatsapp Ads"])
+
+    # TAB 1: APLIKASI LAMA (STANDAR)
+    with tab_lama:
+        uploaded_files_lama = st.file_uploader("Upload file Excel (.xlsx) - Standar", type=["xlsx"], accept_multiple_files=True, key="meta_uploader_lama")
+
+        if len(uploaded_files_lama) == 1:
+            render_single(uploaded_files_lama[0], "cpas", kpi_css_lama, "📌 Preview Data - Standar", "⬇️ Download Excel (Standar)", "lama")
+        elif len(uploaded_files_lama) > 1:
+            render_batch(uploaded_files_lama, "cpas", "lama")
+
+    # TAB 2: APLIKASI BARU (CUSTOM)
+    with tab_baru:
+        uploaded_files_baru = st.file_uploader("Upload file Excel (.xlsx) - Custom (Header Baris 3)", type=["xlsx"], accept_multiple_files=True, key="meta_uploader_baru")
+
+        if len(uploaded_files_baru) == 1:
+            render_single(
+                uploaded_files_baru[0], "whatsapp", kpi_css_baru, "📌 Preview Data - Custom", "⬇️ Download Excel (Custom Biaya per hasil)", "baru",
+                error_hint=". Pastikan header tabel berada tepat di baris ke-3 Excel Anda.",
+            )
+        elif len(uploaded_files_baru) > 1:
+            render_batch(uploaded_files_baru, "whatsapp", "baru")
@@ -0,0 +1,98 @@
+# panduan.py
+# Halaman Panduan (landing page). Sengaja tanpa pandas/openpyxl agar tampil instan.
+
+import streamlit as st
+
+
+def render():
+    st.title("📖 Panduan Penggunaan Tools")
+    st.markdown("""
+    Selamat datang di **Multi-Platform Excel Utilities**! Dashboard ini dirancang untuk mempercepat proses pengolahan data iklan dan performa produk dari berbagai platform.
+    
+    Silakan klik pada masing-masing platform di bawah ini untuk melihat cara kerja dan format file yang dibutuhkan.
+    """)
+
+    # --- PANDUAN SHOPEE ---
+    with st.expander("🟠 Panduan Shopee & CPAS", expanded=True):
+        st.markdown("""
+        **1. Shopee Out platform**
+        * **Fungsi:** Menukar titik & koma pada angka (agar bisa diolah), mengurutkan data berdasarkan channel, dan memfilter produk yang terjual/masuk keranjang.
+        * **Format File:** Excel (`.xlsx` / `.xls`) hasil *export* performa produk Shopee. Pastikan ada sheet bernama **Performa Produk**.
+        * **Cara pakai:** Unduh file laporan out  platform Shopee, lalu upload di tab ini. Proses akan otomatis menghasilkan 2 file Excel: 1 untuk hasil convert titik/komanya (JIka perlu), dan 1 lagi untuk hasil sort/filter berdasarkan channel.
+        * **Banyak toko:** Upload beberapa file sekaligus (1 file per toko). Semua dibaca paralel lalu digabung jadi 1 file sort/filter dengan kolom **Toko** dan ringkasan Sales/Traffic/Instagram per toko.
+        
+        **2. ✨ Analitik Produk (Rapikan Variasi)**
+        * **Fungsi:** Menggabungkan baris variasi produk menjadi satu total penjualan, memberikan *highlight* warna, dan menghitung persentase konversi secara otomatis.
+        * **Format File:** Excel (`.xlsx`) atau CSV dari analitik produk Shopee. Pastikan memiliki kolom **Kode Produk** dan **Nama Variasi**.
+        * **Cara pakai:** Upload file analitik produk, lalu klik tombol "Process". Hasilnya akan berupa file Excel yang sudah di-merge, diberi warna, memiliki dropdown warna khusus, serta baris **Grand Total** di akhir setiap produk.
+        * **Bandingkan Periode:** Upload 2 file atau lebih (mis. bulan lalu & bulan ini) sekaligus. Tiap produk/variasi dicocokkan lewat **Kode Produk + Nama Variasi**, lalu dihitung selisih (Δ), persentase perubahan (Δ%), dan perubahan rasio konversi (poin). Variasi yang baru muncul atau hilang ditandai di kolom **Status**. Hasilnya bisa diunduh sebagai Excel (dengan format merge & warna yang sama) atau CSV.
+
+        **3. 📊 Shopee Ads (CSV to Excel)**
+        * **Fungsi:** Merapikan data mentah iklan Shopee dan memberikan *highlight* warna otomatis berdasarkan performa ROAS/Efektivitas (Merah = Buruk, Kuning = Sedang, Hijau = Bagus).
+        * **Format File:** File mentah `.csv` dari Shopee Ads. Pilih mode "Keseluruhan" atau "Grup Iklan" sesuai kebutuhan.
+        * **Cara pakai:** Upload file CSV, pilih mode yang sesuai, dan hasilnya akan langsung bisa diunduh dalam format Excel yang sudah dirapikan dan diberi warna.
+        * **Histori Tren:** Ringkasan tiap upload disimpan per tanggal laporan. Di bagian **📈 Tren Harian Iklan** kamu bisa melihat pergerakan ROAS, Biaya, dan Produk Terjual per iklan, iklan yang baru berubah jadi MERAH, serta perbandingan minggu ini vs minggu lalu.
+        
+        **4. 🔗 UTM Link Cleaner**
+        * **Fungsi:** Membersihkan link produk Shopee yang terlalu panjang (karena UTM tracking) menjadi link pendek yang rapi untuk dibagikan.
+        * **Cara Pakai:** *Paste* link panjang, klik proses, dan *copy* hasilnya.
+        """)
+
+    # --- PANDUAN META ---
+    with st.expander("🔵 Panduan Meta Ads"):
+        st.markdown("""
+        Tools ini berfungsi untuk memberikan *highlight* warna (merah/hijau) secara otomatis pada KPI yang penting seperti CPM, CTR, Frekuensi, dan ROAS.
+        
+        **1. Tab CPAS (Standar)**
+        * Gunakan tab ini untuk data hasil *export* Meta Ads standar.
+        * **Format File:** Excel (`.xlsx`). Header tabel harus berada di **baris ke-1**.
+        
+        **2. Tab Whatsapp Ads (Custom)**
+        * Gunakan tab ini jika *export* data Meta kamu memiliki format khusus (misalnya ada *summary* di atas tabel).
+        * **Format File:** Excel (`.xlsx`). Sistem membaca header tabel dimulai dari **baris ke-3**.
+        
+        **Banyak file sekaligus:** Upload lebih dari 1 file di tab mana pun untuk memproses semuanya secara paralel. Hasilnya bisa berupa 1 workbook gabungan (sheet **ALL** + 1 sheet per akun/tanggal) atau ZIP berisi 1 file Excel per upload.
+        
+        💡 **Indikator Warna Meta:**
+        * 🔴 **Merah:** CPM > 15.000, CTR < 0.5%, Frekuensi > 3, atau Biaya per hasil terlalu tinggi.
+        * 🟢 **Hijau:** ROAS >= 10.
+        """)
+
+    # --- PANDUAN TIKTOK ---
+    with st.expander("🎵 Panduan TikTok Ads"):
+        st.markdown("""
+        **1. Excel Fixer & Pewarnaan ROI**
+        * **Fungsi:** Mengamankan ID Campaign agar tidak berubah format menjadi angka *scientific*, mengubah koma menjadi titik, dan mewarnai baris berdasarkan nilai ROI.
+        * **Format File:** Excel (`.xlsx` / `.xls`) dari TikTok Ads. Header dibaca secara otomatis.
+        
+        **2. Daily Ads Comparator**
+        * **Fungsi:** Menggabungkan beberapa file laporan harian menjadi satu *dashboard* tren untuk melihat performa dari hari ke hari (per produk).
+        * **Cara Pakai:** Upload beberapa file harian sekaligus. Sistem akan menyimpannya dalam *cache*. Setelah semua file ter-upload, kamu bisa melihat grafiknya langsung di sini atau men-download hasil Excel-nya (1 sheet per produk).
+        * **Format File:** Laporan harian TikTok (`.xlsx`). Tabel data harus dimulai pada baris ke-4 (Header di baris 3).
+        * **Bandingkan Periode:** Bandingkan 7/14 hari terakhir dengan periode sebelumnya, bulan ini dengan bulan lalu, atau dua rentang pilihan sendiri. Hasilnya berupa total per metrik dan daftar produk yang naik/turun paling besar (misalnya menurut GMV). Jumlah hari yang ada datanya di tiap periode ikut ditampilkan.
+        * **Mingguan & Bulanan:** Tab tambahan di tampilan Keseluruhan dan tiap produk merangkum data per minggu ISO (Senin–Minggu) dan per bulan. Rata-rata per hari dihitung hanya atas hari yang ada datanya, jumlah hari kalender vs hari ada data ditampilkan per periode, dan rollup ikut menjadi sheet tambahan di Excel `dailycompare_*`. Ringkasan tetap tersimpan walau tanggalnya sudah dibuang dari cache.
+        * **Deteksi Anomali:** Setiap produk × metrik per hari dibandingkan dengan baseline beberapa hari sebelumnya (median/MAD atau rata-rata/std). Daftar anomali diurutkan dari penyimpangan terbesar (merah = turun, hijau = naik) dan bisa di-download sebagai Excel dengan sel anomali ditandai.
+        * **Batas cache:** Cache dibatasi ukuran memori (bukan jumlah hari). Jika penuh, tanggal yang paling lama tidak dipakai (atau tanggal paling tua, bisa dipilih) dibuang dan namanya ditampilkan sebagai peringatan.
+        """)
+
+    # --- PANDUAN QUERY ---
+    with st.expander("🔎 Panduan Query Data Historis"):
+        st.markdown("""
+        * **Fungsi:** Hasil akhir setiap tool (Shopee Ads, Shopee Out, Analitik Produk, Meta KPI, TikTok Fixer, TikTok Daily) otomatis disimpan ke *data lake* lokal (Parquet) per tanggal laporan. Halaman **Query** menjawab pertanyaan lintas bulan & lintas platform tanpa membuka ulang file Excel.
+        * **Lintas Platform:** Laporan Shopee Ads, Meta, dan TikTok Fixer dipetakan ke satu tabel fakta (tanggal, platform, akun, campaign, produk, spend, revenue, pesanan, impresi, klik). Tab ini menghitung ROAS, CTR, CPC, dan CPM gabungan per platform, tanggal, akun, campaign, atau produk.
+        * **Template:** Pilih pertanyaan (mis. *iklan Shopee ROAS < 8 dan campaign TikTok ROI < 10 minggu lalu*), atur parameternya, lalu klik Jalankan. Hasil bisa diunduh sebagai CSV/Parquet.
+        * **SQL:** Tulis query `SELECT` sendiri (DuckDB). Tiap dataset adalah satu tabel, dengan kolom `_tanggal` dan `_sumber` (nama file).
+        * **Upload ulang** file yang sama menimpa datanya, jadi tidak ada data dobel. Tanggal yang salah bisa dihapus di tab **Kelola Lake**.
+        * **Tanggal laporan** selalu diambil dari isi export (bukan tanggal proses). Export tanpa tanggal tetap disimpan sebagai **(tanpa tanggal)** dan tidak ikut filter rentang tanggal maupun tabel lintas platform.
+        """)
+
+    # --- TIPS TAMBAHAN ---
+    st.info("""
+    **💡 Tips Penting & Troubleshooting:**
+    * Pastikan kamu selalu mengunduh file *raw* (mentah) langsung dari platform tanpa mengubah format *header*-nya secara manual.
+    * Jika terjadi *error* saat memproses, periksa kembali apakah file yang kamu masukkan sudah berada di tab platform yang benar.
+    * Gunakan tombol "Clear all cache" di halaman TikTok jika kamu ingin mereset perbandingan data harian.
+    * Jika proses terasa lambat, nyalakan **⏱️ Instrumentasi performa** di sidebar untuk melihat tahap mana yang paling lama.
+    * Setiap tool juga menyediakan unduhan **Parquet** (data bertipe, termasuk kolom hasil hitungan) untuk diolah lanjut di BI/warehouse tanpa membaca ulang Excel.
+    * Export berat (Shopee Ads, TikTok Fixer, Excel Daily Compare) berjalan sebagai **job latar belakang**: kamu bisa tetap memakai halaman lain, dan file hasil tetap bisa di-download setelah pindah tab atau halaman di-refresh ulang oleh Streamlit.
+    """)
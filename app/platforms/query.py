@@ -0,0 +1,149 @@
+# query.py
+# Halaman Query: tanya-jawab atas semua hasil olahan yang tersimpan di data lake lokal (lake.py)
+# dengan DuckDB — template ber-parameter untuk pertanyaan rutin + kotak SQL bebas (hanya SELECT).
+
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+import exporter
+import facts
+import lake
+import perf
+import preview
+
+
+def param_input(template_name: str, name: str, kind: str, default):
+    key = f"query_param_{template_name}_{name}"
+    label = name.replace("_", " ").capitalize()
+    if kind == "date":
+        return st.date_input(label, value=date.today() - timedelta(days=default), key=key)
+    if kind == "int":
+        return int(st.number_input(label, value=int(default), min_value=1, step=1, key=key))
+    return float(st.number_input(label, value=float(default), step=0.5, key=key))
+
+
+def show_result(df, key: str):
+    st.caption(f"{len(df):,} baris")
+    preview.render_preview(df, key=f"{key}_preview", hide_index=True)
+    col_csv, col_pq = st.columns(2)
+    with col_csv:
+        st.download_button("⬇️ Download CSV", data=exporter.csv_bytes(df), key=f"{key}_dl_csv",
+                           **exporter.csv_download_args("hasil_query", False))
+    with col_pq:
+        st.download_button("⬇️ Download Parquet", data=exporter.parquet_bytes(df), file_name="hasil_query.parquet",
+                           mime=exporter.PARQUET_MIME, key=f"{key}_dl_parquet")
+
+
+def run_query(sql: str, params: dict, state_key: str, label: str):
+    tracker = perf.PerfTracker("query_lake")
+    try:
+        with tracker.stage(f"duckdb: {label}") as rec:
+            st.session_state[state_key] = lake.query(sql, params)
+            rec["rows"] = len(st.session_state[state_key])
+    except ImportError:
+        st.error("Paket `duckdb` belum terpasang. Jalankan `pip install duckdb` lalu muat ulang halaman.")
+    except Exception as e:
+        st.session_state.pop(state_key, None)
+        st.error(f"Query gagal: {e}")
+    tracker.render()
+
+
+GROUPINGS = {
+    "Platform": ["platform"],
+    "Platform × tanggal": ["date", "platform"],
+    "Platform × akun": ["platform", "account"],
+    "Campaign": ["platform", "campaign"],
+    "Produk": ["product"],
+}
+
+
+def render_blended(available: set):
+    # ROAS/CTR/CPC gabungan dari tabel fakta (Shopee Ads, Meta, TikTok dalam satu skema)
+    if facts.DATASET not in available:
+        st.info("Tabel fakta lintas platform masih kosong. Proses laporan Shopee Ads, Meta, atau TikTok Fixer dulu.")
+        return
+    col_dari, col_sampai, col_group = st.columns(3)
+    with col_dari: dari = st.date_input("Dari", value=date.today() - timedelta(days=7), key="query_blend_dari")
+    with col_sampai: sampai = st.date_input("Sampai", value=date.today(), key="query_blend_sampai")
+    with col_group: grouping = st.selectbox("Kelompokkan per", list(GROUPINGS), key="query_blend_group")
+    try:
+        fact = lake.query(f"SELECT {', '.join(facts.COLUMNS)} FROM {facts.DATASET} WHERE date BETWEEN $dari AND $sampai",
+                          {"dari": dari, "sampai": sampai})
+    except ImportError:
+        return st.error("Paket `duckdb` belum terpasang.")
+    out = facts.blended(fact, GROUPINGS[grouping])
+    total = facts.blended(fact.assign(platform="SEMUA"))
+    if not total.empty:
+        t = total.iloc[0]
+        for col, (label, fmt, key) in zip(st.columns(4), [("Spend", "Rp {:,.0f}", "spend"), ("Revenue", "Rp {:,.0f}", "revenue"),
+                                                         ("ROAS gabungan", "{:.2f}", "roas"), ("CTR", "{:.2%}", "ctr")]):
+            col.metric(label, fmt.format(t[key]) if pd.notna(t[key]) else "-")
+    show_result(out, "query_blend")
+
+
+def render():
+    st.title("🔎 Query Data Historis")
+    st.markdown(
+        "Semua hasil olahan (Shopee Ads, Shopee Out, Analitik Produk, Meta KPI, TikTok Fixer, TikTok Daily) "
+        "otomatis disimpan ke **data lake lokal** (Parquet). Di sini kamu bisa menjawab pertanyaan lintas bulan "
+        "dan lintas platform tanpa membuka ulang file Excel satu per satu."
+    )
+
+    catalog = lake.catalog()
+    if catalog.empty:
+        st.info("Lake masih kosong. Proses file di halaman Shopee/Meta/TikTok terlebih dahulu.")
+        return
+    st.dataframe(catalog, use_container_width=True, hide_index=True)
+    available = set(catalog["dataset"])
+
+    tab_lintas, tab_template, tab_sql, tab_kelola = st.tabs(["🌐 Lintas Platform", "📋 Template", "🧮 SQL", "🗄️ Kelola Lake"])
+
+    with tab_lintas:
+        render_blended(available)
+
+    with tab_template:
+        name = st.selectbox("Pertanyaan", list(lake.TEMPLATES), key="query_template")
+        template = lake.TEMPLATES[name]
+        st.caption(template["help"])
+        missing = [d for d in template["datasets"] if d not in available]
+        cols = st.columns(len(template["params"]))
+        params = {}
+        for col, (pname, (kind, default)) in zip(cols, template["params"].items()):
+            with col:
+                params[pname] = param_input(name, pname, kind, default)
+        with st.expander("Lihat SQL"):
+            st.code(template["sql"].strip(), language="sql")
+        if missing:
+            st.warning(f"Dataset belum ada di lake: {', '.join(missing)}.")
+        elif st.button("▶️ Jalankan", key="query_template_run"):
+            run_query(template["sql"], params, "query_template_result", name)
+        result = st.session_state.get("query_template_result")
+        if result is not None:
+            show_result(result, "query_template")
+
+    with tab_sql:
+        st.markdown("Satu view per dataset: " + ", ".join(f"`{d}`" for d in sorted(available))
+                    + ". Kolom `_tanggal` (tanggal laporan) & `_sumber` (nama file) ada di semua view.")
+        lihat = st.selectbox("Lihat kolom dataset", [""] + sorted(available), key="query_describe")
+        if lihat:
+            try:
+                st.dataframe(lake.columns(lihat), use_container_width=True, hide_index=True)
+            except ImportError:
+                st.error("Paket `duckdb` belum terpasang.")
+        sql = st.text_area("SQL (hanya SELECT)", height=180, key="query_sql",
+                           value="SELECT _tanggal, count(*) AS baris\nFROM shopee_ads\nGROUP BY 1\nORDER BY 1 DESC")
+        if st.button("▶️ Jalankan SQL", key="query_sql_run"):
+            run_query(sql, {}, "query_sql_result", "SQL")
+        result = st.session_state.get("query_sql_result")
+        if result is not None:
+            show_result(result, "query_sql")
+
+    with tab_kelola:
+        dataset = st.selectbox("Dataset", sorted(available), key="query_manage_dataset")
+        tanggal = st.selectbox("Hapus tanggal", [""] + lake.dates(dataset), key="query_manage_date",
+                               format_func=lambda t: "(tanpa tanggal)" if t == lake.UNDATED else t)
+        if tanggal and st.button("🗑️ Hapus", key="query_manage_delete"):
+            lake.delete_date(dataset, tanggal)
+            st.rerun()
@@ -0,0 +1,1444 @@
+# shopee.py
+# Halaman Shopee & CPAS: Shopee Out Platform, Analitik Produk, Shopee Ads, UTM Link Cleaner.
+# Di-import saat halaman Shopee pertama kali dibuka (lihat platforms/__init__.py).
+
+import functools
+import io
+import re
+from io import BytesIO
+from datetime import date
+from typing import Optional
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+
+import analitik_diff
+import dtype_plan
+import excel_reader
+import exporter
+import facts
+import jobs
+import lake
+import parallel
+import perf
+import preview
+import shopee_history
+import upload_cache
+import xlstyle
+import xlsx_swap
+
+
+SHOPEE_CSS = """
+<style>
+    /* Scoped Shopee style (applied only when this page renders) */
+    html, body, [data-testid="stAppViewContainer"], .stApp { background-color: #ffffff !important; }
+    h1,h2,h3,h4,h5,h6,p,label { color: #EE4C29 !important; }
+    section[data-testid="stSidebar"] > div:first-child { background-color: #EE4C29 !important; }
+    section[data-testid="stSidebar"] * { color: #ffffff !important; }
+    header, div[role="banner"], [data-testid="stToolbar"] { background-color: #EE4C29 !important; color: #ffffff !important; }
+    div[data-testid="stFileUploader"], div[data-testid="stDropzone"], .stFileUploader { background-color: #EE4C29 !important; color: #ffffff !important; border: 1px solid #EE4C29 !important; box-shadow: none !important; }
+    div[data-testid="stFileUploader"] button, .stFileUploader .stButton>button { background-color: #ffffff !important; color: #EE4C29 !important; border: 1px solid #ffffff !important; }
+    table.dataframe thead th, .stDataFrame thead th, .ag-theme-alpine .ag-header { background-color: #EE4C29 !important; color: #ffffff !important; }
+    a, .stMarkdown a { color: #EE4C29 !important; }
+    section[data-testid="stSidebar"] svg { fill: #ffffff !important; stroke: #ffffff !important; }
+
+    /* Tambahan sedikit untuk menata gaya Tabs agar warnanya sesuai dengan CSS kamu */
+    div[data-testid="stTabs"] button { color: #EE4C29 !important; font-weight: bold; }
+    div[data-testid="stTabs"] button[aria-selected="true"] { border-bottom-color: #EE4C29 !important; }
+</style>
+"""
+
+
+# ==========================================
+# HELPER FUNCTIONS
+# ==========================================
+def read_uploaded_bytes(uploaded_file) -> Optional[bytes]:
+    if uploaded_file is None:
+        return None
+    try:
+        uploaded_file.seek(0)
+    except Exception:
+        pass
+    return uploaded_file.read()
+
+
+def to_excel_bytes_from_sheets(sheets: dict) -> bytes:
+    output = exporter.spooled_file()
+    styles = xlstyle.OpenpyxlStyles()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            if "Ringkasan" not in sheet_name:
+                exporter.autofit(writer.sheets[sheet_name], df)
+
+            if "Ringkasan" in sheet_name:
+                try:
+                    ws = writer.sheets[sheet_name]
+                    exporter.apply_column_widths(ws, [40] * len(df.columns))
+                    styles.apply_range(ws, "wrap", max_row=len(df) + 1, max_col=len(df.columns))
+                except Exception:
+                    pass
+
+    return exporter.read_bytes(output)
+
+
+def swap_dot_comma_df(df: pd.DataFrame) -> pd.DataFrame:
+    def swap_cell(x):
+        if isinstance(x, str):
+            return x.replace('.', 'DOT').replace(',', '.').replace('DOT', ',')
+        return x
+    # Kolom dijadikan category dulu, jadi swap cukup dilakukan sekali per nilai unik
+    out = {}
+    for i, col in enumerate(df.columns):
+        cat = df.iloc[:, i].astype("category")
+        new_cats = [swap_cell(c) for c in cat.cat.categories]
+        if len(set(new_cats)) == len(new_cats):
+            out[i] = cat.cat.rename_categories(new_cats)
+        else:
+            out[i] = cat.map(swap_cell)
+    result = pd.DataFrame(out, index=df.index)
+    result.columns = df.columns
+    return result
+
+
+# Mode Excel 1 (Converter): "xml" menukar teks langsung di XML workbook (format & sel angka asli tetap, lihat
+# xlsx_swap.py); "pandas" membaca ulang semua sheet sebagai teks lalu menulis workbook baru. File .xls selalu pandas.
+CONVERTER_MODES = {
+    "xml": "Cepat — format asli tetap, angka tetap angka",
+    "pandas": "Baca ulang — semua sel jadi teks",
+}
+
+
+def load_uploaded_csv_bytes(file_bytes: bytes) -> pd.DataFrame:
+    if file_bytes is None:
+        raise ValueError("No file bytes provided")
+    # Hasil parse dibagi lintas sesi & job berdasarkan isi file (upload_cache)
+    return upload_cache.frame("shopee_ads_csv", file_bytes, lambda: _parse_ads_csv(file_bytes))
+
+
+def _parse_ads_csv(file_bytes: bytes) -> pd.DataFrame:
+    raw = file_bytes.decode("utf-8", errors="ignore")
+    lines = raw.splitlines()
+
+    HEADER_KEYS = ["Nama Iklan", "Nama Iklan/Produk"]
+    header_idx = None
+    for i, line in enumerate(lines[:30]):
+        if any(k in line for k in HEADER_KEYS):
+            header_idx = i
+            break
+    if header_idx is None:
+        raise ValueError("Header Nama Iklan tidak ditemukan")
+
+    delimiter = ";" if lines[header_idx].count(";") > lines[header_idx].count(",") else ","
+    clean_csv = "\n".join(lines[header_idx:])
+    df = pd.read_csv(io.StringIO(clean_csv), sep=delimiter, engine="python", on_bad_lines="skip")
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def normalize_nama_iklan_column(df: pd.DataFrame) -> pd.DataFrame:
+    for col in ["Nama Iklan", "Nama Iklan/Produk"]:
+        if col in df.columns:
+            return df.rename(columns={col: "Nama Iklan"})
+    raise ValueError("Kolom Nama Iklan tidak ditemukan")
+
+
+_FEATURE_BLACKLIST = {"gamis", "busui","friendly","bahan","soft","ultimate","ultimates","motif","size","ukuran","promo","diskon","broad","testing","rayon","katun","cotton","silk","sustra","viscose","linen","polyester","jersey","crepe","chiffon","woolpeach","baloteli","babyterry","pink","hitam","black","putih","white","navy","biru","blue","merah","red","hijau","green","coklat","brown","abu","abu-abu","grey","gray","cream","krem","beige","maroon","ungu","purple","tosca","olive","sage", "sale", "couple"}
+_STORE_BLACKLIST = {"official","shop","store","boutique","fashion","my","zahir","myzahir","by","original","premium"}
+_CONTEXT_BLACKLIST = {"terbaru","new","update","launch","launching","viral","hits","best","seller","bestseller","kondangan","ramadhan","ramadan","harian","pesta","formal","casual","trend","trending","populer","2024","2025","2026","2027", "2028", "2029", "2030"}
+SHORT_NAME_BLACKLIST = _FEATURE_BLACKLIST | _STORE_BLACKLIST | _CONTEXT_BLACKLIST
+SHORT_NAME_PRODUCT_KEYWORDS = {"dress", "set", "reject", "lebaran", "tunik", "abaya", "blouse", "khimar", "rok", "pashmina", "hijab", "outer"}
+
+
+def short_nama_iklan(nama, max_words=2):
+    if pd.isna(nama): return nama
+    text = str(nama).strip()
+    if text.lower().startswith("grup"): return text.split(" - ")[0]
+    text = re.sub(r"\[.*?\]", "", text).strip()
+
+    parts = re.split(r"\s*[-|,/]\s*", text)
+    candidates = []
+    for part in parts:
+        words = part.split()
+        valid_words = []
+        for w in words:
+            wl_clean = re.sub(r'[^a-z0-9]', '', w.lower())
+            if wl_clean in SHORT_NAME_BLACKLIST or not wl_clean: continue
+            valid_words.append(w)
+        if valid_words: candidates.append(valid_words)
+
+    best_candidate = []
+    for cand in candidates:
+        if len(cand) >= 2 and any(re.sub(r'[^a-z0-9]', '', w.lower()) in SHORT_NAME_PRODUCT_KEYWORDS for w in cand):
+            best_candidate = cand
+
+    if not best_candidate:
+        for cand in candidates:
+            if any(re.sub(r'[^a-z0-9]', '', w.lower()) in SHORT_NAME_PRODUCT_KEYWORDS for w in cand):
+                best_candidate = cand
+                break
+    if not best_candidate:
+        for cand in candidates:
+            if len(cand) >= 2:
+                best_candidate = cand
+                break
+    if not best_candidate and candidates: best_candidate = candidates[0]
+    if not best_candidate: best_candidate = text.split()
+
+    if len(best_candidate) > max_words:
+        kw_idx = -1
+        for i, w in enumerate(best_candidate):
+            if re.sub(r'[^a-z0-9]', '', w.lower()) in SHORT_NAME_PRODUCT_KEYWORDS:
+                kw_idx = i
+                break
+        if kw_idx != -1:
+            start_idx = max(0, kw_idx - max_words + 1)
+            if start_idx + max_words > len(best_candidate):
+                start_idx = max(0, len(best_candidate) - max_words)
+            best_candidate = best_candidate[start_idx : start_idx + max_words]
+        else:
+            best_candidate = best_candidate[:max_words]
+
+    return " ".join(best_candidate).title()
+
+
+def highlight_row(row):
+    styles = [''] * len(row)
+    roas = row.get('Efektifitas Iklan')
+    sales = row.get('Produk Terjual')
+    gmv = row.get('Penjualan Langsung (GMV Langsung)')
+    cost = row.get('Biaya')
+
+    if pd.isna(sales) or pd.isna(cost): return styles
+    if (cost == 0) and (sales > 0): return ['color: #006400'] * len(row)
+    if sales == 0 and cost >= 10000: return ['color: #FF0000'] * len(row)
+    if sales == 0 and cost < 10000: return styles
+
+    if pd.notna(roas):
+        try:
+            if roas < 8: styles = ['background-color: red'] * len(row)
+            elif roas < 10: styles = ['background-color: yellow'] * len(row)
+            else: styles = ['background-color: lightgreen'] * len(row)
+        except Exception: pass
+
+    try: nama_idx = row.index.get_loc('Nama Iklan')
+    except Exception: nama_idx = None
+    try: gmv_idx = row.index.get_loc('Penjualan Langsung (GMV Langsung)')
+    except Exception: gmv_idx = None
+
+    if sales > 0 and (pd.isna(gmv) or gmv == 0):
+        if nama_idx is not None: styles[nama_idx] = 'background-color: lightblue'
+        if gmv_idx is not None: styles[gmv_idx] = 'background-color: lightblue'
+    return styles
+
+
+def get_iklan_color(row, csv_mode):
+    roas = row.get('Efektifitas Iklan')
+    sales = row.get('Produk Terjual')
+    cost = row.get('Biaya')
+
+    if pd.isna(sales) or pd.isna(cost): return None
+    if (cost == 0) and (sales > 0): return None
+    if sales == 0 and cost >= 10000: return None
+    if sales == 0 and cost < 10000: return None
+
+    if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
+        if pd.isna(roas): return "HIJAU" if sales > 0 else None
+
+    if pd.isna(roas) or roas < 8: return "MERAH"
+    elif roas < 10: return "KUNING"
+    else: return "HIJAU"
+
+
+RINGKASAN_PLATFORMS = ["Sales", "Traffic", "Instagram"]
+COL_TOKO = "Toko"
+FILTER_REQUIRED_COLS = ["Channel", "Produk", "Produk.1", "Produk Ditambahkan ke Keranjang"]
+
+
+def classify_channel(channel: pd.Series) -> pd.Series:
+    # Vektor: klasifikasi dihitung sekali per nilai unik Channel lalu disebar ke semua baris
+    codes, uniques = pd.factorize(channel.astype(str).str.lower(), use_na_sentinel=False)
+    u = pd.Series(uniques, dtype=object).astype(str)
+    labels = np.select(
+        [u.str.contains("sales", regex=False), u.str.contains("traffic", regex=False),
+         u.str.contains("ig", regex=False) | u.str.contains("instagram", regex=False)],
+        RINGKASAN_PLATFORMS, default="Sales",
+    )
+    return pd.Series(pd.Categorical(labels[codes], categories=RINGKASAN_PLATFORMS), index=channel.index)
+
+
+def _ringkasan_join(df_source: pd.DataFrame, by: list) -> pd.DataFrame:
+    # Inti ringkasan tanpa iterrows: nama pendek dihitung sekali per produk unik, channel diklasifikasi
+    # lewat mask, lalu nama unik digabung per (by..., Platform) dengan urutan kemunculan pertama.
+    short = {p: short_nama_iklan(p, max_words=2) for p in pd.unique(df_source["Produk"])}
+    work = pd.DataFrame({
+        **{c: df_source[c].astype(str) for c in by},
+        "Platform": classify_channel(df_source["Channel"]).astype(str),
+        "Nama": df_source["Produk"].map(short).astype(str),
+    }).drop_duplicates()
+    joined = work.groupby(by + ["Platform"], sort=False)["Nama"].agg(lambda s: " ".join(f"{n}," for n in s))
+    if not by:
+        return pd.DataFrame([joined.reindex(RINGKASAN_PLATFORMS).fillna("").to_dict()])
+    return joined.unstack("Platform").reindex(columns=RINGKASAN_PLATFORMS).fillna("").rename_axis(columns=None).reset_index()
+
+
+def generate_ringkasan(df_source):
+    # 1 baris: kolom Sales/Traffic/Instagram berisi nama pendek produk unik ("A, B,")
+    if df_source.empty:
+        return pd.DataFrame([dict.fromkeys(RINGKASAN_PLATFORMS, "")])
+    return _ringkasan_join(df_source, [])
+
+
+def ringkasan_per_toko(df_source: pd.DataFrame, by: str = COL_TOKO) -> pd.DataFrame:
+    # Sama seperti generate_ringkasan, tapi 1 baris per toko
+    if df_source.empty:
+        return pd.DataFrame(columns=[by] + RINGKASAN_PLATFORMS)
+    return _ringkasan_join(df_source, [by])
+
+
+def filter_terjual_atc(df_sorted: pd.DataFrame, keys: list):
+    # Produk terjual (Produk.1 > 0) & masuk keranjang, unik per kolom `keys`. Mengembalikan (terjual, atc, kolom_hilang).
+    missing = [c for c in FILTER_REQUIRED_COLS if c not in df_sorted.columns]
+    if missing:
+        return pd.DataFrame(), pd.DataFrame(), missing
+    terjual = pd.to_numeric(df_sorted["Produk.1"], errors="coerce").fillna(0) > 0
+    atc = pd.to_numeric(df_sorted["Produk Ditambahkan ke Keranjang"], errors="coerce").fillna(0) > 0
+    df_terjual = df_sorted.loc[terjual, keys].drop_duplicates().sort_values(by=keys).reset_index(drop=True)
+    df_atc = df_sorted.loc[atc, keys].drop_duplicates().sort_values(by=keys).reset_index(drop=True)
+    return df_terjual, df_atc, []
+
+
+def read_performa_produk(file_name: str, data: bytes) -> dict:
+    # Dijalankan di process pool (mode banyak toko): baca sheet "Performa Produk" dari 1 workbook
+    try:
+        def parse():
+            xls = excel_reader.excel_file(data)
+            sheet = "Performa Produk" if "Performa Produk" in xls.sheet_names else xls.sheet_names[0]
+            return pd.read_excel(xls, sheet_name=sheet), {"sheet": sheet}
+
+        df, meta = upload_cache.frame_with_meta("shopee_performa", data, parse)
+        # signature = kunci lake yang sama dengan mode 1 toko, jadi file yang sama tidak tersimpan dua kali
+        return {"file_name": file_name, "sheet": meta["sheet"], "df": df,
+                "signature": upload_cache.content_key("shopee_performa", data)}
+    except Exception as e:
+        return {"file_name": file_name, "error": str(e)}
+
+
+def combine_performa_produk(results: list) -> pd.DataFrame:
+    # Gabungkan Performa Produk semua toko dengan kolom Toko (dari nama file), urut Toko > Channel > Kode Produk.
+    # Nama toko final (dengan akhiran " (2)" bila nama file kembar) dicatat di r["toko"].
+    frames, seen = [], {}
+    for r in results:
+        if r.get("error"):
+            continue
+        toko = r["file_name"].rsplit(".", 1)[0]
+        seen[toko] = seen.get(toko, 0) + 1
+        if seen[toko] > 1: toko = f"{toko} ({seen[toko]})"
+        r["toko"] = toko
+        frames.append(r["df"].assign(**{COL_TOKO: toko}))
+    if not frames:
+        return pd.DataFrame()
+    df_all = pd.concat(frames, ignore_index=True, sort=False)
+    df_all = df_all[[COL_TOKO] + [c for c in df_all.columns if c != COL_TOKO]]
+    sort_cols = [COL_TOKO] + [c for c in ["Channel", "Kode Produk"] if c in df_all.columns]
+    df_all = df_all.sort_values(by=sort_cols, kind="stable").reset_index(drop=True)
+    return dtype_plan.optimize(df_all, categorical=[COL_TOKO])
+
+
+def load_analitik_frame(file_name: str, data: bytes) -> pd.DataFrame:
+    if file_name.lower().endswith((".xlsx", ".xls")): df_raw = excel_reader.read_excel(data, dtype=object)
+    else: df_raw = pd.read_csv(BytesIO(data), dtype=object)
+
+    df_raw = normalize_cols(df_raw)
+    # Angka dibersihkan sekali saat load, lalu dtype dipadatkan (int32/float32/category).
+    # "Nama Variasi" dibiarkan object (tidak dijadikan category) karena diolah sebagai teks.
+    for c in df_raw.columns:
+        if c in ANALITIK_NUMERIC_COLS:
+            df_raw[c] = clean_idr_numbers(df_raw[c])
+    return dtype_plan.optimize(df_raw, exclude=["Nama Variasi"])
+
+
+def normalize_cols(df):
+    return df.rename(columns=lambda c: re.sub(r"\s+", " ", str(c).strip()))
+
+
+ANALITIK_NUMERIC_COLS = [
+    "Pengunjung Produk (Kunjungan)", "Halaman Produk Dilihat", "Pengunjung Melihat Tanpa Membeli",
+    "Klik Pencarian", "Suka", "Pengunjung Produk (Menambahkan Produk ke Keranjang)",
+    "Dimasukkan ke Keranjang (Produk)", "Total Pembeli (Pesanan Dibuat)", "Produk (Pesanan Dibuat)",
+    "Total Penjualan (Pesanan Dibuat) (IDR)", "Total Pembeli (Pesanan Siap Dikirim)",
+    "Produk (Pesanan Siap Dikirim)", "Penjualan (Pesanan Siap Dikirim) (IDR)"
+]
+
+ANALITIK_RATE_COLS = {
+    "Tingkat Pengunjung Melihat Tanpa Membeli": ("Pengunjung Melihat Tanpa Membeli", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi Produk Dimasukkan ke Keranjang": ("Pengunjung Produk (Menambahkan Produk ke Keranjang)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan yang Dibuat)": ("Total Pembeli (Pesanan Dibuat)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan Siap Dikirim)": ("Total Pembeli (Pesanan Siap Dikirim)", "Pengunjung Produk (Kunjungan)"),
+    "Tingkat Konversi (Pesanan Siap Dikirim dibagi Pesanan Dibuat)": ("Total Pembeli (Pesanan Siap Dikirim)", "Total Pembeli (Pesanan Dibuat)")
+}
+
+
+def drop_kode_variasi_cols(df):
+    cols_to_drop = [c for c in df.columns if c.strip().lower() == "kode variasi"]
+    return df.drop(columns=cols_to_drop, errors="ignore")
+
+
+def variation_base(names: pd.Series) -> pd.Series:
+    # "Warna Merah,XL" -> "Warna Merah" (bagian setelah koma terakhir dibuang); kosong / "-" / NaN -> "" (baris total)
+    s = names.where(names.notna(), "").astype(str).str.strip()
+    base = s.str.replace(r",[^,]*$", "", regex=True).str.strip()
+    return base.mask(s == "-", "")
+
+
+def clean_idr_numbers(values: pd.Series) -> pd.Series:
+    # Teks angka format Indonesia -> angka: "1.234.567" -> 1234567, "12,5%" -> 12.5, "" / "-" -> 0.
+    # Titik selalu pemisah ribuan dan koma desimal, jadi cukup: buang "%" & ".", lalu "," -> ".".
+    # Nilai yang sudah angka dibiarkan; yang tidak bisa dibaca menjadi NaN.
+    # Kolom object dari .xlsx (dtype=object) berisi int/float Python, bahkan seluruhnya angka, jadi hanya sel teks
+    # yang lewat aksesor .str; sisanya langsung pd.to_numeric.
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    is_str = values.map(type).eq(str)
+    num = pd.to_numeric(values.mask(is_str), errors="coerce")
+    if not is_str.any():
+        return num
+    text = values[is_str].astype(str).str.strip()
+    cleaned = (text.mask(text.isin(["", "-"]), "0")
+               .str.replace("%", "", regex=False).str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    return num.mask(is_str, pd.to_numeric(cleaned, errors="coerce"))
+
+
+def safe_div(a, b):
+    try:
+        a, b = float(a), float(b)
+        return 0.0 if b == 0 else a / b
+    except Exception: return 0.0
+
+
+def format_percentage(val):
+    return f"{val * 100:.2f}%".replace('.', ',')
+
+
+def to_excel_bytes_with_styling(df, product_merge_col="Kode Produk", highlight_condition=None,
+                                percent_cols=(), delta_cols=()):
+    # highlight_condition: mask boolean per baris total produk (mis. Tipe Baris == "Total") atau fungsi per baris.
+    # percent_cols: kolom rasio numerik (format persen); delta_cols: kolom selisih (hijau > 0, merah < 0).
+    # Ditulis satu lintasan dengan workbook write-only: tiap baris langsung distream ke file beserta style-nya,
+    # tanpa tulis pandas -> load_workbook -> style sel -> simpan ulang (yang memuat semua sel ke memori dua kali).
+    # Sel tanpa style tetap nilai biasa; hanya sel berwarna/berformat yang dibuat sebagai WriteOnlyCell.
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    styles = xlstyle.OpenpyxlStyles()
+    header = [str(c) for c in df.columns]
+    n_rows, n_cols = len(df), len(header)
+    last = n_cols - 1
+
+    # Lebar kolom harus di-set sebelum baris pertama ditulis; kolom IDR minimal 20
+    widths = exporter.column_widths(df)
+    idr_idx = [i for i, c in enumerate(header) if "IDR" in c.upper()]
+    for i in idr_idx:
+        widths[i] = max(widths[i], 20)
+    exporter.apply_column_widths(ws, widths)
+
+    # Format angka per kolom (hanya untuk sel bernilai angka, seperti sebelumnya)
+    num_style = {i: "rupiah" for i in idr_idx}
+    num_style.update({header.index(c): "persen" for c in percent_cols if c in header})
+
+    # Jenis baris: 0 = variasi, 1 = total produk, 2 = Grand Total
+    kind = np.zeros(n_rows, dtype=np.int8)
+    if highlight_condition is not None:
+        if callable(highlight_condition):
+            is_total = df.apply(highlight_condition, axis=1).to_numpy(dtype=bool) if n_rows else np.zeros(0, dtype=bool)
+        else:
+            is_total = np.asarray(highlight_condition, dtype=bool)
+        kind[is_total] = 1
+        if "Kode Produk" in df.columns:
+            kind[(df["Kode Produk"] == "Total").to_numpy()] = 2
+
+    def row_fill(k, i):
+        if highlight_condition is None:
+            return None
+        if k == 2:
+            return "grand_total"
+        if i == last:
+            return "dropdown_total" if k == 1 else "dropdown_variasi"
+        return "total_produk" if k == 1 else None
+
+    # Merge sel Kode Produk per blok baris berurutan yang sama (berhenti di baris Grand Total),
+    # batas blok dicari dari kolom DataFrame; sel di bawah sel pertama blok ditulis kosong
+    covered = np.zeros(n_rows, dtype=bool)
+    if product_merge_col in header and n_rows:
+        prod_idx = header.index(product_merge_col)
+        kode = df[product_merge_col].to_numpy(dtype=object)
+        stop = np.flatnonzero(kode == "Total")
+        stop = stop[0] if len(stop) else n_rows
+        starts = np.flatnonzero(np.r_[True, kode[1:stop] != kode[:stop - 1]]) if stop else np.array([], dtype=int)
+        ends = np.r_[starts[1:], stop] - 1
+        letter = get_column_letter(prod_idx + 1)
+        for start, end in zip(starts, ends):
+            if start < end and not pd.isna(kode[start]):
+                ws.merged_cells.add(f"{letter}{start + 2}:{letter}{end + 2}")
+                covered[start + 1:end + 1] = True
+    else:
+        prod_idx = None
+
+    if n_rows > 1:
+        dv = DataValidation(type="list", formula1='"Total,~"', allow_blank=True)
+        dv.add(f"{get_column_letter(n_cols)}2:{get_column_letter(n_cols)}{n_rows}")
+        ws.data_validations.append(dv)
+
+    if n_rows and delta_cols:
+        from openpyxl.formatting.rule import CellIsRule
+        naik, turun = xlstyle.pattern_fill(xlstyle.STYLES["naik"]["bg"]), xlstyle.pattern_fill(xlstyle.STYLES["turun"]["bg"])
+        for col_name in delta_cols:
+            if col_name not in header: continue
+            col_letter = get_column_letter(header.index(col_name) + 1)
+            cf_range = f"{col_letter}2:{col_letter}{n_rows + 1}"
+            ws.conditional_formatting.add(cf_range, CellIsRule(operator="greaterThan", formula=["0"], fill=naik))
+            ws.conditional_formatting.add(cf_range, CellIsRule(operator="lessThan", formula=["0"], fill=turun))
+
+    ws.append(header)
+    values = df.astype(object)
+    values = values.where(values.notna(), None).to_numpy()
+    styled_cols = {k: [i for i in range(n_cols) if row_fill(k, i) or i in num_style] for k in range(3)}
+    for r in range(n_rows):
+        row = list(values[r])
+        k = kind[r]
+        if covered[r]:
+            row[prod_idx] = None
+        for i in styled_cols[k]:
+            v = row[i]
+            num = num_style.get(i) if isinstance(v, (int, float)) else None
+            fill = row_fill(k, i)
+            if num is None and fill is None:
+                continue
+            cell = WriteOnlyCell(ws, v)
+            styles.apply(cell, *(n for n in (fill, num) if n))
+            row[i] = cell
+        ws.append(row)
+
+    return exporter.read_bytes(exporter.excel_file(wb.save))
+
+
+def is_total_variation(names: pd.Series) -> np.ndarray:
+    # Nama Variasi "-" atau kosong = baris total produk
+    return names.astype(str).str.strip().isin(["-", ""]).to_numpy()
+
+
+def rate_values(num: pd.Series, den: pd.Series) -> np.ndarray:
+    # Rasio numerik num / den per baris; penyebut 0 atau nilai kosong/tidak terbaca -> 0 (seperti safe_div)
+    num = pd.to_numeric(num, errors="coerce").fillna(0).to_numpy(dtype="float64")
+    den = pd.to_numeric(den, errors="coerce").fillna(0).to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den != 0, num / den, 0.0)
+
+
+def process_analitik(df_raw: pd.DataFrame) -> pd.DataFrame:
+    # Satu export Analitik Produk -> baris total per produk + variasi (urut penjualan) + Grand Total.
+    # Pemanggil memastikan kolom "Kode Produk" dan "Nama Variasi" ada.
+    df = df_raw.copy()
+    df = drop_kode_variasi_cols(df)
+
+    numeric_cols_guess = ANALITIK_NUMERIC_COLS
+    rate_cols_config = ANALITIK_RATE_COLS
+
+    df["__NamaVariasiRaw"] = df["Nama Variasi"].astype(object)
+    df["NamaVariasiBase"] = variation_base(df["Nama Variasi"])
+    df["__is_total_row"] = (df["NamaVariasiBase"] == "").to_numpy()
+
+    product_order = []
+    seen = set()
+    for i, r in df.iterrows():
+        kp = r.get("Kode Produk")
+        if kp not in seen:
+            seen.add(kp)
+            product_order.append(kp)
+
+    variation_mask = ~df["__is_total_row"]
+    agg_numeric = {}
+    for c in df.columns:
+        if c in numeric_cols_guess:
+            df[c] = clean_idr_numbers(df[c]).fillna(0)
+            agg_numeric[c] = "sum"
+
+    other_keep = ["SKU Induk", "Produk"] + list(rate_cols_config.keys())
+    agg_other = {c: "first" for c in other_keep if c in df.columns}
+
+    group_cols = ["Kode Produk", "NamaVariasiBase"]
+    if variation_mask.any():
+        grouped = df[variation_mask].groupby(group_cols, dropna=False, as_index=False, observed=True).agg({**agg_numeric, **agg_other})
+        grouped = grouped.rename(columns={"NamaVariasiBase": "Nama Variasi"})
+    else:
+        grouped = pd.DataFrame(columns=["Kode Produk", "Nama Variasi"] + list(agg_numeric.keys()) + list(agg_other.keys()))
+
+    totals = []
+    for kp in product_order:
+        totals_rows = df[(df["Kode Produk"] == kp) & (df["__is_total_row"])]
+        if not totals_rows.empty:
+            tot = {"Kode Produk": kp}
+            for c in df.columns:
+                if c in other_keep: tot[c] = totals_rows.iloc[0].get(c)
+            for c in agg_numeric.keys():
+                tot[c] = totals_rows[c].astype(float).sum()
+            tot["Nama Variasi"] = ""
+            totals.append(pd.Series(tot))
+        else:
+            gi = grouped[grouped["Kode Produk"] == kp]
+            if not gi.empty:
+                tot = {"Kode Produk": kp, "Nama Variasi": ""}
+                for c in agg_numeric.keys(): tot[c] = gi[c].sum()
+                for c in other_keep:
+                    any_row = df[df["Kode Produk"] == kp]
+                    if not any_row.empty: tot[c] = any_row.iloc[0].get(c)
+                totals.append(pd.Series(tot))
+            else:
+                any_row = df[df["Kode Produk"] == kp]
+                if not any_row.empty:
+                    row0 = any_row.iloc[0].copy()
+                    row0["Nama Variasi"] = ""
+                    totals.append(row0)
+
+    totals_df = pd.DataFrame(totals).reset_index(drop=True)
+    sort_col_induk = "Penjualan (Pesanan Siap Dikirim) (IDR)"
+    if sort_col_induk in totals_df.columns:
+        totals_df[sort_col_induk] = pd.to_numeric(totals_df[sort_col_induk], errors="coerce").fillna(0)
+        totals_df = totals_df.sort_values(by=sort_col_induk, ascending=False)
+
+    product_order = totals_df["Kode Produk"].tolist()
+    final_rows = []
+    for kp in product_order:
+        tot_row = totals_df[totals_df["Kode Produk"] == kp]
+        if not tot_row.empty:
+            tot_row = tot_row.iloc[0].to_dict()
+            final_rows.append(tot_row)
+
+        var_rows = grouped[grouped["Kode Produk"] == kp].copy()
+        if sort_col_induk in var_rows.columns:
+            var_rows[sort_col_induk] = pd.to_numeric(var_rows[sort_col_induk], errors="coerce").fillna(0)
+            var_rows = var_rows.sort_values(by=sort_col_induk, ascending=False)
+
+        for _, vr in var_rows.iterrows():
+            final_rows.append(vr.to_dict())
+
+    df_final = pd.DataFrame(final_rows).fillna("")
+
+    # Rasio disimpan sebagai angka pecahan (0.1234); format persen diberikan saat export Excel / preview
+    for rate_col, (num_col, den_col) in rate_cols_config.items():
+        if num_col in df_final.columns and den_col in df_final.columns:
+            df_final[rate_col] = rate_values(df_final[num_col], df_final[den_col])
+
+    df_final["Nama Variasi"] = df_final["Nama Variasi"].replace({"": "-"})
+
+    final_cols = []
+    for c in df.columns:
+        if c == "Nama Variasi": continue 
+        if c in df_final.columns:
+            final_cols.append(c)
+            if c == "Produk": final_cols.append("Nama Variasi")
+
+    if "Nama Variasi" not in final_cols:
+        if "Kode Produk" in final_cols:
+            idx = final_cols.index("Kode Produk") + 1
+            final_cols.insert(idx, "Nama Variasi")
+        else:
+            final_cols.insert(0, "Nama Variasi")
+
+    for c in df_final.columns:
+        if c not in final_cols and not c.startswith("__"): final_cols.append(c)
+
+    if "Tipe Baris" in final_cols: final_cols.remove("Tipe Baris")
+
+    df_final["Tipe Baris"] = np.where(is_total_variation(df_final["Nama Variasi"]), "Total", "~")
+    final_cols.append("Tipe Baris")
+    df_final = df_final[final_cols]
+
+    total_rows_only = df_final[df_final["Tipe Baris"] == "Total"]
+    grand_total_data = {}
+    for c in final_cols:
+        if c == "Kode Produk": grand_total_data[c] = "Total"
+        elif c in numeric_cols_guess: grand_total_data[c] = pd.to_numeric(total_rows_only[c], errors="coerce").fillna(0).sum()
+        elif c in rate_cols_config: grand_total_data[c] = np.nan
+        else: grand_total_data[c] = "-"
+    # Rasio Grand Total dihitung dari jumlah (bukan jumlah rasio)
+    for rate_col, (num_col, den_col) in rate_cols_config.items():
+        if rate_col in final_cols and num_col in grand_total_data and den_col in grand_total_data:
+            grand_total_data[rate_col] = safe_div(grand_total_data[num_col], grand_total_data[den_col])
+
+    df_final = pd.concat([df_final, pd.DataFrame([grand_total_data])], ignore_index=True)
+    return df_final
+
+
+def analitik_rate_formatters(df):
+    # Rasio disimpan sebagai pecahan; preview menampilkannya sebagai persen ("12,34%")
+    return {c: (lambda v: format_percentage(v) if pd.notna(v) else "-") for c in df.columns
+            if any(c == r or c.startswith(f"{r} [") or c == analitik_diff.rate_change_column(r) for r in ANALITIK_RATE_COLS)}
+
+
+def analitik_preview_css(df):
+    # Warna preview mengikuti export: baris Total kuning, Grand Total hijau
+    css = preview.empty_css(df)
+    if "Tipe Baris" in df.columns:
+        preview.paint(css, df["Tipe Baris"] == "Total", "background-color: #FFFF00")
+    if "Kode Produk" in df.columns:
+        preview.paint(css, df["Kode Produk"] == "Total", "background-color: #D9EAD3; font-weight: bold")
+    return css
+
+
+def roas_css(df, cols):
+    css = preview.empty_css(df)
+    for c in cols:
+        v = pd.to_numeric(df[c], errors="coerce")
+        preview.paint(css, v < 8, "background-color: #ffc7ce", [c])
+        preview.paint(css, (v >= 8) & (v < 10), "background-color: #fff2a8", [c])
+        preview.paint(css, v >= 10, "background-color: #c6efce", [c])
+    return css
+
+
+def shopee_ads_job(ctx, raw_bytes: bytes, file_name: str, csv_mode: str,
+                   include_merah=True, include_kuning=True, include_hijau=True, include_biru=True,
+                   report_date: Optional[date] = None, simpan_histori: bool = False):
+    # Job latar belakang (lihat jobs.py): CSV Shopee Ads -> Excel berwarna + Parquet (+ histori tren)
+    tracker = ctx.tracker
+    ctx.progress(0.05, "Membaca CSV...")
+    with tracker.stage("load csv") as rec:
+        df = load_uploaded_csv_bytes(raw_bytes)
+        df = normalize_nama_iklan_column(df)
+        rec["rows"] = len(df)
+
+    df["IS_AGGREGATE"] = df["Nama Iklan"].astype(str).str.lower().str.match(r'^\s*grup\b')
+
+    for col in ["Efektifitas Iklan", "Produk Terjual", "Penjualan Langsung (GMV Langsung)", "Biaya"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df["IS_HIJAU_TIPE_A"] = (df.get("Biaya").notna() & (df.get("Biaya") == 0) & (df.get("Produk Terjual") > 0))
+    df["IS_BIRU"] = ((df.get("Produk Terjual", 0) > 0) & (df.get("Penjualan Langsung (GMV Langsung)", 0) == 0))
+    ctx.progress(0.2, "Meringkas nama iklan...")
+    with tracker.stage("short_nama_iklan", rows=len(df)):
+        df["Nama Ringkasan"] = df["Nama Iklan"].where(df["IS_AGGREGATE"], df["Nama Iklan"].apply(short_nama_iklan))
+    ctx.progress(0.35, "Menentukan kategori warna...")
+    with tracker.stage("kategori warna", rows=len(df)):
+        df["Kategori"] = df.apply(lambda row: get_iklan_color(row, csv_mode), axis=1)
+
+    ctx.progress(0.5, "Menyusun ringkasan...")
+    with tracker.stage("ringkasan & filter warna", rows=len(df)):
+        if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
+            df_agg = df[df["IS_AGGREGATE"]].copy()
+            df_non_agg = df[~df["IS_AGGREGATE"]].copy()
+            df = pd.concat([df_non_agg, df_agg], ignore_index=True)
+
+            urutan_col = None
+            for c in df.columns:
+                if str(c).strip().lower() in ["urutan", "no", "no."]:
+                    urutan_col = c
+                    break
+
+            if urutan_col:
+                new_vals = list(range(1, len(df_non_agg) + 1)) + [""] * len(df_agg)
+                df[urutan_col] = new_vals
+
+        if csv_mode == "CSV Grup Iklan (hanya iklan produk)":
+            df_nonagg = df[~df["IS_AGGREGATE"]].copy()
+        else:
+            df_nonagg = df.copy()
+
+        df_nonagg = df_nonagg[~df_nonagg["IS_HIJAU_TIPE_A"]].copy()
+
+        ordered_for_numbering = []
+        for _, row in df_nonagg.iterrows():
+            kat = row.get("Kategori")
+            if pd.notna(kat):
+                ordered_for_numbering.append({"nama": row["Nama Ringkasan"], "kategori": kat})
+            if row.get("IS_BIRU", False):
+                ordered_for_numbering.append({"nama": row["Nama Ringkasan"], "kategori": "BIRU"})
+
+        per_col = {"MERAH": [], "KUNING": [], "HIJAU": [], "BIRU": []}
+        if csv_mode != "CSV Keseluruhan (Normal)":
+            for kat in ["MERAH", "KUNING", "HIJAU"]:
+                names = df_nonagg[df_nonagg["Kategori"] == kat]["Nama Ringkasan"].tolist()
+                names = list(dict.fromkeys(names)) 
+                per_col[kat] = [f"{n}," for n in names]
+
+            names_biru = df_nonagg[df_nonagg["IS_BIRU"]]["Nama Ringkasan"].tolist()
+            names_biru = list(dict.fromkeys(names_biru))
+            per_col["BIRU"] = [f"{n}," for n in names_biru]
+
+        tanpa_konversi_df = (
+            df_nonagg[(df_nonagg.get("Produk Terjual", 0) == 0) & (df_nonagg.get("Biaya", 0) >= 10000)]
+            [["Nama Ringkasan", "Biaya"]]
+            .rename(columns={"Nama Ringkasan": "Nama Iklan"})
+            .sort_values("Biaya", ascending=False)
+        )
+
+        hijau_cols = ["Nama Ringkasan", "Produk Terjual", "Efektifitas Iklan", "Biaya"]
+        available_cols = [c for c in hijau_cols if c in df.columns]
+        hijau_tipe_a_df = df[(df.get("Biaya").notna()) & (df.get("Biaya") == 0) & (df.get("Produk Terjual", 0) > 0)][available_cols].copy()
+        if "Nama Ringkasan" in hijau_tipe_a_df.columns:
+            hijau_tipe_a_df = hijau_tipe_a_df.rename(columns={"Nama Ringkasan": "Nama Iklan"})
+
+        filtered_per_col = {"MERAH": [], "KUNING": [], "HIJAU": [], "BIRU": []}
+        if include_merah: filtered_per_col["MERAH"] = per_col["MERAH"]
+        if include_kuning: filtered_per_col["KUNING"] = per_col["KUNING"]
+        if include_hijau: filtered_per_col["HIJAU"] = per_col["HIJAU"]
+        if include_biru: filtered_per_col["BIRU"] = per_col["BIRU"]
+
+    # EXPORT
+    buffer = exporter.spooled_file()
+    base_name = file_name.rsplit(".", 1)[0]
+    filename = f"{base_name}_colored.xlsx"
+
+    ctx.progress(0.6, "Menulis Excel...")
+    with tracker.stage("export xlsx (Styler + openpyxl)", rows=len(df)):
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            try:
+                styled = df.style.apply(highlight_row, axis=1)
+                styled.to_excel(writer, sheet_name="DATA_IKLAN", index=False)
+            except Exception:
+                df.to_excel(writer, sheet_name="DATA_IKLAN", index=False)
+            exporter.autofit(writer.sheets["DATA_IKLAN"], df)
+
+            wb = writer.book
+            styles = xlstyle.OpenpyxlStyles()
+            if "RINGKASAN_IKLAN" in wb.sheetnames:
+                wb.remove(wb["RINGKASAN_IKLAN"])
+            ws_ring = wb.create_sheet("RINGKASAN_IKLAN")
+
+            if csv_mode == "CSV Keseluruhan (Normal)":
+                styles.apply(ws_ring.cell(row=1, column=1, value="DAFTAR IKLAN (URUT)"), "tebal")
+
+                semua_nama = []
+                for item in ordered_for_numbering:
+                    kat = item["kategori"]
+                    if (kat == "MERAH" and include_merah) or \
+                       (kat == "KUNING" and include_kuning) or \
+                       (kat == "HIJAU" and include_hijau) or \
+                       (kat == "BIRU" and include_biru):
+                        semua_nama.append(item["nama"])
+
+                semua_nama = list(dict.fromkeys(semua_nama))
+
+                if semua_nama:
+                    text_gabungan = "\n".join([f"{i+1}. {nama}" for i, nama in enumerate(semua_nama)])
+                    styles.apply(ws_ring.cell(row=2, column=1, value=text_gabungan), "wrap", xlstyle.font("000000"))
+
+                ws_ring.column_dimensions["A"].width = 60
+
+            else:
+                headers = ["MERAH", "KUNING", "HIJAU", "BIRU"]
+                color_map = {"MERAH": "FF0000", "KUNING": "000000", "HIJAU": "00AA00", "BIRU": "0066CC"}
+
+                for c_idx, h in enumerate(headers, start=1):
+                    styles.apply(ws_ring.cell(row=1, column=c_idx, value=h), "tebal")
+
+                for c_idx, key in enumerate(headers, start=1):
+                    items = filtered_per_col.get(key, [])
+                    if items:
+                        joined = " ".join(items)
+                        if not joined.strip().endswith(","): joined = joined + ","
+                        styles.apply(ws_ring.cell(row=2, column=c_idx, value=joined), "wrap", xlstyle.font(color_map[key]))
+                    else:
+                        ws_ring.cell(row=2, column=c_idx, value="")
+
+                for i in range(1, 5):
+                    col_letter = get_column_letter(i)
+                    ws_ring.column_dimensions[col_letter].width = 40
+
+            tanpa_konversi_df.to_excel(writer, sheet_name=">10K_TANPA_KONVERSI", index=False)
+            ws_tc = writer.book[">10K_TANPA_KONVERSI"]
+            exporter.autofit(ws_tc, tanpa_konversi_df)
+            styles.apply_range(ws_tc, "font_merah")
+
+            hijau_tipe_a_df.to_excel(writer, sheet_name="SALES_0_BIAYA", index=False)
+            ws_hi = writer.book["SALES_0_BIAYA"]
+            exporter.autofit(ws_hi, hijau_tipe_a_df)
+            styles.apply_range(ws_hi, "font_hijau")
+
+
+    ctx.add_file(filename, buffer, exporter.XLSX_MIME, "⬇️ Download Excel Laporan")
+    ctx.progress(0.9, "Menulis Parquet...")
+    with tracker.stage("export parquet", rows=len(df)):
+        ctx.add_file(f"{base_name}_colored.parquet", exporter.parquet_bytes(df), exporter.PARQUET_MIME,
+                     "⬇️ Download Parquet (DATA_IKLAN + Kategori)")
+    ctx.note("Excel laporan siap di-download 👇", "success")
+
+    if simpan_histori and report_date:
+        ctx.progress(0.95, "Menyimpan histori...")
+        # Job lain bisa menulis histori bersamaan di worker lain; save_daily menguncinya (file lock)
+        with tracker.stage("simpan histori (parquet)", rows=len(df)):
+            n_saved = shopee_history.save_daily(df, report_date, file_name)
+        ctx.note(f"💾 {n_saved} iklan disimpan ke histori untuk tanggal {report_date:%Y-%m-%d}.")
+
+    with tracker.stage("simpan ke lake (parquet)", rows=len(df)):
+        lake.save("shopee_ads", df, report_date, file_name)
+        ads = df[~df["IS_AGGREGATE"]]
+        facts.save(facts.build(
+            ads, "shopee", date=report_date, campaign="Nama Iklan", product="Nama Ringkasan", spend="Biaya",
+            revenue="Penjualan Langsung (GMV Langsung)", orders=facts.pick(ads, facts.ORDER_KEYS) or "Produk Terjual",
+            impressions=facts.pick(ads, facts.IMPRESSION_KEYS), clicks=facts.pick(ads, facts.CLICK_KEYS),
+        ), f"shopee_{file_name}")
+    if report_date is None:
+        ctx.note("ℹ️ Tanggal laporan kosong: iklan tidak dimasukkan ke tabel fakta lintas platform.")
+
+
+def render_out_single(uploaded):
+    data = read_uploaded_bytes(uploaded)
+    base_name = uploaded.name.rsplit(".", 1)[0]
+    tracker = perf.PerfTracker("shopee_out_platform")
+    converter_mode = st.radio("Mode Excel 1 (Converter)", list(CONVERTER_MODES), format_func=CONVERTER_MODES.get,
+                              horizontal=True, key="shopee_out_converter_mode")
+
+    try:
+        # Workbook hanya dibuka jika ada sheet yang belum ada di upload_cache
+        open_xls = functools.cache(lambda: excel_reader.excel_file(data))
+        with tracker.stage("load workbook") as rec:
+            sheet_names = upload_cache.metadata("xlsx_sheets", data, lambda: {"sheets": open_xls().sheet_names})["sheets"]
+            rec["rows"] = len(sheet_names)
+
+        # TAHAP 1
+        if converter_mode == "xml" and xlsx_swap.is_xlsx(data):
+            with tracker.stage("TAHAP 1 convert dot/comma (XML)", rows=len(sheet_names)):
+                excel_bytes_convert = xlsx_swap.swap_dot_comma_xlsx(data)
+        else:
+            with tracker.stage("TAHAP 1 convert dot/comma") as rec:
+                sheets_convert = {}
+                for sheet_name in sheet_names:
+                    df_c = upload_cache.frame(f"shopee_out_str_{sheet_name}", data,
+                                              lambda: pd.read_excel(open_xls(), sheet_name=sheet_name, dtype=str))
+                    df_c = swap_dot_comma_df(df_c)
+                    sheets_convert[sheet_name] = df_c
+                rec["rows"] = sum(len(d) for d in sheets_convert.values())
+            with tracker.stage("TAHAP 1 export xlsx", rows=rec["rows"]):
+                excel_bytes_convert = to_excel_bytes_from_sheets(sheets_convert)
+
+        # TAHAP 2
+        with tracker.stage("TAHAP 2 sort") as rec:
+            target_sheet_sort = "Performa Produk" if "Performa Produk" in sheet_names else sheet_names[0]
+            df_raw_sort = upload_cache.frame(f"shopee_out_{target_sheet_sort}", data,
+                                             lambda: dtype_plan.optimize(pd.read_excel(open_xls(), sheet_name=target_sheet_sort)))
+            req_sort = ["Channel", "Kode Produk"]
+            missing_sort = [c for c in req_sort if c not in df_raw_sort.columns]
+
+            df_sorted = pd.DataFrame()
+            if not missing_sort:
+                df_sorted = df_raw_sort.sort_values(by=["Channel", "Kode Produk"], ascending=[True, True])
+            else:
+                st.warning(f"⚠️ Kolom Sort tidak lengkap {missing_sort} di sheet '{target_sheet_sort}'. Menggunakan data tanpa sort.")
+                df_sorted = df_raw_sort.copy()
+            rec["rows"] = len(df_sorted)
+        with tracker.stage("simpan ke lake (parquet)", rows=len(df_sorted)):
+            lake.save("shopee_performa", df_sorted, None, base_name, derived={COL_TOKO: base_name},
+                      signature=upload_cache.content_key("shopee_performa", data))
+
+        # TAHAP 3
+        with tracker.stage("TAHAP 3 filter & ringkasan", rows=len(df_sorted)):
+            df_terjual, df_atc, missing_filter = filter_terjual_atc(df_sorted, ["Channel", "Produk"])
+            df_ringkasan_terjual = df_ringkasan_atc = pd.DataFrame()
+
+            if not missing_filter:
+                df_ringkasan_terjual = generate_ringkasan(df_terjual)
+                df_ringkasan_atc = generate_ringkasan(df_atc)
+            else:
+                st.warning(f"⚠️ Kolom Filter tidak lengkap {missing_filter}. Tahap Filter dilewati.")
+
+        with tracker.stage("TAHAP 3 export xlsx") as rec:
+            # SUSUN EXCEL 2
+            sheets_sort_filter = {"1_Data_Sorted": df_sorted}
+            if not df_terjual.empty: sheets_sort_filter["2_Produk_Terjual"] = df_terjual
+            if not df_atc.empty: sheets_sort_filter["3_Nama_Produk_ATC"] = df_atc
+            if not df_ringkasan_terjual.empty: sheets_sort_filter["4_Ringkasan_Terjual"] = df_ringkasan_terjual
+            if not df_ringkasan_atc.empty: sheets_sort_filter["5_Ringkasan_ATC"] = df_ringkasan_atc
+
+            excel_bytes_sort_filter = to_excel_bytes_from_sheets(sheets_sort_filter)
+            rec["rows"] = sum(len(d) for d in sheets_sort_filter.values())
+        with tracker.stage("TAHAP 3 export parquet", rows=rec["rows"]):
+            # Sheet yang sama dengan Excel 2, tapi bertipe (1 file .parquet per sheet dalam ZIP)
+            parquet_sort_filter = exporter.parquet_zip_bytes(sheets_sort_filter)
+
+        # UI DOWNLOAD
+        st.success("✅ Seluruh proses selesai! Silakan unduh file hasilnya di bawah ini:")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button(
+                label="⬇️ Download Excel 1 (Dot/Comma)",
+                data=excel_bytes_convert,
+                file_name=f"{base_name}_converted.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        with col2:
+            st.download_button(
+                label="⬇️ Download Excel 2 (Sort & Filter)",
+                data=excel_bytes_sort_filter,
+                file_name=f"{base_name}_filtered.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        with col3:
+            st.download_button(
+                label="⬇️ Download Parquet (Sort & Filter)",
+                data=parquet_sort_filter,
+                file_name=f"{base_name}_filtered_parquet.zip",
+                mime=exporter.ZIP_MIME,
+            )
+
+        st.subheader("Preview File 2 - Sorted Data (10 Baris Pertama)")
+        st.dataframe(df_sorted.head(10), use_container_width=True)
+
+    except Exception as e:
+        st.error(f"❌ Terjadi error: {e}")
+
+    tracker.render()
+
+
+def render_out_batch(uploaded_files):
+    # Mode banyak toko: tiap workbook dibaca paralel, lalu Performa Produk semua toko digabung
+    # menjadi 1 workbook Sort & Filter dengan kolom Toko dan ringkasan 1 baris per toko.
+    st.info(f"🏬 {len(uploaded_files)} workbook diunggah — mode banyak toko. Nama toko diambil dari nama file.")
+    state_key = "shopee_out_batch_result"
+    signature = tuple((f.name, f.size) for f in uploaded_files)
+
+    if st.button("🚀 Proses semua toko", key="shopee_out_batch_btn"):
+        tracker = perf.PerfTracker("shopee_out_platform_batch")
+        progress = st.progress(0.0, text="Membaca workbook...")
+        with tracker.stage("load Performa Produk per toko (paralel)", rows=len(uploaded_files)):
+            results = parallel.run_parallel(
+                read_performa_produk,
+                [(f.name, read_uploaded_bytes(f)) for f in uploaded_files],
+                on_progress=lambda done, total: progress.progress(done / total, text=f"Membaca workbook {done}/{total}..."),
+            )
+        progress.empty()
+
+        with tracker.stage("gabung & sort semua toko") as rec:
+            df_sorted = combine_performa_produk(results)
+            rec["rows"] = len(df_sorted)
+        with tracker.stage("simpan ke lake (parquet)", rows=len(df_sorted)):
+            signatures = {r["toko"]: r["signature"] for r in results if "toko" in r}
+            for toko, part in (df_sorted.groupby(COL_TOKO, observed=True) if not df_sorted.empty else []):
+                lake.save("shopee_performa", part, None, str(toko), signature=signatures.get(toko))
+
+        sheets = {"1_Data_Sorted": df_sorted}
+        warnings = []
+        with tracker.stage("filter & ringkasan (semua toko)", rows=len(df_sorted)):
+            df_terjual, df_atc, missing_filter = filter_terjual_atc(df_sorted, [COL_TOKO, "Channel", "Produk"])
+            if missing_filter:
+                warnings.append(f"⚠️ Kolom Filter tidak lengkap {missing_filter}. Tahap Filter dilewati.")
+            else:
+                if not df_terjual.empty: sheets["2_Produk_Terjual"] = df_terjual
+                if not df_atc.empty: sheets["3_Nama_Produk_ATC"] = df_atc
+                if not df_terjual.empty: sheets["4_Ringkasan_Terjual"] = ringkasan_per_toko(df_terjual)
+                if not df_atc.empty: sheets["5_Ringkasan_ATC"] = ringkasan_per_toko(df_atc)
+
+        rows_out = sum(len(d) for d in sheets.values())
+        with tracker.stage("export xlsx", rows=rows_out):
+            excel_bytes = to_excel_bytes_from_sheets(sheets)
+        with tracker.stage("export parquet", rows=rows_out):
+            parquet_bytes = exporter.parquet_zip_bytes(sheets)
+
+        per_toko = pd.DataFrame({"Baris": df_sorted.groupby(COL_TOKO, observed=True).size()}) if not df_sorted.empty else pd.DataFrame()
+        for label, frame in [("Produk Terjual", df_terjual), ("Produk ATC", df_atc)]:
+            if not per_toko.empty and not frame.empty:
+                per_toko[label] = frame.groupby(COL_TOKO, observed=True)["Produk"].nunique()
+        st.session_state[state_key] = {
+            "signature": signature, "excel": excel_bytes, "parquet": parquet_bytes, "warnings": warnings,
+            "errors": [(r["file_name"], r["error"]) for r in results if r.get("error")],
+            "summary": per_toko.fillna(0).reset_index() if not per_toko.empty else per_toko,
+            "preview": df_sorted.head(10),
+        }
+        tracker.render()
+
+    result = st.session_state.get(state_key)
+    if result and result["signature"] == signature:
+        for fname, err in result["errors"]:
+            st.error(f"Gagal membaca {fname}: {err}")
+        for w in result["warnings"]:
+            st.warning(w)
+        st.dataframe(result["summary"], use_container_width=True, hide_index=True)
+
+        base_name = f"shopee_out_{len(uploaded_files)}_toko"
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="⬇️ Download Excel (Sort & Filter, semua toko)",
+                data=result["excel"],
+                file_name=f"{base_name}_filtered.xlsx",
+                mime=exporter.XLSX_MIME,
+                key="shopee_out_batch_dl_xlsx",
+            )
+        with col2:
+            st.download_button(
+                label="⬇️ Download Parquet (Sort & Filter, semua toko)",
+                data=result["parquet"],
+                file_name=f"{base_name}_filtered_parquet.zip",
+                mime=exporter.ZIP_MIME,
+                key="shopee_out_batch_dl_parquet",
+            )
+
+        st.subheader("Preview Data Sorted Gabungan (10 Baris Pertama)")
+        st.dataframe(result["preview"], use_container_width=True)
+
+
+def render_analitik_single(uploaded):
+    base_name = uploaded.name.rsplit(".", 1)[0]
+    tracker = perf.PerfTracker("shopee_analitik_produk")
+
+    with tracker.stage("load file") as rec:
+        try:
+            data = uploaded.getvalue()
+            df_raw = upload_cache.frame("shopee_analitik", data, lambda: load_analitik_frame(uploaded.name, data))
+        except Exception as e:
+            st.error(f"Gagal membaca file: {e}")
+            st.stop()
+        rec["rows"] = len(df_raw)
+
+    st.subheader("Preview (data asli)")
+    preview.render_preview(df_raw, key="analitik_raw_preview")
+
+    if st.button("Process", key="process_variasi_shopee"):
+        if "Kode Produk" not in df_raw.columns or "Nama Variasi" not in df_raw.columns:
+            st.error("File harus berisi kolom 'Kode Produk' dan 'Nama Variasi'.")
+            st.stop()
+        with tracker.stage("normalize & aggregate", rows=len(df_raw)):
+            df_final = process_analitik(df_raw)
+
+        with tracker.stage("simpan ke lake (parquet)", rows=len(df_final)):
+            lake.save("shopee_analitik", df_final, None, uploaded.name,
+                      signature=upload_cache.content_key("shopee_analitik", data))
+
+        with tracker.stage("export xlsx", rows=len(df_final)):
+            excel_bytes = to_excel_bytes_with_styling(df_final, product_merge_col="Kode Produk",
+                                                      highlight_condition=(df_final["Tipe Baris"] == "Total").to_numpy(),
+                                                      percent_cols=[c for c in ANALITIK_RATE_COLS if c in df_final.columns])
+
+        # Simpan hasil agar preview bisa dipaginasi tanpa harus menekan Process lagi
+        st.session_state["analitik_result"] = {
+            "source": (uploaded.name, uploaded.size),
+            "df_final": df_final,
+            "excel_bytes": excel_bytes,
+            "csv": {},
+            "parquet": None,
+        }
+
+    result = st.session_state.get("analitik_result")
+    if result and result["source"] == (uploaded.name, uploaded.size):
+        st.subheader("Hasil yang diproses (preview)")
+        preview.render_preview(result["df_final"], key="analitik_final_preview", css=analitik_preview_css(result["df_final"]),
+                               formatters=analitik_rate_formatters(result["df_final"]))
+
+        st.download_button(
+            label="Unduh hasil (.xlsx, sudah merge, highlight, & Grand Total)",
+            data=result["excel_bytes"],
+            file_name=f"{base_name}_sorted.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key="dl_rapi_xlsx_shopee"
+        )
+        # CSV ditulis bertahap (per chunk) saat pertama diminta, lalu disimpan per pilihan gzip
+        gzip_csv = st.checkbox("Kompres CSV (.csv.gz)", key="analitik_csv_gzip")
+        if gzip_csv not in result["csv"]:
+            with tracker.stage("export csv (streaming)", rows=len(result["df_final"])):
+                result["csv"][gzip_csv] = exporter.csv_bytes(result["df_final"], compress=gzip_csv)
+        st.download_button(
+            label="Unduh hasil (.csv.gz)" if gzip_csv else "Unduh hasil (.csv)",
+            data=result["csv"][gzip_csv],
+            key="dl_rapi_csv_shopee",
+            **exporter.csv_download_args(f"{base_name}_sorted", gzip_csv),
+        )
+        if result["parquet"] is None:
+            with tracker.stage("export parquet", rows=len(result["df_final"])):
+                result["parquet"] = exporter.parquet_bytes(result["df_final"])
+        st.download_button(
+            label="Unduh hasil (.parquet, bertipe untuk BI)",
+            data=result["parquet"],
+            file_name=f"{base_name}_sorted.parquet",
+            mime=exporter.PARQUET_MIME,
+            key="dl_rapi_parquet_shopee"
+        )
+        st.success("Selesai. Silakan unduh file atau cek pratinjau di atas.")
+
+    tracker.render()
+
+
+ANALITIK_DIFF_METRICS = [
+    "Pengunjung Produk (Kunjungan)", "Pengunjung Produk (Menambahkan Produk ke Keranjang)",
+    "Total Pembeli (Pesanan Dibuat)", "Total Pembeli (Pesanan Siap Dikirim)", "Penjualan (Pesanan Siap Dikirim) (IDR)",
+]
+
+
+def analitik_diff_css(df, delta_cols):
+    css = analitik_preview_css(df)
+    for c in delta_cols:
+        v = pd.to_numeric(df[c], errors="coerce")
+        preview.paint(css, v > 0, "background-color: #B6F2C2", [c])
+        preview.paint(css, v < 0, "background-color: #F5B7B1", [c])
+    return css
+
+
+def render_analitik_diff(uploaded_files):
+    # Mode bandingkan periode: tiap file diolah seperti mode satu file, lalu semua periode di-join
+    # pada (Kode Produk, NamaVariasiBase) dan dihitung selisihnya (lihat analitik_diff.py)
+    st.info(f"📊 {len(uploaded_files)} file diunggah — mode bandingkan periode. Label periode diambil dari nama file.")
+    state_key = "analitik_diff_result"
+    by_name = {f.name: f for f in uploaded_files}
+    names = list(by_name)
+    order = st.multiselect("Urutan periode (lama → baru)", names, default=sorted(names), key="analitik_diff_order")
+    if len(order) < 2:
+        st.info("Pilih minimal 2 periode.")
+        return
+    labels = [n.rsplit(".", 1)[0] for n in order]
+    col_base, col_metric = st.columns([1, 2])
+    with col_base:
+        base_label = st.selectbox(f"Bandingkan {labels[-1]} dengan", labels[:-1], index=len(labels) - 2, key="analitik_diff_base")
+    with col_metric:
+        show = st.multiselect("Metrik", ANALITIK_NUMERIC_COLS, default=ANALITIK_DIFF_METRICS, key="analitik_diff_metrics")
+    signature = (tuple((by_name[n].name, by_name[n].size) for n in order), base_label, tuple(show))
+
+    if st.button("🚀 Bandingkan periode", key="analitik_diff_btn"):
+        tracker = perf.PerfTracker("shopee_analitik_diff")
+        frames = []
+        for name in order:
+            with tracker.stage(f"load & olah {name}") as rec:
+                data = by_name[name].getvalue()
+                try:
+                    df_raw = upload_cache.frame("shopee_analitik", data, lambda: load_analitik_frame(name, data))
+                except Exception as e:
+                    st.error(f"Gagal membaca {name}: {e}")
+                    st.stop()
+                if "Kode Produk" not in df_raw.columns or "Nama Variasi" not in df_raw.columns:
+                    st.error(f"{name}: file harus berisi kolom 'Kode Produk' dan 'Nama Variasi'.")
+                    st.stop()
+                df_final = process_analitik(df_raw)
+                lake.save("shopee_analitik", df_final, None, name, signature=upload_cache.content_key("shopee_analitik", data))
+                frames.append(analitik_diff.keyed(df_final, ANALITIK_NUMERIC_COLS))
+                rec["rows"] = len(df_raw)
+
+        with tracker.stage("hash-join & selisih", rows=sum(len(f) for f in frames)):
+            df_diff = analitik_diff.compare(frames, labels, ANALITIK_NUMERIC_COLS, ANALITIK_RATE_COLS,
+                                            base=labels.index(base_label), sort_metric="Penjualan (Pesanan Siap Dikirim) (IDR)",
+                                            show=show)
+        delta_cols = [c for m in show for c in analitik_diff.delta_columns(m)] + \
+                     [analitik_diff.rate_change_column(r) for r in ANALITIK_RATE_COLS if analitik_diff.rate_change_column(r) in df_diff.columns]
+        percent_cols = [c for c in df_diff.columns if c.startswith("Δ% ") or c.endswith("(poin)")
+                        or any(c.startswith(f"{r} [") for r in ANALITIK_RATE_COLS)]
+        with tracker.stage("export xlsx", rows=len(df_diff)):
+            is_total = (df_diff[analitik_diff.COL_TIPE] == "Total").to_numpy()
+            excel_bytes = to_excel_bytes_with_styling(df_diff, product_merge_col="Kode Produk", highlight_condition=is_total,
+                                                      percent_cols=percent_cols, delta_cols=delta_cols)
+        st.session_state[state_key] = {"signature": signature, "df": df_diff, "delta_cols": delta_cols,
+                                       "excel_bytes": excel_bytes, "csv": None}
+        tracker.render()
+
+    result = st.session_state.get(state_key)
+    if result and result["signature"] == signature:
+        df_diff = result["df"]
+        status = df_diff[analitik_diff.COL_STATUS]
+        st.caption(f"{int((df_diff[analitik_diff.COL_TIPE] == '~').sum()):,} variasi · "
+                   f"{int((status == 'baru').sum()):,} baris baru · {int((status == 'hilang').sum()):,} baris hilang "
+                   f"({labels[-1]} vs {base_label})")
+        preview.render_preview(df_diff, key="analitik_diff_preview", css=analitik_diff_css(df_diff, result["delta_cols"]),
+                               formatters=analitik_rate_formatters(df_diff))
+        file_base = f"analitik_{labels[-1]}_vs_{base_label}"
+        st.download_button("Unduh perbandingan (.xlsx, merge, highlight & kolom selisih)", data=result["excel_bytes"],
+                           file_name=f"{file_base}.xlsx", mime=exporter.XLSX_MIME, key="dl_analitik_diff_xlsx")
+        if result["csv"] is None:
+            result["csv"] = exporter.csv_bytes(df_diff)
+        st.download_button("Unduh perbandingan (.csv)", data=result["csv"], key="dl_analitik_diff_csv",
+                           **exporter.csv_download_args(file_base, False))
+
+def render_shopee_ads_trend():
+    st.markdown("---")
+    st.subheader("📈 Tren Harian Iklan (Histori)")
+    dates = shopee_history.available_dates()
+    if not dates:
+        st.info("Belum ada histori. Centang **Simpan ringkasan ke histori tren** saat memproses CSV.")
+        return
+    st.caption(f"{len(dates)} tanggal tersimpan: {dates[0]:%Y-%m-%d} s/d {dates[-1]:%Y-%m-%d}")
+
+    col_a, col_b = st.columns(2)
+    with col_a: n_days = st.slider("Jumlah hari terakhir", min_value=2, max_value=90, value=14, key="shopee_trend_days")
+    with col_b: metric = st.selectbox("Metrik", shopee_history.METRICS, key="shopee_trend_metric")
+
+    tab_iklan, tab_merah, tab_wow, tab_total = st.tabs(["Per Iklan", "🔴 Berubah Jadi MERAH", "📅 Minggu ke Minggu", "Σ Total Harian"])
+    with tab_iklan:
+        pivot = shopee_history.trend_table(metric, n_days)
+        if pivot.empty: st.info("Tidak ada data pada rentang ini.")
+        else:
+            pivot = pivot.reset_index()
+            date_cols = [c for c in pivot.columns if c != shopee_history.COL_NAMA]
+            css = roas_css(pivot, date_cols) if metric == shopee_history.COL_ROAS else None
+            preview.render_preview(pivot, key="shopee_trend_pivot", css=css, hide_index=True)
+    with tab_merah:
+        merah = shopee_history.turned_red(n_days)
+        if merah.empty: st.success("Tidak ada iklan yang baru berubah menjadi MERAH.")
+        else:
+            st.caption(f"{len(merah)} iklan MERAH di tanggal terakhir yang sebelumnya bukan MERAH.")
+            preview.render_preview(merah, key="shopee_trend_merah", hide_index=True)
+    with tab_wow:
+        wow = shopee_history.week_over_week()
+        if wow.empty: st.info("Tidak ada data 14 hari terakhir.")
+        else:
+            css = preview.empty_css(wow)
+            for c in [c for c in wow.columns if c.startswith("Δ ")]:
+                v = pd.to_numeric(wow[c], errors="coerce")
+                preview.paint(css, v > 0, "background-color: #b6f2c2", [c])
+                preview.paint(css, v < 0, "background-color: #f5b7b1", [c])
+            preview.render_preview(wow, key="shopee_trend_wow", css=css, hide_index=True)
+    with tab_total:
+        totals = shopee_history.load_totals()
+        if not totals.empty:
+            st.line_chart(totals[[metric]])
+            st.dataframe(totals, use_container_width=True)
+
+    with st.expander("🗑️ Hapus tanggal dari histori"):
+        to_remove = st.selectbox("Tanggal", [""] + [d.isoformat() for d in reversed(dates)], key="shopee_trend_remove")
+        if to_remove and st.button("Hapus", key="shopee_trend_remove_btn"):
+            shopee_history.delete_date(date.fromisoformat(to_remove))
+            st.rerun()
+
+
+def render():
+    st.title("Shopee & CPAS — Utilities")
+    st.markdown(SHOPEE_CSS, unsafe_allow_html=True)
+
+    # =========================================================================
+    # NAVIGATION VIA TABS (MENGGANTIKAN SIDEBAR)
+    # =========================================================================
+    # KITA TAMBAHKAN 1 TAB BARU: "🔗 UTM Link Cleaner"
+    tab_out, tab_analitik, tab_ads, tab_link = st.tabs([
+        "🗂️ Shopee Out Platform", 
+        "✨ Analitik Produk", 
+        "📊 Shopee Ads",
+        "🔗 UTM Link Cleaner"
+    ])
+
+    # =========================================================================
+    # FITUR 1: GABUNGAN CONVERT -> SORT -> FILTER
+    # =========================================================================
+    with tab_out:
+        st.header("Gabungan: Convert Dot/Comma ➔ Sort ➔ Filter")
+        st.write("Upload 1 file Excel. Proses akan berjalan otomatis dan menghasilkan 2 file Excel:")
+        st.markdown("""
+        * **File 1 (Converter)**: Seluruh sheet dari file asli ditukar titik & koma-nya. Mode **Cepat** hanya menukar teks sel dan mempertahankan format, warna, serta sel angka file asli; mode **Baca ulang** menulis ulang semua sel sebagai teks (cara lama).
+        * **File 2 (Sort & Filter)**: Mengambil sheet **Performa Produk**, melakukan Sort, lalu difilter untuk nama produk Terjual & ATC. Dibuatkan juga Ringkasan Filter per Platform.
+        * **Banyak toko sekaligus**: Upload lebih dari 1 file untuk membaca semuanya secara paralel. Performa Produk semua toko digabung (dengan kolom **Toko**) menjadi 1 file Sort & Filter, dengan ringkasan 1 baris per toko.
+        """)
+
+        uploaded_files = st.file_uploader("📂 Upload file Excel (.xlsx/.xls) — bisa banyak toko sekaligus", type=["xlsx", "xls"], accept_multiple_files=True, key="gabung_uploader_shopee")
+        if len(uploaded_files) == 1:
+            render_out_single(uploaded_files[0])
+        elif len(uploaded_files) > 1:
+            render_out_batch(uploaded_files)
+
+
+    # =========================================================================
+    # FITUR 2: Analitik Produk
+    # =========================================================================
+    with tab_analitik:
+        st.header("Rapikan file XLSX/CSV — Produk & Variasi")
+        st.markdown(
+            "Upload file .xlsx atau .csv lalu tekan **Process**. Hasil bisa diunduh sebagai XLSX yang sudah di-merge, diberi warna, memiliki dropdown warna khusus, serta baris **Grand Total** di akhir."
+        )
+        st.markdown(
+            "Upload **2 file atau lebih** (mis. bulan lalu & bulan ini) untuk mode **bandingkan periode**: produk & variasi "
+            "dicocokkan lewat Kode Produk + Nama Variasi, lalu dihitung selisih, selisih %, dan perubahan rasio konversinya."
+        )
+
+        uploaded_files = st.file_uploader("Upload file (.xlsx or .csv) — 2 file atau lebih untuk membandingkan periode",
+                                          type=["xlsx", "xls", "csv"], accept_multiple_files=True, key="rapiin_variasi_shopee")
+        if len(uploaded_files) == 1:
+            render_analitik_single(uploaded_files[0])
+        elif len(uploaded_files) > 1:
+            render_analitik_diff(uploaded_files)
+
+
+    # =========================================================================
+    # FITUR 3: CSV IKLAN -> EXCEL BERWARNA
+    # =========================================================================
+    with tab_ads:
+        st.header("Shopee Ads - CSV to Excel")
+        st.markdown("Upload CSV iklan Shopee → otomatis rapi → download Excel laporan")
+
+        st.markdown("##### Pengaturan Filter Laporan")
+        csv_mode = st.selectbox(
+            "Mode CSV",
+            options=["CSV Keseluruhan (Normal)", "CSV Grup Iklan (hanya iklan produk)"],
+            index=0,
+            key="shopee_csv_mode_main"
+        )
+        
+        st.markdown("Pilih kategori warna yang ingin disertakan di **RINGKASAN_IKLAN**")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1: include_merah = st.checkbox("Sertakan MERAH", value=True, key="inc_merah_main")
+        with col2: include_kuning = st.checkbox("Sertakan KUNING", value=True, key="inc_kuning_main")
+        with col3: include_hijau = st.checkbox("Sertakan HIJAU", value=True, key="inc_hijau_main")
+        with col4: include_biru = st.checkbox("Sertakan BIRU", value=True, key="inc_biru_main")
+        
+        st.caption("Catatan: filter warna ini hanya mempengaruhi sheet RINGKASAN_IKLAN (preview & export).")
+        st.markdown("---")
+
+        uploaded_file = st.file_uploader("Upload file CSV iklan Shopee", type=["csv"], key="csviklan_uploader_shopee")
+
+        if uploaded_file:
+            # Tanggal laporan dideteksi dari baris pembuka CSV, bisa dikoreksi manual
+            detected_date = shopee_history.detect_report_date(uploaded_file.getvalue())
+            col_h1, col_h2 = st.columns(2)
+            with col_h1:
+                simpan_histori = st.checkbox("💾 Simpan ringkasan ke histori tren", value=True, key="shopee_ads_save_history")
+            with col_h2:
+                report_date = st.date_input("Tanggal laporan", value=detected_date, key=f"shopee_ads_report_date_{uploaded_file.name}")
+            if detected_date is None:
+                st.caption("⚠️ Tanggal laporan tidak terdeteksi dari file, silakan pilih manual. "
+                           "Tanpa tanggal, histori & tabel fakta lintas platform tidak diisi.")
+
+            if st.button("🚀 Proses & Download Excel", key="process_csviklan_shopee"):
+                # Diproses di job latar belakang: sesi tetap responsif & hasil bertahan saat rerun
+                jobs.enqueue(
+                    "shopee_ads", f"Shopee Ads — {uploaded_file.name}", shopee_ads_job,
+                    raw_bytes=read_uploaded_bytes(uploaded_file), file_name=uploaded_file.name, csv_mode=csv_mode,
+                    include_merah=include_merah, include_kuning=include_kuning,
+                    include_hijau=include_hijau, include_biru=include_biru,
+                    report_date=report_date, simpan_histori=simpan_histori,
+                )
+
+        jobs.render_jobs("shopee_ads", key="shopee_ads_jobs")
+
+        render_shopee_ads_trend()
+
+    # =========================================================================
+    # FITUR 4: SHOPEE UTM Link Cleaner
+    # =========================================================================
+    with tab_link:
+        st.header("🛍️ Shopee UTM Link Cleaner")
+        st.write("Aplikasi sederhana untuk mengubah link panjang Shopee menjadi link pendek yang rapi.")
+
+        # Input dari pengguna
+        url_input = st.text_input("Masukkan Link Shopee Panjang:", placeholder="https://shopee.co.id/Dress-Lebaran...", key="shopee_link_input")
+
+        # Tombol proses
+        if st.button("Bersihkan Link", key="clean_link_button"):
+            if url_input:
+                # Mencari pola -i.[ShopID].[ItemID] di dalam link
+                match = re.search(r'-i\.(\d+)\.(\d+)', url_input)
+                
+                if match:
+                    shop_id = match.group(1)
+                    item_id = match.group(2)
+                    
+                    # Menyusun ulang link baru
+                    clean_url = f"https://shopee.co.id/product/{shop_id}/{item_id}"
+                    
+                    st.success("Berhasil! Ini link baru kamu:")
+                    
+                    # Menampilkan hasil dengan tombol copy (st.code otomatis ada tombol copy di pojok kanannya)
+                    st.code(clean_url, language="text")
+                    
+                    # Menambahkan tombol untuk langsung membuka link tersebut
+                    st.markdown(f"[🔗 Klik di sini untuk membuka link produk]({clean_url})")
+                    
+                else:
+                    st.error("Link tidak valid atau format tidak dikenali. Pastikan link adalah link produk Shopee yang benar.")
+            else:
+                st.warning("Silakan masukkan link terlebih dahulu sebelum menekan tombol.")
@@ -0,0 +1,959 @@
+# tiktok.py
+# Halaman TikTok: Excel Fixer & Pewarnaan ROI dan Daily Ads Comparator.
+
+import io
+from datetime import datetime, date, timedelta
+from collections import OrderedDict
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+import anomaly
+import config
+import dtype_plan
+import excel_reader
+import exporter
+import facts
+import frame_cache
+import jobs
+import lake
+import perf
+import prefix_index
+import preview
+import rollup
+import upload_cache
+import xlstyle
+
+
+# Helper & Config (Excel Fixer & Pewarnaan ROI)
+percent_cols = [
+    'Tingkat klik iklan produk', 'Rasio konversi iklan', 'Rasio tayang video iklan 2 detik',
+    'Rasio tayang video iklan 6 detik', 'Rasio tayang video iklan 25%', 'Rasio tayang video iklan 50%',
+    'Rasio tayang video iklan 75%', 'Rasio tayang video iklan 100%'
+]
+
+
+def find_column(df, keywords):
+    kws = [k.lower() for k in keywords]
+    for col in df.columns:
+        low = str(col).lower()
+        if any(kw in low for kw in kws):
+            return col
+    return None
+
+
+def series_to_numeric_like(df_col):
+    s_orig = df_col.astype(str).fillna("").str.strip()
+    had_pct = s_orig.str.contains("%")
+    s = s_orig.copy()
+    has_paren = s.str.startswith("(") & s.str.endswith(")")
+    s = s.mask(has_paren, "-" + s.str[1:-1])
+    s = s.str.replace("%", "", regex=False).str.replace(",", "", regex=False).str.replace(" ", "", regex=False).replace("", np.nan)
+    numeric = pd.to_numeric(s, errors="coerce")
+    numeric = numeric.where(~had_pct, numeric / 100.0)
+    return numeric
+
+
+def campaign_lake_columns(df: pd.DataFrame, col_pendapatan=None) -> dict:
+    # Kolom turunan untuk lake (dataset tiktok_campaign): nama campaign + biaya/pendapatan/ROI sebagai angka
+    nama = next((c for kw in ["nama campaign", "campaign name", "nama kampanye"] for c in df.columns if kw in str(c).lower()), None) \
+        or next((c for c in df.columns if "campaign" in str(c).lower() and "id" not in str(c).lower()), None)
+    col_pendapatan = col_pendapatan or find_column(df, ["pendapatan kotor", "pendapatan", "gmv", "revenue"])
+
+    def num(col):
+        return series_to_numeric_like(df[col]).astype("float64") if col else pd.Series(np.nan, index=df.index)
+
+    return {
+        "_campaign": df[nama].astype(str) if nama else pd.Series("", index=df.index),
+        "_biaya": num(find_column(df, ["biaya", "cost"])),
+        "_pendapatan": num(col_pendapatan),
+        "_roi": num(find_column(df, ["roi"])),
+    }
+
+
+# Warna baris ROI (hex, tanpa "#") untuk export DATA_COLORED
+ROI_FILL_HIJAU = "00FF00"       # ROI >= 10
+ROI_FILL_KUNING = "FFFF00"      # 0 < ROI < 10
+ROI_FILL_OTORISASI = "98F073"   # Status "perlu otorisasi" (sel Status sendiri: ROI_FILL_STATUS)
+ROI_FILL_STATUS = "FF7979"
+
+
+def roi_row_fills(biaya: pd.Series, pendapatan: pd.Series, roi: pd.Series, status: pd.Series = None):
+    # Vektor: warna per baris dihitung dari kolom yang sudah numerik (series_to_numeric_like),
+    # hasil: (array hex per baris, "" = tanpa warna; mask baris "perlu otorisasi")
+    roi = roi.to_numpy(dtype=float, na_value=np.nan)
+    ada_nilai = (biaya.fillna(0).to_numpy() > 0) | (pendapatan.fillna(0).to_numpy() > 0)
+    valid = ~np.isnan(roi) & ada_nilai & (roi != 0)
+
+    fills = np.full(len(roi), "", dtype=object)
+    fills[valid & (roi >= 10)] = ROI_FILL_HIJAU
+    fills[valid & (roi < 10)] = ROI_FILL_KUNING
+    if status is None:
+        otorisasi = np.zeros(len(roi), dtype=bool)
+    else:
+        otorisasi = (status.notna() & status.astype(str).str.strip().str.lower().eq("perlu otorisasi")).to_numpy()
+    fills[otorisasi] = ROI_FILL_OTORISASI
+    return fills, otorisasi
+
+
+def _cell_values(df: pd.DataFrame) -> np.ndarray:
+    # Nilai siap tulis per baris (NaN/NaT -> None = sel kosong)
+    values = df.astype(object)
+    return values.where(values.notna(), None).to_numpy()
+
+
+def write_roi_workbook(buffer, df_colored: pd.DataFrame, df_asli: pd.DataFrame, fills: np.ndarray,
+                       otorisasi: np.ndarray, col_status=None, pct_cols=()):
+    # Sheet DATA_COLORED (berwarna) + DATA_ASLI dalam satu kali tulis. Dengan xlsxwriter, baris ditulis
+    # langsung (write_row) dalam mode constant_memory: persen & tanggal jadi format kolom, baris berwarna
+    # memakai format isian yang di-cache per kombinasi. Tanpa xlsxwriter: satu lintasan openpyxl per baris.
+    pct_idx = [df_colored.columns.get_loc(c) for c in pct_cols if c in df_colored.columns]
+    status_idx = df_colored.columns.get_loc(col_status) if col_status in df_colored.columns else None
+
+    if EXCEL_ENGINE == "xlsxwriter":
+        with pd.ExcelWriter(buffer, engine="xlsxwriter", engine_kwargs={"options": {"constant_memory": True}}) as writer:
+            formats = xlstyle.XlsxwriterFormats(writer.book)
+
+            def fmt(fill, num_style):
+                return formats.get(xlstyle.fill(fill) if fill else None, num_style)
+
+            def datetime_cols(df):
+                return {i: "tanggal_jam" for i, c in enumerate(df.columns) if pd.api.types.is_datetime64_any_dtype(df[c])}
+
+            # DATA_COLORED: header lewat pandas, isi baris ditulis sendiri
+            df_colored.head(0).to_excel(writer, sheet_name="DATA_COLORED", index=False)
+            ws = writer.sheets["DATA_COLORED"]
+            col_numfmt = {**datetime_cols(df_colored), **{i: "persen" for i in pct_idx}}
+            exporter.apply_column_widths(ws, exporter.column_widths(df_colored),
+                                         formats={i: fmt("", f) for i, f in col_numfmt.items()})
+            for r, row_vals in enumerate(_cell_values(df_colored)):
+                fill = fills[r]
+                if not fill:
+                    ws.write_row(r + 1, 0, row_vals)
+                    continue
+                ws.write_row(r + 1, 0, row_vals, fmt(fill, None))
+                for i, num_format in col_numfmt.items():
+                    ws.write(r + 1, i, row_vals[i], fmt(fill, num_format))
+                if status_idx is not None and otorisasi[r]:
+                    ws.write(r + 1, status_idx, row_vals[status_idx], fmt(ROI_FILL_STATUS, col_numfmt.get(status_idx)))
+
+            df_asli.head(0).to_excel(writer, sheet_name="DATA_ASLI", index=False)
+            ws = writer.sheets["DATA_ASLI"]
+            exporter.apply_column_widths(ws, exporter.column_widths(df_asli),
+                                         formats={i: fmt("", f) for i, f in datetime_cols(df_asli).items()})
+            for r, row_vals in enumerate(_cell_values(df_asli)):
+                ws.write_row(r + 1, 0, row_vals)
+        return
+
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        df_colored.to_excel(writer, sheet_name="DATA_COLORED", index=False)
+        df_asli.to_excel(writer, sheet_name="DATA_ASLI", index=False)
+        exporter.autofit(writer.sheets["DATA_ASLI"], df_asli)
+        ws = writer.sheets["DATA_COLORED"]
+        exporter.autofit(ws, df_colored)
+        styles = xlstyle.OpenpyxlStyles()
+        for r, row_cells in enumerate(ws.iter_rows(min_row=2, max_row=len(df_colored) + 1)):
+            fill = fills[r]
+            if fill:
+                styles.apply_cells(row_cells, xlstyle.fill(fill))
+                if status_idx is not None and otorisasi[r]:
+                    styles.apply(row_cells[status_idx], xlstyle.fill(ROI_FILL_STATUS))
+            for i in pct_idx:
+                styles.apply(row_cells[i], "persen")
+
+try:
+    import xlsxwriter  # noqa: F401
+    EXCEL_ENGINE = "xlsxwriter"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+
+def load_excel_safe(file, sheet_name=0):
+    # Hasil parse di-cache lintas sesi/job berdasarkan isi file (upload_cache)
+    try:
+        file.seek(0)
+        data = file.read()
+        df, meta = upload_cache.frame_with_meta(f"tiktok_fixer_{sheet_name}", data,
+                                                lambda: _parse_fixer_excel(io.BytesIO(data), sheet_name))
+        return df, meta.get("target_col")
+    except Exception:
+        return None, None
+
+
+def _parse_fixer_excel(file, sheet_name=0):
+    temp_df = excel_reader.read_excel(file, sheet_name=sheet_name, nrows=0)
+    dtype_dict = {}
+    target_col = None
+    for col in temp_df.columns:
+        if "id" in str(col).lower():
+            dtype_dict[col] = str
+            target_col = col
+            break
+    file.seek(0)
+    final_df = excel_reader.read_excel(file, sheet_name=sheet_name, dtype=dtype_dict)
+
+    # Membersihkan koma menjadi titik (Fixer)
+    for col in final_df.columns:
+        if col == target_col: continue
+        if final_df[col].dtype == "object" or pd.api.types.is_string_dtype(final_df[col].dtype):
+            try:
+                replaced = final_df[col].astype(str).str.replace(',', '.', regex=False)
+                parsed = pd.to_numeric(replaced, errors='coerce')
+                # Hanya dipakai jika seluruh kolom memang angka (tidak ada nilai baru yang jadi NaN)
+                final_df[col] = parsed if parsed.isna().sum() == final_df[col].isna().sum() else replaced
+            except Exception: pass
+    ids = [target_col] if target_col else []
+    return dtype_plan.optimize(final_df, ids=ids), {"target_col": target_col}
+
+
+def tiktok_fixer_job(ctx, file_bytes: bytes, file_name: str, use_roi_color: bool = False):
+    # Job latar belakang (lihat jobs.py): fix ID & koma, opsional pewarnaan ROI, lalu export Excel + Parquet
+    tracker = ctx.tracker
+    base_name = file_name.rsplit('.', 1)[0]
+    ctx.progress(0.05, "Membaca Excel...")
+    with tracker.stage("load & fix koma") as rec:
+        df_hasil, kolom_target = load_excel_safe(io.BytesIO(file_bytes))
+        rec["rows"] = 0 if df_hasil is None else len(df_hasil)
+
+    if df_hasil is None:
+        raise ValueError("Gagal memproses file. Pastikan format file benar.")
+
+    buffer = exporter.spooled_file()
+
+    # JIKA SWITCH PEWARNAAN AKTIF
+    if use_roi_color:
+        outname = f"{base_name}_colored.xlsx"
+
+        col_biaya = find_column(df_hasil, ["biaya", "cost"])
+        col_pendapatan_kotor = find_column(df_hasil, ["pendapatan kotor", "pendapatan_kotor", "pendapatan", "gmv", "revenue"])
+        col_pendapatan_bruto = find_column(df_hasil, ["pendapatan bruto", "penghasilan bruto", "penghasilan_bruto", "bruto", "gross", "gross revenue"])
+        col_roi = find_column(df_hasil, ["roi"])
+        col_status = find_column(df_hasil, ["status"])
+
+        col_pendapatan_effective = None
+        pendapatan_computed_name = "__pendapatan_bruto_computed"
+        bruto_was_computed = False
+
+        if col_pendapatan_bruto:
+            col_pendapatan_effective = col_pendapatan_bruto
+        elif col_pendapatan_kotor:
+            bonus_keywords = ["bonus", "komisi", "tunjangan", "insentif", "incentive"]
+            if any(any(k in str(c).lower() for k in bonus_keywords) for c in df_hasil.columns):
+                col_pendapatan_effective = pendapatan_computed_name
+                bruto_was_computed = True
+            else:
+                col_pendapatan_effective = col_pendapatan_kotor
+
+        missing = [m for m, cond in zip(["Biaya", "Pendapatan", "ROI"], [col_biaya, col_pendapatan_kotor or col_pendapatan_bruto, col_roi]) if not cond]
+
+        if missing:
+            raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing)}. Gagal mewarnai ROI.")
+
+        ctx.progress(0.3, "Pewarnaan ROI...")
+        with tracker.stage("parse & pewarnaan ROI", rows=len(df_hasil)):
+            # Setiap kolom di-parse ke numerik tepat sekali, lalu dipakai ulang (hapus baris, warna, bruto)
+            parsed = {}
+
+            def num(col):
+                if col not in parsed: parsed[col] = series_to_numeric_like(df_hasil[col])
+                return parsed[col]
+
+            delete_mask = (num(col_biaya) == 0) & (num(col_pendapatan_kotor or col_pendapatan_bruto) == 0) & (num(col_roi) == 0)
+            keep = ~delete_mask
+            df_colored = df_hasil.loc[keep].copy()
+
+            pct_present = [c for c in percent_cols if c in df_colored.columns]
+            for c in pct_present: df_colored[c] = num(c)[keep]
+
+            if bruto_was_computed:
+                bonus_cols = [c for c in df_colored.columns if any(k in str(c).lower() for k in ["bonus", "komisi", "tunjangan", "insentif", "incentive"])]
+                bruto = num(col_pendapatan_kotor)[keep].fillna(0)
+                for bcol in bonus_cols: bruto = bruto + num(bcol)[keep].fillna(0)
+                df_colored[pendapatan_computed_name] = bruto
+                col_pendapatan_effective = pendapatan_computed_name
+
+            if col_pendapatan_effective is None: col_pendapatan_effective = col_pendapatan_kotor or col_pendapatan_bruto
+            pendapatan_num = df_colored[col_pendapatan_effective] if bruto_was_computed else num(col_pendapatan_effective)[keep]
+
+            fills, otorisasi = roi_row_fills(num(col_biaya)[keep], pendapatan_num, num(col_roi)[keep],
+                                             df_colored[col_status] if col_status else None)
+
+        ctx.progress(0.5, "Menulis Excel...")
+        with tracker.stage("export xlsx (warna)", rows=len(df_colored)):
+            write_roi_workbook(buffer, df_colored, df_hasil, fills, otorisasi, col_status, pct_present)
+
+        ctx.note("✅ File berhasil diproses (Fixer + Warna).", "success")
+        df_final = df_colored
+        col_lake_pendapatan = col_pendapatan_effective
+
+    # JIKA SWITCH PEWARNAAN MATI (Normal Fixer)
+    else:
+        outname = f"{base_name}_sorted.xlsx"
+
+        ctx.progress(0.5, "Menulis Excel...")
+        with tracker.stage("export xlsx (fixer)", rows=len(df_hasil)):
+            with pd.ExcelWriter(buffer, engine=EXCEL_ENGINE) as writer:
+                df_hasil.to_excel(writer, index=False, sheet_name="Sheet1")
+                exporter.autofit(writer.sheets["Sheet1"], df_hasil)
+
+        ctx.note("✅ File berhasil diproses (Hanya Fixer).", "success")
+        df_final = df_hasil
+        col_lake_pendapatan = None
+
+    ctx.add_file(outname, buffer, exporter.XLSX_MIME, "📥 Download Excel Hasil")
+    ctx.add_preview(df_final)
+
+    # Parquet berisi frame akhir yang sama (termasuk kolom hitungan seperti __pendapatan_bruto_computed)
+    ctx.progress(0.9, "Menulis Parquet...")
+    with tracker.stage("export parquet", rows=len(df_final)):
+        ctx.add_file(outname.replace(".xlsx", ".parquet"), exporter.parquet_bytes(df_final), exporter.PARQUET_MIME, "📥 Download Parquet Hasil")
+    with tracker.stage("simpan ke lake (parquet)", rows=len(df_final)):
+        # Tanggal dari kolom tanggal export (bila ada); tanpa itu campaign masuk lake tanpa tanggal & tidak ke tabel fakta
+        derived = campaign_lake_columns(df_final, col_lake_pendapatan)
+        dates = facts.report_dates(df_final)
+        lake.save("tiktok_campaign", df_final, facts.single_date(dates), base_name, derived=derived)
+        facts.save(facts.build(
+            df_final, "tiktok", date=dates, account=facts.pick(df_final, ["nama akun", "akun iklan", "advertiser"]),
+            campaign=derived["_campaign"], spend=derived["_biaya"], revenue=derived["_pendapatan"],
+            orders=facts.pick(df_final, facts.ORDER_KEYS), impressions=facts.pick(df_final, facts.IMPRESSION_KEYS),
+            clicks=facts.pick(df_final, facts.CLICK_KEYS),
+        ), f"tiktok_{base_name}")
+    if dates is None:
+        ctx.note("ℹ️ Export tidak memuat kolom tanggal: campaign tidak dimasukkan ke tabel fakta lintas platform.")
+
+
+# Config & helper Daily Ads Comparator
+ALLOWED_METRICS = [
+    "ID", "Produk", "Status", "GMV", "Produk terjual", "Pesanan", "GMV tab Toko",
+    "Impresi daftar produk tab Toko", "Rasio klik-tayang shop tab", "GMV dari LIVE",
+    "Impresi dari LIVE", "Rasio klik-tayang dari LIVE", "GMV dari video",
+    "Impresi dari video", "Rasio klik-tayang dari video", "Impresi dari kartu produk",
+    "Tayangan halaman dari kartu produk", "Tayangan halaman unik dari kartu produk",
+    "Pembeli unik dari kartu produk", "Rasio klik-tayang dari kartu produk",
+    "Persentase konversi dari kartu produk",
+]
+PERCENT_NAME_KEYWORDS = ["rasio", "rasio klik", "persentase", "konversi", "ctr", "ratio"]
+
+
+def read_date_from_a1(uploaded_file) -> date:
+    try:
+        data = uploaded_file.read() if hasattr(uploaded_file, "read") else uploaded_file
+        raw = excel_reader.first_cell(data)
+        if isinstance(raw, datetime): return raw.date()
+        if isinstance(raw, date): return raw
+        if isinstance(raw, (int, float)):
+            try: return datetime.fromordinal(datetime(1900, 1, 1).toordinal() + int(raw) - 2).date()
+            except Exception: return raw
+        if isinstance(raw, str):
+            for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d"):
+                try: return datetime.strptime(raw.strip(), fmt).date()
+                except Exception: pass
+            return raw.strip()
+        return raw
+    except Exception:
+        return None
+
+
+def read_data_table(uploaded_file) -> pd.DataFrame:
+    try:
+        if hasattr(uploaded_file, "read"):
+            try: uploaded_file.seek(0)
+            except Exception: pass
+        return excel_reader.read_excel(uploaded_file, header=2)
+    except Exception:
+        return pd.DataFrame()
+
+
+def normalize_and_filter_df(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [str(c).strip() for c in df.columns]
+    df = df.reindex(columns=[c for c in ALLOWED_METRICS if c in df.columns])
+    for s in ["ID", "Produk", "Status"]:
+        if s in df.columns: df[s] = df[s].astype(str)
+    for col in df.columns:
+        if col in ("ID", "Produk", "Status"): continue
+        is_percent = any(k in col.lower() for k in PERCENT_NAME_KEYWORDS)
+        if not pd.api.types.is_numeric_dtype(df[col]) or is_percent:
+            def try_parse(x):
+                if pd.isna(x): return None
+                if isinstance(x, str):
+                    v = x.strip().replace(',', '')
+                    if v.endswith('%'):
+                        try: return float(v.rstrip('%')) / 100.0
+                        except Exception: return None
+                    try: return float(v)
+                    except Exception: return None
+                if isinstance(x, (int, float)):
+                    if is_percent and x > 1: return float(x) / 100.0
+                    return float(x)
+                return None
+            df[col] = df[col].apply(try_parse)
+        df[col] = pd.to_numeric(df[col], errors='coerce') if col not in ("ID", "Produk", "Status") else df[col]
+    # Dataset disimpan per tanggal di session_state, jadi dtype dipadatkan: ID -> string kompak,
+    # Produk/Status -> category, metrik -> int32/float32 (kolom persentase boleh float32)
+    percent_cols = [c for c in df.columns if any(k in c.lower() for k in PERCENT_NAME_KEYWORDS)]
+    return dtype_plan.optimize(df, categorical=["Produk", "Status"], ids=["ID"],
+                               lossy_float_cols=percent_cols, auto_categorical=False)
+
+
+def load_daily_export(data: bytes):
+    # Satu file harian: tanggal (sel A1) + tabel yang sudah dinormalisasi; hasilnya di-cache lintas sesi
+    date_val = read_date_from_a1(io.BytesIO(data))
+    df_raw = read_data_table(io.BytesIO(data)) if date_val else pd.DataFrame()
+    df = normalize_and_filter_df(df_raw) if not df_raw.empty else pd.DataFrame()
+    return df, {"date": str(date_val) if date_val else None, "raw_rows": len(df_raw)}
+
+
+def session_cache() -> frame_cache.FrameCache:
+    # Dataset harian per tanggal: Arrow terkompresi di session_state, dibatasi budget memori (config)
+    if "tiktok_daily_cache" not in st.session_state:
+        st.session_state["tiktok_daily_cache"] = frame_cache.FrameCache(
+            config.COMPARATOR_CACHE_MB * 1024 * 1024, config.COMPARATOR_EVICTION)
+    return st.session_state["tiktok_daily_cache"]
+
+
+def daily_summaries() -> rollup.DailySummaries:
+    # Ringkasan kecil per tanggal (per produk + keseluruhan) untuk tabel produk × tanggal & rollup periode.
+    # Tidak ikut dibuang saat frame mentah kena eviksi budget; hanya hapus/clear manual yang menghapusnya.
+    if "tiktok_daily_summaries" not in st.session_state:
+        st.session_state["tiktok_daily_summaries"] = rollup.DailySummaries('Produk')
+    return st.session_state["tiktok_daily_summaries"]
+
+
+def sync_summaries(cache: frame_cache.FrameCache) -> int:
+    # Hanya tanggal yang belum punya ringkasan yang dibuka dari cache & dihitung; hasil = jumlah tanggal baru
+    summaries, added = daily_summaries(), 0
+    for date_key, df in cache.frames([k for k in cache.keys() if k not in summaries]).items():
+        parsed = pd.to_datetime(str(date_key).split('~')[0].strip(), errors='coerce')
+        if pd.isna(parsed): continue
+        metrics = [c for c in ALLOWED_METRICS if c not in ('ID', 'Produk', 'Status')]
+        summaries.add(date_key, parsed, df, metrics, rates=rate_metrics(metrics))
+        added += 1
+    return added
+
+
+def add_to_session_cache(date_val, df) -> list:
+    parsed = pd.to_datetime(str(date_val).split('~')[0].strip(), errors='coerce')
+    daily_summaries().drop(date_val)
+    return session_cache().put(str(date_val), df, order_key=parsed.timestamp() if pd.notna(parsed) else None)
+
+
+def clear_cache():
+    session_cache().clear()
+    daily_summaries().clear()
+
+
+def remove_date_from_cache(date_key):
+    session_cache().pop(date_key)
+    daily_summaries().drop(date_key)
+
+
+def daily_aggregate_css(df: pd.DataFrame) -> pd.DataFrame:
+    # Warna naik/turun vs hari sebelumnya, dihitung sekali untuk seluruh tabel
+    css = preview.empty_css(df)
+    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    if not numeric_cols: return css
+    d = df[numeric_cols].diff().to_numpy(dtype=float)
+    css[numeric_cols] = np.where(d > 0, 'background-color: #b6f2c2',
+                        np.where(d < 0, 'background-color: #f5b7b1',
+                        np.where(np.isnan(d), '', 'background-color: white')))
+    return css
+
+
+def daily_aggregate_formatters(df: pd.DataFrame) -> dict:
+    def fmt(x, col=None):
+        if pd.isna(x): return ""
+        if col and any(k in col.lower() for k in PERCENT_NAME_KEYWORDS):
+            try: return f"{x:.2%}"
+            except Exception: return x
+        else:
+            try: return f"{int(x):,}" if float(x).is_integer() else f"{x:,.2f}"
+            except Exception: return x
+
+    return {c: (lambda v, col=c: fmt(v, col)) for c in df.columns}
+
+
+def show_daily_table(df: pd.DataFrame, key: str):
+    preview.render_preview(df, key=key, css=daily_aggregate_css(df), formatters=daily_aggregate_formatters(df))
+
+
+def show_charts(df_plot, numeric_metrics):
+    if df_plot.empty: return st.info("Data tidak cukup untuk grafik.")
+    col_a, col_b = st.columns(2)
+    for idx, metric in enumerate(numeric_metrics):
+        if metric in df_plot.columns:
+            with (col_a if idx % 2 == 0 else col_b):
+                st.caption(f"**{metric}**")
+                st.line_chart(df_plot[[metric]])
+
+
+def product_daily_table(datasets: OrderedDict) -> pd.DataFrame:
+    # Tabel panjang (Produk, date, metrik...) = isi semua sheet per produk di laporan dailycompare
+    frames = []
+    for date_key, df in datasets.items():
+        parsed = pd.to_datetime(str(date_key).split('~')[0].strip(), errors='coerce')
+        if pd.notna(parsed):
+            d = df.copy()
+            d['date'] = pd.to_datetime(parsed)
+            frames.append(d)
+    if not frames: return pd.DataFrame()
+
+    concat = pd.concat(frames, ignore_index=True, sort=False)
+    if 'Produk' not in concat.columns: return pd.DataFrame()
+
+    numeric_metrics = [c for c in ALLOWED_METRICS if c in concat.columns and c not in ('ID', 'Produk', 'Status')]
+    return concat.groupby(['Produk', 'date'], observed=True)[numeric_metrics].sum().reset_index().sort_values(['Produk', 'date'])
+
+
+def period_index(product_table: pd.DataFrame) -> prefix_index.PrefixIndex:
+    # Metrik rasio/persen tidak bisa dijumlah antar hari, jadi hanya metrik aditif yang diindeks
+    metrics = [c for c in product_table.columns if c not in ('Produk', 'date')
+               and not any(k in c.lower() for k in PERCENT_NAME_KEYWORDS)]
+    return prefix_index.PrefixIndex(product_table, 'Produk', 'date', metrics)
+
+
+PERIOD_PRESETS = {"7 hari terakhir vs 7 hari sebelumnya": ("hari", 7), "14 hari terakhir vs 14 hari sebelumnya": ("hari", 14),
+                  "Bulan ini vs bulan lalu (tanggal yang sama)": ("bulan", 0), "Pilih sendiri": ("custom", 0)}
+
+
+def render_period_comparison(index: prefix_index.PrefixIndex):
+    st.subheader("📅 Bandingkan Periode")
+    if not index.metrics:
+        return st.info("Tidak ada metrik yang bisa dijumlahkan untuk dibandingkan.")
+    col_p, col_m, col_n = st.columns([2, 1, 1])
+    with col_p: preset = st.selectbox("Periode", list(PERIOD_PRESETS), key="tiktok_period_preset")
+    with col_m: metric = st.selectbox("Urutkan top movers menurut", index.metrics,
+                                      index=index.metrics.index("GMV") if "GMV" in index.metrics else 0, key="tiktok_period_metric")
+    with col_n: top_n = int(st.number_input("Jumlah top movers", min_value=1, max_value=100, value=10, key="tiktok_period_top_n"))
+
+    kind, days = PERIOD_PRESETS[preset]
+    if kind == "custom":
+        col_a, col_b = st.columns(2)
+        with col_a: cur = st.date_input("Periode ini", value=(index.end - timedelta(days=6), index.end), key="tiktok_period_cur")
+        with col_b: prev = st.date_input("Dibandingkan dengan", value=(index.end - timedelta(days=13), index.end - timedelta(days=7)), key="tiktok_period_prev")
+        if len(cur) != 2 or len(prev) != 2:
+            return st.info("Pilih tanggal awal dan akhir untuk kedua periode.")
+    else:
+        cur, prev = prefix_index.preset_windows(kind, index.end, days)
+
+    hari_ini, hari_lalu = index.days_with_data(cur), index.days_with_data(prev)
+    st.caption(f"Periode ini: {cur[0]:%d %b %Y} – {cur[1]:%d %b %Y} ({hari_ini} hari ada data) · "
+               f"Dibandingkan: {prev[0]:%d %b %Y} – {prev[1]:%d %b %Y} ({hari_lalu} hari ada data)")
+    if hari_ini != hari_lalu:
+        st.warning("⚠️ Jumlah hari yang ada datanya berbeda antar periode, selisih total bisa bias. Upload tanggal yang bolong untuk perbandingan yang adil.")
+
+    a, b = index.totals(cur).sum(axis=0), index.totals(prev).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(b != 0, (a - b) / np.abs(b), np.nan)
+    total = pd.DataFrame({"Periode ini": a, "Sebelumnya": b, "Δ": a - b, "Δ%": pct}, index=pd.Index(index.metrics, name="Metrik"))
+    st.dataframe(total.style.format({"Periode ini": "{:,.0f}", "Sebelumnya": "{:,.0f}", "Δ": "{:+,.0f}", "Δ%": "{:+.1%}"}, na_rep="-"),
+                 use_container_width=True)
+
+    naik, turun = index.top_movers(cur, prev, metric, top_n)
+    show_cols = [f"{metric} (ini)", f"{metric} (lalu)", f"Δ {metric}", f"Δ% {metric}"]
+    fmt = {show_cols[0]: "{:,.0f}", show_cols[1]: "{:,.0f}", show_cols[2]: "{:+,.0f}", show_cols[3]: "{:+.1%}"}
+    col_up, col_down = st.columns(2)
+    with col_up:
+        st.markdown(f"**🚀 Naik terbesar ({metric})**")
+        st.dataframe(naik[show_cols].style.format(fmt, na_rep="baru"), use_container_width=True)
+    with col_down:
+        st.markdown(f"**📉 Turun terbesar ({metric})**")
+        st.dataframe(turun[show_cols].style.format(fmt, na_rep="-"), use_container_width=True)
+
+    semua = index.compare(cur, prev).sort_values(f"Δ {metric}", ascending=False).reset_index()
+    st.download_button("📥 Download perbandingan semua produk (CSV)", exporter.csv_bytes(semua), key="tiktok_period_dl",
+                       **exporter.csv_download_args(f"perbandingan_{cur[0]:%Y%m%d}_{cur[1]:%Y%m%d}_vs_{prev[0]:%Y%m%d}_{prev[1]:%Y%m%d}", False))
+
+
+ANOMALY_DIRECTIONS = {"Semua": None, "Turun saja": "turun", "Naik saja": "naik"}
+ANOMALY_EXPORT_ROWS = 5000
+
+
+def anomaly_scan(product_table: pd.DataFrame, method: str, window: int) -> anomaly.AnomalyScan:
+    metrics = [c for c in product_table.columns if c not in ('Produk', 'date')]
+    return anomaly.AnomalyScan(product_table, 'Produk', 'date', metrics, window=window, method=method)
+
+
+def render_anomalies(product_table: pd.DataFrame, sig, tracker: perf.PerfTracker):
+    st.subheader("🚨 Deteksi Anomali")
+    st.caption("Nilai tiap produk × metrik per hari dibandingkan dengan baseline beberapa hari sebelumnya. "
+               "Skor z besar = penyimpangan jauh dari kebiasaan produk itu sendiri.")
+    col_m, col_w, col_t, col_d = st.columns(4)
+    with col_m: method = st.selectbox("Metode", list(anomaly.METHODS), format_func=anomaly.METHODS.get, key="tiktok_anomaly_method")
+    with col_w: window = int(st.number_input("Baseline (hari)", min_value=3, max_value=28, value=7, key="tiktok_anomaly_window"))
+    with col_t: threshold = float(st.number_input("Ambang |z|", min_value=1.0, max_value=20.0, value=3.5, step=0.5, key="tiktok_anomaly_threshold"))
+    with col_d: arah = st.selectbox("Arah", list(ANOMALY_DIRECTIONS), key="tiktok_anomaly_direction")
+    latest_only = st.checkbox("Hanya tanggal terakhir", value=True, key="tiktok_anomaly_latest")
+
+    # Kubus & skor z dihitung sekali per isi cache + metode + panjang baseline; filter lain hanya menyaring hasilnya
+    scan_sig = (sig, method, window)
+    if st.session_state.get("tiktok_anomaly_sig") != scan_sig:
+        with tracker.stage(f"anomali {method} (produk × hari × metrik)", rows=len(product_table)):
+            st.session_state["tiktok_anomaly_scan"] = anomaly_scan(product_table, method, window)
+        st.session_state["tiktok_anomaly_sig"] = scan_sig
+    scan = st.session_state["tiktok_anomaly_scan"]
+    if len(scan.dates) <= scan.min_periods:
+        return st.info(f"Butuh data lebih dari {scan.min_periods} hari untuk membentuk baseline.")
+
+    alerts = scan.alerts(threshold, latest_only, ANOMALY_DIRECTIONS[arah])
+    if alerts.empty:
+        return st.success("Tidak ada anomali dengan pengaturan ini. ✅")
+    st.caption(f"{len(alerts):,} anomali · {alerts['Produk'].nunique():,} produk · "
+               f"{(alerts['Arah'] == 'turun').sum():,} turun, {(alerts['Arah'] == 'naik').sum():,} naik")
+    warna = alerts["Arah"].map({k: f"background-color: #{xlstyle.STYLES[k]['bg']}" for k in ("naik", "turun")})
+    css = pd.DataFrame(np.repeat(warna.to_numpy(dtype=object)[:, None], len(alerts.columns), axis=1),
+                       index=alerts.index, columns=alerts.columns)
+    preview.render_preview(alerts, key="tiktok_anomaly_preview", css=css, hide_index=True, formatters={
+        "Tanggal": lambda x: f"{x:%Y-%m-%d}", "Nilai": lambda x: f"{x:,.2f}", "Baseline": lambda x: f"{x:,.2f}",
+        "Perubahan %": lambda x: f"{x:+.1%}" if pd.notna(x) else "-", "Skor z": lambda x: f"{x:+.1f}"})
+
+    export = alerts.head(ANOMALY_EXPORT_ROWS)
+    if len(alerts) > ANOMALY_EXPORT_ROWS:
+        st.caption(f"Export Excel memuat {ANOMALY_EXPORT_ROWS:,} anomali teratas (|z| terbesar).")
+    export_sig = (scan_sig, threshold, latest_only, arah)
+    if st.session_state.get("tiktok_anomaly_export_sig") != export_sig:
+        percent = tuple(m for m in scan.metrics if any(k in m.lower() for k in PERCENT_NAME_KEYWORDS))
+        with tracker.stage("export anomali (xlsx)", rows=len(export)):
+            st.session_state["tiktok_anomaly_export"] = scan.workbook(export, percent)
+        st.session_state["tiktok_anomaly_export_sig"] = export_sig
+    last = scan.dates[-1]
+    st.download_button("📥 Download Anomali (Excel, sel ditandai)", st.session_state["tiktok_anomaly_export"],
+                       file_name=f"anomali_{last:%Y%m%d}.xlsx", mime=exporter.XLSX_MIME, key="tiktok_anomaly_dl")
+
+
+def rate_metrics(columns) -> list:
+    return [c for c in columns if any(k in str(c).lower() for k in PERCENT_NAME_KEYWORDS)]
+
+
+def period_rollups(summaries: rollup.DailySummaries) -> dict:
+    # Rollup minggu ISO & bulan untuk keseluruhan dan per produk, dari ringkasan harian (semua tanggal tersimpan)
+    totals, table = summaries.daily_totals(), summaries.entity_table()
+    out = {}
+    for label, freq in rollup.FREQS.items():
+        out[("Keseluruhan", label)] = rollup.rollup(totals, freq, rate_metrics(totals.columns))
+        out[("Produk", label)] = rollup.rollup(table, freq, rate_metrics(table.columns), by='Produk')
+    return out
+
+
+ROLLUP_SHEETS = {("Keseluruhan", "Mingguan"): "ROLLUP MINGGUAN", ("Keseluruhan", "Bulanan"): "ROLLUP BULANAN",
+                 ("Produk", "Mingguan"): "PRODUK MINGGUAN", ("Produk", "Bulanan"): "PRODUK BULANAN"}
+
+
+def show_rollup(rollups: dict, scope: str, key: str, produk=None):
+    freq = st.radio("Periode", list(rollup.FREQS), horizontal=True, key=f"{key}_freq")
+    df = rollups[(scope, freq)]
+    if produk is not None and not df.empty:
+        df = df[df['Produk'] == produk].drop(columns='Produk')
+    if df.empty: return st.info("Belum ada data untuk rollup.")
+    bolong = df[rollup.COL_HARI_DATA] < df[rollup.COL_HARI]
+    if bolong.any():
+        st.caption(f"⚠️ {int(bolong.sum())} periode tidak lengkap (hari ada data < hari dalam periode). "
+                   "Kolom '/ hari' dan metrik rasio dirata-rata hanya atas hari yang ada datanya.")
+    preview.render_preview(df, key=key, formatters=daily_aggregate_formatters(df.drop(columns=[
+        rollup.COL_PERIODE, rollup.COL_MULAI, rollup.COL_SELESAI])), hide_index=True)
+
+
+def write_rollup_sheets(writer, rollups: dict, styles: xlstyle.OpenpyxlStyles):
+    for scope_freq, sheet in ROLLUP_SHEETS.items():
+        df = rollups.get(scope_freq)
+        if df is None or df.empty: continue
+        df.to_excel(writer, sheet_name=sheet, index=False)
+        ws = writer.book[sheet]
+        exporter.autofit(ws, df, min_width=10)
+        rates = set(rate_metrics(df.columns))
+        for col_idx, col in enumerate(df.columns, start=1):
+            if col in (rollup.COL_MULAI, rollup.COL_SELESAI):
+                styles.apply_range(ws, "tanggal", min_col=col_idx, max_col=col_idx)
+            elif pd.api.types.is_float_dtype(df[col]):
+                styles.apply_range(ws, "persen" if col in rates else "ribuan", min_col=col_idx, max_col=col_idx)
+
+
+def build_product_sheets(datasets: OrderedDict, table: pd.DataFrame = None, rollups: dict = None) -> bytes:
+    if table is None: table = product_daily_table(datasets)
+    if table.empty: return None
+
+    bytes_io = exporter.spooled_file()
+    styles = xlstyle.OpenpyxlStyles()
+    green_fill, red_fill = xlstyle.pattern_fill(xlstyle.STYLES["naik"]["bg"]), xlstyle.pattern_fill(xlstyle.STYLES["turun"]["bg"])
+    with pd.ExcelWriter(bytes_io, engine='openpyxl') as writer:
+        if rollups: write_rollup_sheets(writer, rollups, styles)
+        for product_name, grp in table.groupby('Produk', observed=True):
+            row = grp.drop(columns='Produk').reset_index(drop=True)
+            safe_sheet_name = str(product_name)[:31] if product_name else 'Unknown'
+            row.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+            ws = writer.book[safe_sheet_name]
+
+            exporter.autofit(ws, row, min_width=12)
+            styles.apply_range(ws, "tanggal", max_col=1)
+
+            from openpyxl.formatting.rule import FormulaRule
+            from openpyxl.chart import LineChart, Reference
+
+
+            for col_idx in range(2, ws.max_column + 1):
+                col_name = str(ws.cell(row=1, column=col_idx).value).lower()
+                col_letter = ws.cell(row=1, column=col_idx).column_letter
+                is_percent = any(k in col_name for k in PERCENT_NAME_KEYWORDS)
+                styles.apply_range(ws, "persen" if is_percent else "ribuan", min_col=col_idx, max_col=col_idx)
+                if ws.max_row >= 3:
+                    cf_range = f"{col_letter}3:{col_letter}{ws.max_row}"
+                    ws.conditional_formatting.add(cf_range, FormulaRule(formula=[f"{col_letter}3>{col_letter}2"], fill=green_fill))
+                    ws.conditional_formatting.add(cf_range, FormulaRule(formula=[f"{col_letter}3<{col_letter}2"], fill=red_fill))
+
+            if ws.max_row >= 2:
+                start_chart_row, chart_idx = ws.max_row + 3, 0
+                for col_idx in range(2, ws.max_column + 1):
+                    chart = LineChart()
+                    chart.title = ws.cell(row=1, column=col_idx).value
+                    chart.style, chart.width, chart.height, chart.legend = 13, 16, 8, None
+                    chart.add_data(Reference(ws, min_col=col_idx, min_row=1, max_row=ws.max_row), titles_from_data=True)
+                    chart.set_categories(Reference(ws, min_col=1, min_row=2, max_row=ws.max_row))
+                    ws.add_chart(chart, f"{'A' if chart_idx % 2 == 0 else 'I'}{start_chart_row + (chart_idx // 2) * 16}")
+                    chart_idx += 1
+
+    return exporter.read_bytes(bytes_io)
+
+
+def product_sheets_job(ctx, table: pd.DataFrame, outname: str, rollups: dict = None):
+    # Job latar belakang (lihat jobs.py): workbook (rollup minggu/bulan +) 1 sheet per produk + Parquet tabel produk × tanggal
+    ctx.progress(0.1, f"Menulis {table['Produk'].nunique()} sheet produk...")
+    with ctx.tracker.stage("export xlsx per produk", rows=len(table)):
+        excel_bytes = build_product_sheets(None, table, rollups)
+    ctx.add_file(outname, excel_bytes, exporter.XLSX_MIME, "Download Excel Laporan (1 Sheet per Produk + Grafik)")
+    ctx.progress(0.9, "Menulis Parquet...")
+    with ctx.tracker.stage("export parquet per produk", rows=len(table)):
+        ctx.add_file(outname.replace(".xlsx", ".parquet"), exporter.parquet_bytes(table), exporter.PARQUET_MIME,
+                     "Download Parquet (Produk × Tanggal)")
+
+
+# NAVBAR MINI TIKTOK (Halaman disederhanakan)
+PAGES_TIKTOK = ["Fitur Utama", "Daily Ads Comparator"]
+
+
+def render():
+    st.title("🎵 Excel Tools — TikTok")
+
+    if "page_tiktok" not in st.session_state:
+        st.session_state.page_tiktok = PAGES_TIKTOK[0]
+        
+    # --- INISIALISASI KEY DINAMIS UNTUK RESET UPLOADER ---
+    if "tiktok_uploader_key" not in st.session_state:
+        st.session_state["tiktok_uploader_key"] = 0
+
+    cols = st.columns(len(PAGES_TIKTOK), gap="small")
+    for i, p in enumerate(PAGES_TIKTOK):
+        with cols[i]:
+            if st.button(p, key=f"tiktok_nav_{i}"):
+                st.session_state.page_tiktok = p
+    st.markdown("---")
+
+    # =========================================================================
+    # HALAMAN 1: GABUNGAN EXCEL FIXER & PEWARNAAN ROI
+    # =========================================================================
+    if st.session_state.page_tiktok == "Fitur Utama":
+        st.header("🛠️ Excel Fixer & Pewarnaan ROI")
+        st.markdown("Mengamankan **ID Campaign**, mengubah koma `,` menjadi titik `.`, dengan opsi pewarnaan ROI.")
+
+        uploaded_file = st.file_uploader("Upload File Excel (.xlsx / .xls)", type=["xlsx", "xls"], key="uploader_merged_tiktok")
+
+        if uploaded_file:
+            # Switch Pewarnaan ROI
+            use_roi_color = st.toggle("🎨 Aktifkan Pewarnaan ROI", value=False, help="Jika aktif, baris dengan ROI tinggi/rendah akan diberi warna.")
+
+            if st.button("🚀 Proses & Download", key="process_merged_tiktok"):
+                # Diproses di job latar belakang: sesi tetap responsif & hasil bertahan saat rerun
+                jobs.enqueue(
+                    "tiktok_fixer", f"TikTok Fixer — {uploaded_file.name}", tiktok_fixer_job,
+                    file_bytes=uploaded_file.getvalue(), file_name=uploaded_file.name, use_roi_color=use_roi_color,
+                )
+
+        jobs.render_jobs("tiktok_fixer", key="tiktok_fixer_jobs")
+
+
+    # =========================================================================
+    # HALAMAN 2: DAILY ADS COMPARATOR
+    # =========================================================================
+    elif st.session_state.page_tiktok == "Daily Ads Comparator":
+        st.header("Ads Performance Comparator — DAILY FOCUS")
+        st.markdown("""
+        Upload TikTok exports per hari (header row 3, data row 4). Cache akan otomatis menyimpan dan menggabungkan datanya.
+        """)
+
+        tracker = perf.PerfTracker("tiktok_daily_comparator")
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            # --- MENGGUNAKAN KEY DINAMIS AGAR BISA DIRESET ---
+            uploaded_files = st.file_uploader(
+                "Upload TikTok exports (Excel .xlsx)", 
+                type=["xlsx"], 
+                accept_multiple_files=True, 
+                key=f"tiktok_daily_uploader_{st.session_state['tiktok_uploader_key']}"
+            )
+            
+            sukses_tanggal = [] 
+            # File yang sudah masuk cache tidak dibaca ulang di setiap rerun (uploader tetap memegang file)
+            loaded = st.session_state.setdefault("tiktok_daily_loaded", set())
+            if uploaded_files:
+                for uploaded in uploaded_files:
+                    if uploaded.file_id in loaded: continue
+                    with tracker.stage(f"load & normalize {uploaded.name}") as rec:
+                        uploaded_bytes = uploaded.read()
+                        df_daily, meta = upload_cache.frame_with_meta("tiktok_daily", uploaded_bytes,
+                                                                      lambda: load_daily_export(uploaded_bytes))
+                        date_val = meta.get("date")
+                        rec["rows"] = meta.get("raw_rows", 0)
+                    if not date_val:
+                        st.error(f"Gagal ekstrak tanggal dari file: {uploaded.name}")
+                    else:
+                        if not meta.get("raw_rows"):
+                            st.error(f"Gagal baca data tabel: {uploaded.name}")
+                        else:
+                            add_to_session_cache(date_val, df_daily)
+                            lake.save("tiktok_daily", df_daily, date_val, uploaded.name,
+                                      signature=upload_cache.content_key("tiktok_daily", uploaded_bytes))
+                            loaded.add(uploaded.file_id)
+                            sukses_tanggal.append(str(date_val))
+            if sukses_tanggal:
+                st.success(f"Berhasil menyimpan {len(sukses_tanggal)} dataset untuk tanggal: {', '.join(sukses_tanggal)}")
+
+        with col2:
+            cache = session_cache()
+            policy = st.radio("Jika cache penuh, buang", list(frame_cache.POLICIES), horizontal=True,
+                              index=list(frame_cache.POLICIES).index(cache.policy), key="tiktok_daily_policy",
+                              format_func={"lru": "paling lama tidak dipakai (LRU)", "oldest": "tanggal paling tua"}.get)
+            if policy != cache.policy:
+                cache.set_policy(policy)
+            if cache.evictions:
+                st.warning("⚠️ Cache melewati budget memori "
+                           f"({cache.budget_bytes / 1e6:,.0f} MB), tanggal berikut dibuang — upload ulang jika masih dibutuhkan: "
+                           + ", ".join(f"{e['key']} ({e['rows']:,} baris, {e['mem_bytes'] / 1e6:,.1f} MB)" for e in cache.evictions))
+                if st.button("Tutup peringatan", key="tiktok_daily_btn_evict_ok"):
+                    cache.evictions.clear()
+                    st.rerun()
+            if not len(cache):
+                st.info("Cache kosong.")
+            else:
+                st.write("**Datasets in cache**")
+                st.table(cache.summary().rename(columns={"key": "date"}).set_index('date'))
+                st.caption(f"Memori: {cache.used_bytes / 1e6:,.1f} / {cache.budget_bytes / 1e6:,.0f} MB "
+                           f"(tersimpan terkompresi {cache.stored_bytes / 1e6:,.1f} MB)")
+                to_remove = st.selectbox("Hapus tanggal (pilih)", [""] + cache.keys(), key="tiktok_daily_remove")
+                
+                # --- MENAMBAHKAN INCREMENT KEY SAAT HAPUS ---
+                if to_remove and st.button("Hapus tanggal", key="tiktok_daily_btn_rem"):
+                    remove_date_from_cache(to_remove)
+                    st.session_state["tiktok_uploader_key"] += 1 # Reset Uploader UI
+                    st.rerun()
+                    
+                # --- MENAMBAHKAN INCREMENT KEY SAAT CLEAR ALL ---
+                if st.button("Clear all cache", key="tiktok_daily_btn_clr"):
+                    clear_cache()
+                    st.session_state["tiktok_uploader_key"] += 1 # Reset Uploader UI
+                    st.rerun()
+
+        st.markdown("---")
+        date_keys = cache.keys()
+        if not date_keys:
+            tracker.render()
+            st.stop()
+
+        valid_dates = [pd.to_datetime(str(k).split('~')[0].strip(), errors='coerce').date() for k in date_keys]
+        valid_dates = sorted([d for d in valid_dates if pd.notna(d)])
+        
+        # Penamaan File Download
+        if len(valid_dates) >= 1:
+            start_date_str = valid_dates[0].strftime("%Y%m%d")
+            end_date_str = valid_dates[-1].strftime("%Y%m%d")
+            outname_compare = f"dailycompare_{start_date_str}_to_{end_date_str}.xlsx"
+        else:
+            outname_compare = "dailycompare_report.xlsx"
+
+        if len(valid_dates) > 1:
+            expected_days = (valid_dates[-1] - valid_dates[0]).days + 1
+            if len(valid_dates) < expected_days:
+                expected_set = {valid_dates[0] + pd.Timedelta(days=i) for i in range(expected_days)}
+                missing_str = ", ".join([d.strftime("%Y-%m-%d") for d in sorted(expected_set - set(valid_dates))])
+                st.warning(f"⚠️ **Peringatan Data Bolong!** Ada tanggal yang terlewat: {missing_str}")
+
+        st.subheader("📥 Export Laporan Akhir")
+        # Workbook per produk (+ grafik) dibuat di job latar belakang, otomatis setiap kali isi cache berubah
+        # Ringkasan per tanggal dihitung sekali saat tanggal baru masuk; tabel produk × tanggal & rollup dirakit darinya
+        with tracker.stage("ringkasan harian (tanggal baru)") as rec:
+            rec["rows"] = sync_summaries(cache)
+        summaries = daily_summaries()
+        with tracker.stage("tabel produk × tanggal", rows=len(summaries)):
+            product_table = summaries.entity_table(date_keys)
+            metric_cols = [c for c in product_table.columns if c not in ('Produk', 'date')]
+            if metric_cols: product_table[metric_cols] = product_table[metric_cols].fillna(0)
+        if st.session_state.get("tiktok_rollup_version") != summaries.version:
+            with tracker.stage("rollup minggu & bulan", rows=len(summaries)):
+                st.session_state["tiktok_rollups"] = period_rollups(summaries)
+            st.session_state["tiktok_rollup_version"] = summaries.version
+        rollups = st.session_state["tiktok_rollups"]
+
+        if product_table.empty:
+            st.info("Unggah file yang memiliki kolom Produk untuk membuat format Excel per-sheet.")
+        else:
+            export_sig = (outname_compare, tuple(cache.rows().items()), summaries.version)
+            if st.session_state.get("tiktok_daily_export_sig") != export_sig:
+                st.session_state["tiktok_daily_export_sig"] = export_sig
+                jobs.enqueue("tiktok_daily", f"Daily compare — {len(date_keys)} hari", product_sheets_job,
+                             table=product_table, outname=outname_compare, rollups=rollups)
+            jobs.render_jobs("tiktok_daily", key="tiktok_daily_jobs", title="🧵 Excel Laporan (Rollup + 1 Sheet per Produk + Grafik)", limit=3)
+
+            # Indeks prefix-sum dibangun sekali per isi cache, lalu dipakai untuk semua rentang & ranking
+            if st.session_state.get("tiktok_period_index_sig") != export_sig:
+                with tracker.stage("indeks prefix-sum produk × tanggal", rows=len(product_table)):
+                    st.session_state["tiktok_period_index"] = period_index(product_table)
+                st.session_state["tiktok_period_index_sig"] = export_sig
+            st.markdown("---")
+            render_period_comparison(st.session_state["tiktok_period_index"])
+            st.markdown("---")
+            render_anomalies(product_table, export_sig, tracker)
+
+        st.markdown("---")
+        
+        # Tab keseluruhan & per produk dirakit dari ringkasan harian (bukan dari concat semua frame mentah)
+        with tracker.stage("aggregate harian", rows=len(date_keys)) as rec:
+            agg = summaries.daily_totals(date_keys)
+            if not agg.empty: agg.index = agg.index.date
+            rec["rows"] = len(agg)
+        numeric_metrics = [c for c in ALLOWED_METRICS if c in agg.columns and c not in ('ID', 'Produk', 'Status')]
+        with tracker.stage("aggregate per produk", rows=len(product_table)):
+            per_produk = {}
+            if not product_table.empty:
+                metrics_produk = [c for c in numeric_metrics if c in product_table.columns]
+                grouped = product_table.groupby(['Produk', 'date'], observed=True)[metrics_produk].sum()
+                per_produk = {p: g.droplevel('Produk') for p, g in grouped.groupby(level='Produk', observed=True)
+                              if str(p).strip() not in ('nan', '', 'None')}
+        daftar_produk = sorted(per_produk)
+
+        tabs = st.tabs(["📊 Keseluruhan (All)"] + [f"🛍️ {p[:20]}..." if len(p) > 20 else f"🛍️ {p}" for p in daftar_produk])
+        
+        with tabs[0]:
+            if agg.empty: st.warning("Tidak ada data numerik.")
+            else:
+                sub1, sub2, sub3 = st.tabs(["🧮 Tabel Data", "📈 Grafik Tren", "📆 Mingguan & Bulanan"])
+                with sub1:
+                    show_daily_table(agg, key="tiktok_daily_all")
+                    gzip_csv = st.checkbox("Kompres CSV (.csv.gz)", key="tiktok_daily_csv_gzip")
+                    st.download_button("📥 Download CSV (All)", exporter.csv_bytes(agg.reset_index(), compress=gzip_csv),
+                                       key="tiktok_daily_dl_csv", **exporter.csv_download_args("daily_aggregate_all", gzip_csv))
+                with sub2: show_charts(agg, numeric_metrics)
+                with sub3:
+                    if len(summaries) > len(date_keys):
+                        st.caption(f"Rollup mencakup {len(summaries)} tanggal, termasuk tanggal yang sudah dibuang dari cache.")
+                    show_rollup(rollups, "Keseluruhan", key="tiktok_rollup_all")
+
+        with tracker.stage("render per produk", rows=len(daftar_produk)):
+            for i, produk_name in enumerate(daftar_produk):
+                with tabs[i + 1]:
+                    agg_produk = per_produk[produk_name]
+                    agg_produk.index = agg_produk.index.date
+                    sub1, sub2, sub3 = st.tabs(["🧮 Tabel Data", "📈 Grafik Tren", "📆 Mingguan & Bulanan"])
+                    with sub1: show_daily_table(agg_produk, key=f"tiktok_daily_prod_{i}")
+                    with sub2: show_charts(agg_produk, numeric_metrics)
+                    with sub3: show_rollup(rollups, "Produk", key=f"tiktok_rollup_prod_{i}", produk=produk_name)
+
+        tracker.render()
@@ -0,0 +1,94 @@
+# prefix_index.py
+# Indeks prefix-sum untuk perbandingan periode: tabel panjang (entitas, tanggal, metrik...) diubah sekali
+# menjadi array kumulatif 3-D [entitas, hari + 1, metrik] di atas sumbu tanggal harian yang kontinu.
+# Total rentang apa pun untuk semua entitas = csum[:, akhir + 1] - csum[:, awal] (O(1) per entitas),
+# jadi membandingkan dua periode dan meranking ribuan produk tidak perlu groupby ulang atas data mentah.
+# Hari tanpa upload tetap ada di sumbu (nilai 0) dan dihitung terpisah lewat days_with_data().
+
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+Window = Tuple[date, date]
+
+
+class PrefixIndex:
+    def __init__(self, table: pd.DataFrame, entity_col: str, date_col: str, metrics: List[str]):
+        self.metrics = list(metrics)
+        self.entity_col = entity_col
+        dates = pd.to_datetime(table[date_col]).dt.normalize()
+        self.start = dates.min().date() if len(table) else date.today()
+        n_days = (dates.max().date() - self.start).days + 1 if len(table) else 0
+        codes, self.entities = pd.factorize(table[entity_col], sort=True)
+        day = (dates - pd.Timestamp(self.start)).dt.days.to_numpy()
+
+        # Nilai harian diisi langsung ke csum[:, 1:] lalu dikumulatifkan di tempat (tanpa array kedua)
+        self.csum = np.zeros((len(self.entities), n_days + 1, len(self.metrics)))
+        values = table[self.metrics].to_numpy(dtype="float64", na_value=0.0)
+        np.add.at(self.csum[:, 1:], (codes, day), values)
+        np.cumsum(self.csum[:, 1:], axis=1, out=self.csum[:, 1:])
+
+        present = np.zeros(n_days + 1, dtype=np.int64)
+        present[1:][np.unique(day)] = 1
+        self.days_csum = np.cumsum(present)
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=len(self.days_csum) - 2)
+
+    def _bounds(self, window: Window) -> Tuple[int, int]:
+        # Rentang dipotong ke sumbu data; hasil = indeks [i, j) pada array kumulatif
+        n_days = len(self.days_csum) - 1
+        i = min(max((window[0] - self.start).days, 0), n_days)
+        j = min(max((window[1] - self.start).days + 1, 0), n_days)
+        return i, max(i, j)
+
+    def totals(self, window: Window) -> np.ndarray:
+        # [entitas, metrik]
+        i, j = self._bounds(window)
+        return self.csum[:, j] - self.csum[:, i]
+
+    def days_with_data(self, window: Window) -> int:
+        i, j = self._bounds(window)
+        return int(self.days_csum[j] - self.days_csum[i])
+
+    def compare(self, current: Window, previous: Window) -> pd.DataFrame:
+        # Satu baris per entitas: <metrik> (periode ini), <metrik> (sebelumnya), Δ dan Δ% per metrik
+        a, b = self.totals(current), self.totals(previous)
+        out = {}
+        for k, m in enumerate(self.metrics):
+            out[f"{m} (ini)"] = a[:, k]
+            out[f"{m} (lalu)"] = b[:, k]
+            out[f"Δ {m}"] = a[:, k] - b[:, k]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[f"Δ% {m}"] = np.where(b[:, k] != 0, (a[:, k] - b[:, k]) / np.abs(b[:, k]), np.nan)
+        return pd.DataFrame(out, index=pd.Index(self.entities, name=self.entity_col))
+
+    def top_movers(self, current: Window, previous: Window, metric: str, n: int = 10) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        # (naik terbesar, turun terbesar) menurut selisih metrik; argpartition = O(entitas), bukan sort penuh
+        k = self.metrics.index(metric)
+        delta = self.totals(current)[:, k] - self.totals(previous)[:, k]
+        n = min(n, len(delta))
+        if n == 0:
+            empty = self.compare(current, previous).iloc[0:0]
+            return empty, empty
+        up = np.argpartition(-delta, n - 1)[:n]
+        down = np.argpartition(delta, n - 1)[:n]
+        up = up[np.argsort(-delta[up])]
+        down = down[np.argsort(delta[down])]
+        table = self.compare(current, previous)
+        return table.iloc[up[delta[up] > 0]], table.iloc[down[delta[down] < 0]]
+
+
+def preset_windows(preset: str, end: date, days: int = 7) -> Tuple[Window, Window]:
+    # "hari": N hari terakhir vs N hari sebelumnya; "bulan": bulan berjalan (s.d. end) vs periode yang sama bulan lalu
+    if preset == "bulan":
+        cur_start = end.replace(day=1)
+        prev_end_month = cur_start - timedelta(days=1)
+        prev_start = prev_end_month.replace(day=1)
+        prev_end = prev_start + timedelta(days=min((end - cur_start).days, (prev_end_month - prev_start).days))
+        return (cur_start, end), (prev_start, prev_end)
+    cur = (end - timedelta(days=days - 1), end)
+    return cur, (cur[0] - timedelta(days=days), cur[0] - timedelta(days=1))
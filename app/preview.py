@@ -0,0 +1,75 @@
+# preview.py
+# Preview tabel yang ringan untuk upload besar:
+# - highlight dihitung sekali sebagai frame CSS (vektor, tanpa loop per sel),
+# - baris dipaginasi sehingga hanya satu jendela yang dikirim ke browser,
+# - Styler (format + warna) hanya dibuat untuk jendela yang sedang terlihat.
+# Styling penuh tetap dilakukan di export Excel.
+
+import math
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import config
+
+
+def empty_css(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame("", index=df.index, columns=df.columns)
+
+
+def paint(css: pd.DataFrame, mask, style: str, columns=None) -> pd.DataFrame:
+    # mask boleh Series per baris (diwarnai di semua kolom `columns`) atau DataFrame boolean per sel.
+    if isinstance(mask, pd.DataFrame):
+        mask = mask.reindex(index=css.index, columns=css.columns, fill_value=False).fillna(False).astype(bool)
+        css[:] = np.where(mask.to_numpy(), style, css.to_numpy())
+        return css
+    cols = list(css.columns) if columns is None else [c for c in columns if c in css.columns]
+    if not cols:
+        return css
+    row_mask = pd.Series(mask, index=css.index).fillna(False).astype(bool).to_numpy()
+    for c in cols:
+        css[c] = np.where(row_mask, style, css[c].to_numpy())
+    return css
+
+
+def numeric(df: pd.DataFrame, col) -> pd.Series:
+    return pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(np.nan, index=df.index)
+
+
+def render_preview(
+    df: pd.DataFrame,
+    key: str,
+    css: Optional[pd.DataFrame] = None,
+    formatters: Optional[Dict[str, Callable]] = None,
+    page_size: Optional[int] = None,
+    hide_index: Optional[bool] = None,
+):
+    page_size = page_size or config.PREVIEW_PAGE_SIZE
+    n_rows = len(df)
+    n_pages = max(1, math.ceil(n_rows / page_size))
+
+    page = 1
+    if n_pages > 1:
+        col_page, col_info = st.columns([1, 3])
+        with col_page:
+            page = st.number_input("Halaman", min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page")
+        start = (int(page) - 1) * page_size
+        with col_info:
+            st.caption(f"Menampilkan baris {start + 1:,}–{min(start + page_size, n_rows):,} dari {n_rows:,} ({n_pages:,} halaman)")
+
+    start = (int(page) - 1) * page_size
+    window = df.iloc[start:start + page_size]
+
+    if css is None and not formatters:
+        st.dataframe(window, use_container_width=True, hide_index=hide_index)
+        return
+
+    styler = window.style
+    if formatters:
+        styler = styler.format({c: f for c, f in formatters.items() if c in window.columns})
+    if css is not None:
+        win_css = css.iloc[start:start + page_size]
+        styler = styler.apply(lambda _: win_css, axis=None)
+    st.dataframe(styler, use_container_width=True, hide_index=hide_index)
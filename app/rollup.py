@@ -0,0 +1,128 @@
+# rollup.py
+# Ringkasan periode (minggu ISO / bulan) untuk laporan harian.
+#
+# DailySummaries menyimpan ringkasan kecil per tanggal (total per entitas + total keseluruhan) yang dihitung
+# sekali saat tanggal itu pertama kali terlihat. Rollup berikutnya cukup me-resample tabel ringkasan ini,
+# tanpa membuka & menggabungkan ulang semua data mentah harian. Ringkasan juga tetap ada walau frame mentah
+# tanggal tersebut sudah dibuang dari cache karena budget memori, sehingga rentang panjang tetap bisa dilaporkan.
+#
+# Rata-rata sadar-bolong: total periode dibagi jumlah hari yang ADA datanya (bukan jumlah hari kalender),
+# dan metrik rasio dirata-rata hanya atas hari yang ada datanya. Jumlah hari kalender vs hari ada data
+# ditampilkan per periode agar periode yang bolong/terpotong terlihat.
+
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# label UI -> frekuensi pandas (minggu ISO mulai Senin, bulan mulai tanggal 1)
+FREQS = {"Mingguan": "W-MON", "Bulanan": "MS"}
+COL_PERIODE, COL_MULAI, COL_SELESAI = "Periode", "Mulai", "Selesai"
+COL_HARI, COL_HARI_DATA = "Hari dalam periode", "Hari ada data"
+PER_HARI = " / hari"
+
+
+class DailySummaries:
+    def __init__(self, entity_col: str):
+        self.entity_col = entity_col
+        self._days: Dict[str, dict] = {}
+        self.rates = set()
+        self.version = 0  # naik setiap isi berubah; dipakai pemanggil sebagai kunci cache rollup
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._days
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def add(self, key, date, df: pd.DataFrame, metrics: Iterable[str], rates: Iterable[str] = ()):
+        # Satu tanggal: jumlah per entitas dan total keseluruhan (termasuk baris tanpa nama entitas).
+        # Metrik rasio tidak bisa dijumlah antar baris, jadi total keseluruhannya = rata-rata baris.
+        cols = [c for c in metrics if c in df.columns and pd.api.types.is_numeric_dtype(df[c])]
+        date = pd.Timestamp(date).normalize()
+        per_entity = pd.DataFrame()
+        if self.entity_col in df.columns:
+            per_entity = df.groupby(self.entity_col, observed=True)[cols].sum().reset_index()
+            per_entity.insert(1, "date", date)
+        rates = [c for c in cols if c in set(rates)]
+        self.rates.update(rates)
+        total = pd.concat([df[[c for c in cols if c not in rates]].sum(axis=0), df[rates].mean(axis=0)]).to_frame().T[cols]
+        total.insert(0, "date", date)
+        self._days[str(key)] = {"date": date, "entity": per_entity, "total": total}
+        self.version += 1
+
+    def drop(self, key):
+        if self._days.pop(str(key), None) is not None:
+            self.version += 1
+
+    def clear(self):
+        self._days.clear()
+        self.version += 1
+
+    def keys(self) -> List[str]:
+        return list(self._days)
+
+    def _concat(self, part: str, keys: Optional[Iterable[str]]) -> pd.DataFrame:
+        keys = self._days if keys is None else [str(k) for k in keys if str(k) in self._days]
+        frames = [self._days[k][part] for k in keys if not self._days[k][part].empty]
+        return pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+
+    def entity_table(self, keys: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        # Tabel panjang (entitas, date, metrik...) untuk tanggal terpilih (default: semua yang tersimpan)
+        table = self._concat("entity", keys)
+        if table.empty: return table
+        return table.sort_values([self.entity_col, "date"], kind="stable").reset_index(drop=True)
+
+    def daily_totals(self, keys: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        # Satu baris per tanggal, index = tanggal (DatetimeIndex); tanggal ganda (mis. "tgl ~ 2") digabung
+        table = self._concat("total", keys)
+        if table.empty: return table
+        agg = {c: "mean" if c in self.rates else "sum" for c in table.columns if c != "date"}
+        return table.groupby("date").agg(agg).sort_index()
+
+
+def _period_frame(sums: pd.DataFrame, means: pd.DataFrame, freq: str, additive: List[str], rates: List[str]) -> pd.DataFrame:
+    # sums/means ber-index periode (level terakhir = awal periode) -> tabel rollup siap tampil
+    start = sums.index.get_level_values(-1)
+    offset = pd.tseries.frequencies.to_offset(freq)
+    end = start + offset - pd.Timedelta(days=1)
+    if freq == FREQS["Mingguan"]:
+        iso = start.isocalendar()
+        label = [f"{y}-W{w:02d}" for y, w in zip(iso["year"], iso["week"])]
+    else:
+        label = start.strftime("%Y-%m").tolist()
+
+    out = sums.index.to_frame(index=False).iloc[:, :-1]
+    out[COL_PERIODE] = label
+    out[COL_MULAI] = start.date
+    out[COL_SELESAI] = end.date
+    out[COL_HARI] = (end - start).days + 1
+    out[COL_HARI_DATA] = sums[COL_HARI_DATA].to_numpy()
+    for m in additive + rates:
+        if m in rates:
+            out[m] = means[m].to_numpy()
+        else:
+            out[m] = sums[m].to_numpy()
+            out[m + PER_HARI] = (sums[m] / sums[COL_HARI_DATA].where(sums[COL_HARI_DATA] > 0)).to_numpy()
+    return out
+
+
+def rollup(daily: pd.DataFrame, freq: str, rates: Iterable[str] = (), by: Optional[str] = None) -> pd.DataFrame:
+    # daily: satu baris per (by,) tanggal; kolom "date" atau index tanggal. freq: nilai FREQS.
+    # Tanpa `by`: resample biasa (minggu/bulan tanpa data tetap muncul dengan 0 hari ada data).
+    # Dengan `by`: resample per entitas lewat pd.Grouper (satu groupby untuk semua entitas).
+    if daily.empty:
+        return pd.DataFrame()
+    frame = daily.set_index("date") if "date" in daily.columns else daily
+    frame = frame.set_axis(pd.DatetimeIndex(frame.index), axis=0)
+    metrics = [c for c in frame.columns if c != by and pd.api.types.is_numeric_dtype(frame[c])]
+    rates = [c for c in metrics if c in set(rates)]
+    additive = [c for c in metrics if c not in rates]
+    frame = frame.assign(**{COL_HARI_DATA: 1})
+
+    if by is None:
+        grouped = frame.resample(freq, label="left", closed="left")
+    else:
+        grouped = frame.groupby([by, pd.Grouper(freq=freq, label="left", closed="left")], observed=True)
+    sums = grouped[additive + [COL_HARI_DATA]].sum()
+    means = grouped[rates].mean() if rates else sums.iloc[:, :0]
+    return _period_frame(sums, means, freq, additive, rates)
@@ -0,0 +1,303 @@
+# shopee_history.py
+# Histori lokal (Parquet, kolumnar) untuk laporan Shopee Ads.
+# Setiap upload diringkas dulu menjadi 1 baris per (tanggal laporan, Nama Iklan) lalu disimpan
+# sebagai partisi harian: <DATA_DIR>/shopee_ads/daily/date=YYYY-MM-DD/<sumber>.parquet (1 file per file upload,
+# mis. per akun). Upload ulang file yang sama untuk tanggal yang sama menimpa file-nya, jadi penyimpanan idempoten;
+# laporan akun lain di tanggal yang sama tidak saling menimpa dan digabung saat dibaca.
+# Query tren hanya membaca partisi pada rentang tanggal yang diminta.
+# Penulisan (termasuk daily_totals.parquet) diserialisasi dengan file lock, karena save_daily dipanggil dari
+# job latar belakang yang berjalan paralel di beberapa worker process (jobs.py).
+
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+
+STORE_DIR = os.path.join(config.DATA_DIR, "shopee_ads")
+DAILY_DIR = os.path.join(STORE_DIR, "daily")
+TOTALS_PATH = os.path.join(STORE_DIR, "daily_totals.parquet")
+LOCK_PATH = os.path.join(STORE_DIR, ".lock")
+LEGACY_PART = "part.parquet"  # nama file partisi lama (1 file per tanggal)
+
+COL_NAMA = "Nama Iklan"
+COL_RINGKAS = "Nama Ringkasan"
+COL_BIAYA = "Biaya"
+COL_TERJUAL = "Produk Terjual"
+COL_GMV = "Penjualan Langsung (GMV Langsung)"
+COL_ROAS = "Efektifitas Iklan"
+COL_KATEGORI = "Kategori"
+METRICS = [COL_ROAS, COL_BIAYA, COL_TERJUAL, COL_GMV]
+
+_DATE_PATTERNS = [
+    (re.compile(r"(\d{2})[/-](\d{2})[/-](\d{4})"), lambda m: date(int(m[3]), int(m[2]), int(m[1]))),
+    (re.compile(r"(\d{4})-(\d{2})-(\d{2})"), lambda m: date(int(m[1]), int(m[2]), int(m[3]))),
+]
+
+
+def detect_report_date(file_bytes: bytes) -> Optional[date]:
+    # Ambil tanggal pertama di baris pembuka CSV (mis. "Periode,01/10/2026 - 01/10/2026")
+    if not file_bytes:
+        return None
+    lines = file_bytes[:8192].decode("utf-8", errors="ignore").splitlines()[:30]
+    for line in lines:
+        if "Nama Iklan" in line:
+            break
+        for pattern, build in _DATE_PATTERNS:
+            m = pattern.search(line)
+            if m:
+                try: return build(m)
+                except ValueError: pass
+    return None
+
+
+def _partition_dir(d: date) -> str:
+    return os.path.join(DAILY_DIR, f"date={d.isoformat()}")
+
+
+def _partition_files(d: date) -> List[str]:
+    part = _partition_dir(d)
+    if not os.path.isdir(part):
+        return []
+    return sorted(os.path.join(part, name) for name in os.listdir(part) if name.endswith(".parquet"))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", str(text)).strip("._") or "data"
+
+
+@contextmanager
+def _store_lock():
+    # Kunci eksklusif lintas proses (worker job) untuk tulis partisi + daily_totals.parquet
+    os.makedirs(STORE_DIR, exist_ok=True)
+    with open(LOCK_PATH, "a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def summarize_daily(df: pd.DataFrame) -> pd.DataFrame:
+    # Ringkas 1 upload menjadi 1 baris per Nama Iklan. Baris agregat "grup" dibuang agar tidak dobel.
+    d = df[~df["IS_AGGREGATE"].fillna(False).astype(bool)] if "IS_AGGREGATE" in df.columns else df
+    d = d[d[COL_NAMA].notna()]
+    cols = {c: (pd.to_numeric(d[c], errors="coerce") if c in d.columns else pd.Series(np.nan, index=d.index))
+            for c in [COL_BIAYA, COL_TERJUAL, COL_GMV, COL_ROAS]}
+    work = pd.DataFrame({
+        COL_NAMA: d[COL_NAMA].astype(str),
+        COL_RINGKAS: d[COL_RINGKAS].astype(str) if COL_RINGKAS in d.columns else d[COL_NAMA].astype(str),
+        COL_KATEGORI: d[COL_KATEGORI] if COL_KATEGORI in d.columns else None,
+        **cols,
+        # ROAS digabung berbobot biaya (= total GMV / total biaya)
+        "__roas_x_biaya": cols[COL_ROAS] * cols[COL_BIAYA],
+    })
+    g = work.groupby(COL_NAMA, sort=False)
+    out = g.agg(**{
+        COL_RINGKAS: (COL_RINGKAS, "first"),
+        COL_KATEGORI: (COL_KATEGORI, "first"),
+        COL_BIAYA: (COL_BIAYA, "sum"),
+        COL_TERJUAL: (COL_TERJUAL, "sum"),
+        COL_GMV: (COL_GMV, "sum"),
+        "__roas_x_biaya": ("__roas_x_biaya", "sum"),
+        "__roas_mean": (COL_ROAS, "mean"),
+    }).reset_index()
+    out[COL_ROAS] = np.where(out[COL_BIAYA] > 0, out["__roas_x_biaya"] / out[COL_BIAYA].where(out[COL_BIAYA] > 0), out["__roas_mean"])
+    out = out.drop(columns=["__roas_x_biaya", "__roas_mean"])
+    for c in [COL_BIAYA, COL_GMV, COL_ROAS]:
+        out[c] = out[c].astype("float64")
+    out[COL_TERJUAL] = out[COL_TERJUAL].astype("float64")
+    out[COL_KATEGORI] = out[COL_KATEGORI].astype("string")
+    return out
+
+
+def _atomic_write_parquet(df: pd.DataFrame, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _drop_legacy_part(d: date, source_name: str):
+    # Partisi lama (part.parquet) dari file yang sama diganti file per sumber, agar tidak terhitung dua kali
+    path = os.path.join(_partition_dir(d), LEGACY_PART)
+    if os.path.exists(path) and set(pd.read_parquet(path, columns=["source_file"])["source_file"]) <= {source_name}:
+        os.remove(path)
+
+
+def save_daily(df: pd.DataFrame, report_date: date, source_name: str = "") -> int:
+    summary = summarize_daily(df)
+    summary.insert(0, "date", pd.Timestamp(report_date))
+    summary["source_file"] = source_name
+    with _store_lock():
+        _drop_legacy_part(report_date, source_name)
+        _atomic_write_parquet(summary, os.path.join(_partition_dir(report_date), f"{_slug(source_name)}.parquet"))
+        _update_totals(report_date)
+    return len(summary)
+
+
+def delete_date(d: date):
+    with _store_lock():
+        shutil.rmtree(_partition_dir(d), ignore_errors=True)
+        _update_totals(d)
+
+
+def available_dates() -> List[date]:
+    # Cukup membaca nama folder partisi, tanpa membuka file Parquet
+    if not os.path.isdir(DAILY_DIR):
+        return []
+    out = []
+    for name in os.listdir(DAILY_DIR):
+        if not name.startswith("date="):
+            continue
+        try: d = datetime.strptime(name[5:], "%Y-%m-%d").date()
+        except ValueError: continue
+        if _partition_files(d):
+            out.append(d)
+    return sorted(out)
+
+
+def _combine_sources(data: pd.DataFrame) -> pd.DataFrame:
+    # Beberapa file di tanggal yang sama dengan Nama Iklan sama -> 1 baris (ROAS berbobot biaya seperti summarize_daily)
+    if not data.duplicated(["date", COL_NAMA]).any():
+        return data
+    work = data.copy()
+    sums = [c for c in [COL_BIAYA, COL_TERJUAL, COL_GMV] if c in work.columns]
+    agg = {c: (c, "sum") for c in sums}
+    agg.update({c: (c, "first") for c in work.columns if c not in sums + ["date", COL_NAMA, COL_ROAS]})
+    if COL_ROAS in work.columns:
+        work["__roas_x_biaya"] = work[COL_ROAS] * work[COL_BIAYA]
+        agg.update({"__roas_x_biaya": ("__roas_x_biaya", "sum"), "__roas_mean": (COL_ROAS, "mean")})
+    out = work.groupby(["date", COL_NAMA], sort=False).agg(**agg).reset_index()
+    if COL_ROAS in work.columns:
+        biaya = out[COL_BIAYA].where(out[COL_BIAYA] > 0)
+        out[COL_ROAS] = np.where(biaya.notna(), out["__roas_x_biaya"] / biaya, out["__roas_mean"])
+        out = out.drop(columns=["__roas_x_biaya", "__roas_mean"])
+    return out[data.columns]
+
+
+def load_range(start: date, end: date, columns: Optional[list] = None) -> pd.DataFrame:
+    paths = [p for d in available_dates() if start <= d <= end for p in _partition_files(d)]
+    if not paths:
+        return pd.DataFrame(columns=["date", COL_NAMA, COL_RINGKAS, COL_KATEGORI] + METRICS)
+    # Biaya ikut dibaca jika ROAS diminta: dibutuhkan untuk menggabungkan beberapa file di tanggal yang sama
+    extra = [COL_BIAYA] if columns is not None and COL_ROAS in columns else []
+    read_cols = None if columns is None else list(dict.fromkeys(["date", COL_NAMA] + columns + extra))
+    data = _combine_sources(pd.concat([pd.read_parquet(p, columns=read_cols) for p in paths], ignore_index=True))
+    return data if columns is None else data[list(dict.fromkeys(["date", COL_NAMA] + columns))]
+
+
+def _totals_row(part: pd.DataFrame, d: date) -> dict:
+    biaya = part[COL_BIAYA].sum()
+    return {
+        "date": pd.Timestamp(d),
+        "Jumlah Iklan": len(part),
+        "Iklan MERAH": int((part[COL_KATEGORI] == "MERAH").sum()),
+        COL_BIAYA: biaya,
+        COL_TERJUAL: part[COL_TERJUAL].sum(),
+        COL_GMV: part[COL_GMV].sum(),
+        COL_ROAS: (part[COL_ROAS] * part[COL_BIAYA]).sum() / biaya if biaya > 0 else np.nan,
+    }
+
+
+def _update_totals(d: date):
+    # Tabel total per hari (pra-agregat kecil) untuk grafik tren keseluruhan. Dipanggil di dalam _store_lock().
+    # Diperbarui inkremental: hanya baris tanggal yang berubah yang dihitung ulang, dari semua file partisinya.
+    totals = pd.read_parquet(TOTALS_PATH) if os.path.exists(TOTALS_PATH) else pd.DataFrame()
+    if not totals.empty:
+        totals = totals[totals["date"] != pd.Timestamp(d)]
+    part = load_range(d, d)
+    if not part.empty:
+        totals = pd.concat([totals, pd.DataFrame([_totals_row(part, d)])], ignore_index=True)
+    if totals.empty:
+        if os.path.exists(TOTALS_PATH): os.remove(TOTALS_PATH)
+        return
+    _atomic_write_parquet(totals.sort_values("date").reset_index(drop=True), TOTALS_PATH)
+
+
+def load_totals() -> pd.DataFrame:
+    if not os.path.exists(TOTALS_PATH):
+        return pd.DataFrame()
+    return pd.read_parquet(TOTALS_PATH).set_index("date").sort_index()
+
+
+def trend_table(metric: str, days: int, end: Optional[date] = None) -> pd.DataFrame:
+    # Pivot Nama Iklan x tanggal untuk N hari terakhir yang tersedia
+    dates = available_dates()
+    if not dates:
+        return pd.DataFrame()
+    end = end or dates[-1]
+    data = load_range(end - timedelta(days=days - 1), end, columns=[COL_RINGKAS, metric])
+    if data.empty:
+        return pd.DataFrame()
+    pivot = data.pivot_table(index=COL_NAMA, columns="date", values=metric, aggfunc="sum")
+    pivot.columns = [pd.Timestamp(c).strftime("%Y-%m-%d") for c in pivot.columns]
+    return pivot
+
+
+def turned_red(days: int, end: Optional[date] = None) -> pd.DataFrame:
+    # Iklan yang MERAH di tanggal terakhir, padahal kemunculan sebelumnya bukan MERAH
+    dates = available_dates()
+    if len(dates) < 2:
+        return pd.DataFrame()
+    end = end or dates[-1]
+    data = load_range(end - timedelta(days=days - 1), end, columns=[COL_RINGKAS, COL_KATEGORI, COL_ROAS, COL_BIAYA])
+    if data.empty:
+        return pd.DataFrame()
+    data = data.sort_values("date")
+    last_date = data["date"].max()
+    latest = data[data["date"] == last_date].set_index(COL_NAMA)
+    prev = data[data["date"] < last_date].groupby(COL_NAMA).tail(1).set_index(COL_NAMA)
+    merah_now = latest[latest[COL_KATEGORI] == "MERAH"]
+    joined = merah_now.join(prev[[COL_KATEGORI, COL_ROAS, "date"]], rsuffix=" Sebelumnya", how="inner")
+    joined = joined[joined[f"{COL_KATEGORI} Sebelumnya"].fillna("") != "MERAH"]
+    out = joined.reset_index()[[COL_NAMA, COL_RINGKAS, f"{COL_KATEGORI} Sebelumnya", f"{COL_ROAS} Sebelumnya", COL_ROAS, COL_BIAYA, "date Sebelumnya"]]
+    out = out.rename(columns={"date Sebelumnya": "Tanggal Sebelumnya"})
+    return out.sort_values(COL_BIAYA, ascending=False).reset_index(drop=True)
+
+
+def week_over_week(end: Optional[date] = None) -> pd.DataFrame:
+    # 7 hari terakhir vs 7 hari sebelumnya per iklan
+    dates = available_dates()
+    if not dates:
+        return pd.DataFrame()
+    end = end or dates[-1]
+    data = load_range(end - timedelta(days=13), end, columns=[COL_RINGKAS, COL_BIAYA, COL_TERJUAL, COL_GMV, COL_ROAS])
+    if data.empty:
+        return pd.DataFrame()
+    cut = pd.Timestamp(end - timedelta(days=6))
+    data["periode"] = np.where(data["date"] >= cut, "Minggu Ini", "Minggu Lalu")
+    data["__roas_x_biaya"] = data[COL_ROAS] * data[COL_BIAYA]
+    g = data.groupby([COL_NAMA, "periode"])[[COL_BIAYA, COL_TERJUAL, COL_GMV, "__roas_x_biaya"]].sum()
+    g[COL_ROAS] = g["__roas_x_biaya"] / g[COL_BIAYA].where(g[COL_BIAYA] > 0)
+    wide = g.drop(columns="__roas_x_biaya").unstack("periode")
+    out = pd.DataFrame(index=wide.index)
+    for m in [COL_ROAS, COL_BIAYA, COL_TERJUAL]:
+        lalu = wide[(m, "Minggu Lalu")] if (m, "Minggu Lalu") in wide.columns else pd.Series(np.nan, index=wide.index)
+        ini = wide[(m, "Minggu Ini")] if (m, "Minggu Ini") in wide.columns else pd.Series(np.nan, index=wide.index)
+        out[f"{m} (Minggu Lalu)"] = lalu
+        out[f"{m} (Minggu Ini)"] = ini
+        out[f"Δ {m}"] = ini - lalu
+    return out.sort_values(f"Δ {COL_ROAS}", na_position="last").reset_index()
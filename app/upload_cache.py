@@ -0,0 +1,232 @@
+# upload_cache.py
+# Cache lintas sesi untuk upload yang sudah di-parse, satu per proses (gaya st.cache_resource).
+# Kunci = jenis parser + sha256 isi file, jadi file yang sama dari rekan lain langsung kena cache
+# tanpa parse ulang. Frame disimpan sekali sebagai tabel Arrow (read-only) dan dibagi ke semua sesi:
+# - kolom teks ("str") dikembalikan sebagai ArrowStringArray yang menunjuk buffer Arrow yang sama (zero-copy);
+#   array Arrow immutable, jadi pipeline yang mengubah kolom otomatis mendapat array baru (copy-on-write)
+#   dan tabel bersama tidak pernah ikut berubah
+# - kolom numerik dikonversi ke blok numpy milik frame pemanggil (bebas diubah di tempat)
+# - kolom object dikembalikan ke object (salinan, bukan zero-copy) agar pipeline berperilaku sama
+# Opsional (ADS_UPLOAD_CACHE_SPILL=1): tabel ditulis ke <DATA_DIR>/upload_cache/*.arrow lalu
+# di-memory-map, sehingga worker process (job latar belakang, process pool) ikut memakai hasil parse
+# yang sama dan memori tabel dikelola page cache OS.
+#
+# Hanya frame yang kembali PERSIS sama setelah lewat Arrow yang di-cache (dtype sama, dan isi kolom object
+# sama nilai & tipe Python-nya). Contoh yang tidak lolos: kolom object [5, None, 3] (Arrow -> 5.0, nan, 3.0)
+# atau ID besar bercampur NaN (-> float, "23456789012.0" saat .astype(str)), juga kolom object campuran
+# angka + teks yang tidak bisa dijadikan Arrow. Untuk frame seperti itu parser tetap dipanggil setiap kali.
+# Saat miss, pemanggil selalu menerima frame asli hasil parser (bukan hasil round trip).
+#
+# metadata(): cache terpisah untuk info kecil per file (mis. daftar sheet) tanpa frame.
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+import config
+
+SPILL_DIR = os.path.join(config.DATA_DIR, "upload_cache")
+_META_KEY = b"ads_upload_cache"
+METADATA_ENTRIES = 1024
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def content_key(kind: str, data: bytes) -> str:
+    return f"{kind}-{hashlib.sha256(data).hexdigest()[:40]}"
+
+
+def _to_table(df: pd.DataFrame, meta: dict):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    extra = {"object_cols": [str(c) for c in df.columns if df[c].dtype == object], "meta": meta}
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: json.dumps(extra).encode()})
+
+
+def _to_frame(table) -> Tuple[pd.DataFrame, dict]:
+    extra = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+    df = table.to_pandas()
+    # Kolom yang aslinya object dikembalikan ke object agar perilaku pipeline sama persis dengan tanpa cache
+    for c in extra.get("object_cols", []):
+        if c in df.columns and df[c].dtype != object:
+            df[c] = df[c].astype(object)
+    return df, extra.get("meta", {})
+
+
+def _same_objects(a: pd.Series, b: pd.Series) -> bool:
+    # Sama nilai DAN tipe Python per sel (5 vs 5.0, None vs nan dianggap berbeda)
+    return all(x is y or (type(x) is type(y) and (x == y or (x != x and y != y)))
+               for x, y in zip(a.to_numpy(), b.to_numpy()))
+
+
+def _lossless(df: pd.DataFrame, table) -> bool:
+    back, _ = _to_frame(table)
+    if list(back.columns) != list(df.columns) or not back.dtypes.equals(df.dtypes):
+        return False
+    return all(_same_objects(df.iloc[:, i], back.iloc[:, i])
+               for i, dtype in enumerate(df.dtypes) if dtype == object)
+
+
+class UploadCache:
+    def __init__(self, budget_bytes: int, spill_dir: Optional[str] = None):
+        self.budget_bytes = int(budget_bytes)
+        self.spill_dir = spill_dir
+        self._tables: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (pa.Table, nbytes), urut LRU
+        self._meta: "OrderedDict[str, dict]" = OrderedDict()  # key -> dict kecil, urut LRU
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, list] = {}  # key -> [Lock, jumlah pemakai]; dihapus saat tidak dipakai
+        self.hits = 0
+        self.misses = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._cleanup_spill()
+
+    @contextmanager
+    def _key_lock(self, key: str):
+        # Dua sesi yang meng-upload file sama bersamaan: yang kedua menunggu hasil parse yang pertama
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    self._key_locks.pop(key, None)
+
+    def get(self, kind: str, data: bytes, parse: Callable) -> Tuple[pd.DataFrame, dict]:
+        # parse() -> DataFrame atau (DataFrame, dict meta kecil yang bisa di-JSON-kan)
+        key = content_key(kind, data)
+        with self._key_lock(key):
+            table = self._lookup(key)
+            if table is not None:
+                self.hits += 1
+                return _to_frame(table)
+            self.misses += 1
+            out = parse()
+            df, meta = out if isinstance(out, tuple) else (out, {})
+            meta = meta or {}
+            try:
+                table = _to_table(df, meta)
+                cacheable = _lossless(df, table)
+            except Exception:
+                cacheable = False
+            if cacheable:
+                self._store(key, table)
+            return df, meta
+
+    def metadata(self, kind: str, data: bytes, compute: Callable[[], dict]) -> dict:
+        # compute() -> dict kecil (mis. {"sheets": [...]}); hanya di memori proses, dibatasi METADATA_ENTRIES
+        key = content_key(kind, data)
+        with self._key_lock(key):
+            with self._lock:
+                if key in self._meta:
+                    self._meta.move_to_end(key)
+                    return dict(self._meta[key])
+            meta = dict(compute())
+            with self._lock:
+                self._meta[key] = meta
+                while len(self._meta) > METADATA_ENTRIES:
+                    self._meta.popitem(last=False)
+            return dict(meta)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._tables), "bytes": sum(n for _, n in self._tables.values()),
+                    "budget": self.budget_bytes, "hits": self.hits, "misses": self.misses, "spill": bool(self.spill_dir)}
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._meta.clear()
+
+    def _lookup(self, key: str):
+        with self._lock:
+            if key in self._tables:
+                self._tables.move_to_end(key)
+                return self._tables[key][0]
+        path = self._spill_path(key)
+        if path and os.path.exists(path):
+            try:
+                table = self._open_spill(path)
+            except Exception:
+                return None
+            self._remember(key, table)
+            return table
+        return None
+
+    def _store(self, key: str, table):
+        path = self._spill_path(key)
+        if path:
+            try:
+                table = self._write_spill(path, table)
+            except Exception:
+                pass
+        self._remember(key, table)
+
+    def _remember(self, key: str, table):
+        with self._lock:
+            self._tables[key] = (table, table.nbytes)
+            self._tables.move_to_end(key)
+            # Entri terbaru tidak dibuang walau sendirian melebihi budget
+            while len(self._tables) > 1 and sum(n for _, n in self._tables.values()) > self.budget_bytes:
+                self._tables.popitem(last=False)
+
+    def _spill_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.spill_dir, f"{key}.arrow") if self.spill_dir else None
+
+    @staticmethod
+    def _open_spill(path: str):
+        import pyarrow as pa
+        # File IPC tanpa kompresi -> read_all() menunjuk langsung ke halaman memory-map (zero-copy)
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+    def _write_spill(self, path: str, table):
+        import pyarrow as pa
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        return self._open_spill(path)
+
+    def _cleanup_spill(self):
+        cutoff = time.time() - 3600 * config.UPLOAD_CACHE_RETENTION_HOURS
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def shared() -> UploadCache:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = UploadCache(config.UPLOAD_CACHE_MB * 1024 * 1024,
+                                  SPILL_DIR if config.UPLOAD_CACHE_SPILL else None)
+        return _shared
+
+
+def frame(kind: str, data: bytes, parse: Callable) -> pd.DataFrame:
+    return shared().get(kind, data, parse)[0]
+
+
+def frame_with_meta(kind: str, data: bytes, parse: Callable) -> Tuple[pd.DataFrame, dict]:
+    return shared().get(kind, data, parse)
+
+
+def metadata(kind: str, data: bytes, compute: Callable[[], dict]) -> dict:
+    return shared().metadata(kind, data, compute)
@@ -0,0 +1,138 @@
+# xlstyle.py
+# Registry style workbook bersama: format Rupiah/persen, baris total, KPI merah/hijau, font, wrap.
+# Style didefinisikan sekali di STYLES dan dipakai lewat namanya oleh semua writer.
+#
+# openpyxl: kombinasi (style awal sel, nama style) di-intern sekali per workbook (OpenpyxlStyles),
+# sel berikutnya cukup menyalin StyleArray hasilnya. Tidak ada objek Font/PatternFill baru per sel
+# dan tidak ada lookup IndexedList per atribut, sehingga styles.xml juga hanya berisi kombinasi yang dipakai.
+# xlsxwriter: satu Format per kombinasi nama per workbook (XlsxwriterFormats).
+
+from copy import copy
+from typing import Dict, Optional
+
+RUPIAH_FORMAT = '_-"Rp"* #,##0_-;-"Rp"* #,##0_-;_-"Rp"* "-"_-;_-@_-'
+
+# nama -> spesifikasi netral engine: bg (warna isi), color (warna font), bold, num_format, wrap, valign
+STYLES: Dict[str, dict] = {
+    # Format angka
+    "rupiah": {"num_format": RUPIAH_FORMAT},
+    "persen": {"num_format": "0.00%"},
+    "desimal": {"num_format": "0.##"},
+    "bulat": {"num_format": "0"},
+    "ribuan": {"num_format": "#,##0"},
+    "tanggal": {"num_format": "yyyy-mm-dd"},
+    "tanggal_jam": {"num_format": "yyyy-mm-dd hh:mm:ss"},
+    # Teks
+    "tebal": {"bold": True},
+    "wrap": {"wrap": True, "valign": "top"},
+    "font_merah": {"color": "FF0000"},
+    "font_hijau": {"color": "006400"},
+    # Baris total (Analitik Produk)
+    "grand_total": {"bg": "D9EAD3", "bold": True},
+    "total_produk": {"bg": "FFFF00"},
+    "dropdown_total": {"bg": "BDE2F5"},
+    "dropdown_variasi": {"bg": "E6E6E6"},
+    # KPI
+    "kpi_merah": {"bg": "FFC7CE"},
+    "kpi_hijau": {"bg": "C6EFCE"},
+    "naik": {"bg": "B6F2C2"},
+    "turun": {"bg": "F5B7B1"},
+}
+
+
+def fill(hex_color: str) -> str:
+    # Nama style isi solid untuk warna bebas (mis. warna ROI TikTok); didaftarkan saat pertama dipakai
+    name = f"isi_{hex_color.upper()}"
+    STYLES.setdefault(name, {"bg": hex_color.upper()})
+    return name
+
+
+def font(hex_color: str, bold: bool = False) -> str:
+    name = f"font_{hex_color.upper()}{'_tebal' if bold else ''}"
+    STYLES.setdefault(name, {"color": hex_color.upper(), **({"bold": True} if bold else {})})
+    return name
+
+
+def spec(*names) -> dict:
+    # Gabungan beberapa style (nama kosong/None diabaikan, nama belakangan menimpa)
+    out = {}
+    for n in names:
+        if n:
+            out.update(STYLES[n])
+    return out
+
+
+def pattern_fill(hex_color: str):
+    from openpyxl.styles import PatternFill
+    return PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
+
+
+class OpenpyxlStyles:
+    # Cache style per workbook: indeks font/fill di StyleArray hanya berlaku di workbook yang sama,
+    # jadi buat satu instance per workbook.
+    def __init__(self):
+        self._cache = {}
+
+    def apply(self, cell, *names):
+        key = (tuple(cell._style) if cell.has_style else (), names)
+        style = self._cache.get(key)
+        if style is None:
+            _set_openpyxl(cell, spec(*names))
+            self._cache[key] = copy(cell._style)
+        else:
+            cell._style = copy(style)
+
+    def apply_cells(self, cells, *names):
+        for cell in cells:
+            self.apply(cell, *names)
+
+    def apply_range(self, ws, *names, min_row: int = 2, max_row: Optional[int] = None,
+                    min_col: int = 1, max_col: Optional[int] = None):
+        # Default: semua baris data (setelah header) di semua kolom
+        max_row = ws.max_row if max_row is None else max_row
+        max_col = ws.max_column if max_col is None else max_col
+        if max_row < min_row or max_col < min_col:
+            return
+        for row_cells in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+            for cell in row_cells:
+                self.apply(cell, *names)
+
+    def apply_row(self, ws, row: int, *names, min_col: int = 1, max_col: Optional[int] = None):
+        self.apply_range(ws, *names, min_row=row, max_row=row, min_col=min_col, max_col=max_col)
+
+
+def _set_openpyxl(cell, s: dict):
+    # Hanya dipanggil saat cache miss; font & alignment diturunkan dari style sel yang sudah ada
+    if "bg" in s:
+        cell.fill = pattern_fill(s["bg"])
+    if "color" in s or "bold" in s:
+        f = copy(cell.font)
+        if "color" in s: f.color = s["color"]
+        if "bold" in s: f.bold = s["bold"]
+        cell.font = f
+    if "wrap" in s or "valign" in s:
+        a = copy(cell.alignment)
+        if "wrap" in s: a.wrap_text = s["wrap"]
+        if "valign" in s: a.vertical = s["valign"]
+        cell.alignment = a
+    if "num_format" in s:
+        cell.number_format = s["num_format"]
+
+
+class XlsxwriterFormats:
+    def __init__(self, book):
+        self.book = book
+        self._cache = {}
+
+    def get(self, *names):
+        names = tuple(n for n in names if n)
+        if names not in self._cache:
+            s, props = spec(*names), {}
+            if "bg" in s: props.update({"bg_color": f"#{s['bg']}", "pattern": 1})
+            if "color" in s: props["font_color"] = f"#{s['color']}"
+            if "bold" in s: props["bold"] = s["bold"]
+            if "num_format" in s: props["num_format"] = s["num_format"]
+            if "wrap" in s: props["text_wrap"] = s["wrap"]
+            if "valign" in s: props["valign"] = s["valign"]
+            self._cache[names] = self.book.add_format(props)
+        return self._cache[names]
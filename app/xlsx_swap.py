@@ -0,0 +1,100 @@
+# xlsx_swap.py
+# Tukar titik <-> koma langsung di XML workbook .xlsx (Excel 1 / Converter Shopee Out), tanpa pandas.
+#
+# Teks sel di .xlsx ada di dua tempat: xl/sharedStrings.xml (<si><t>..</t></si>) dan inline string
+# (<is><t>..</t></is>) di xl/worksheets/sheetN.xml. Hanya isi elemen <t> yang diterjemahkan dengan
+# bytes.translate, jadi angka, tanggal, formula, style, lebar kolom, merge, filter, dst. tetap persis aslinya.
+# "." dan "," adalah ASCII: byte 0x2C/0x2E tidak pernah muncul di dalam karakter UTF-8 multi-byte,
+# sehingga translate per byte aman tanpa decode.
+#
+# Seperti converter pandas, baris header (baris pertama tiap sheet) tidak ikut ditukar: shared string yang
+# hanya dipakai di header dilewati (yang juga dipakai di baris data tetap ditukar).
+# Bagian zip lain disalin dengan isi byte yang sama; part dibaca & ditulis satu per satu (tidak dimuat sekaligus).
+
+import re
+import zipfile
+from io import BytesIO
+
+import exporter
+
+SWAP = bytes.maketrans(b".,", b",.")
+
+# Hanya elemen <t> yang memuat "." atau "," (sisanya dilewati regex tanpa callback Python)
+_TEXT = re.compile(rb"(<(?:\w+:)?t(?:\s[^>]*)?>)([^<]*[.,][^<]*)(</(?:\w+:)?t>)")
+_ITEM = re.compile(rb"<(?:\w+:)?si\b[^>]*?(?:/>|>.*?</(?:\w+:)?si>)", re.S)
+_ROW = re.compile(rb"<(?:\w+:)?row\b[^>]*?(?:/>|>.*?</(?:\w+:)?row>)", re.S)
+_SHARED_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*?\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</')
+
+
+def is_xlsx(data: bytes) -> bool:
+    # .xls lama (BIFF) bukan zip -> pemanggil memakai converter pandas
+    return zipfile.is_zipfile(BytesIO(data))
+
+
+def swap_text(xml: bytes) -> bytes:
+    return _TEXT.sub(lambda m: m.group(1) + m.group(2).translate(SWAP) + m.group(3), xml)
+
+
+def _is_sheet(name: str) -> bool:
+    return name.startswith("xl/worksheets/") and name.endswith(".xml")
+
+
+def _is_shared_strings(name: str) -> bool:
+    return name.startswith("xl/") and name.endswith("sharedStrings.xml")
+
+
+def _header_end(sheet: bytes) -> int:
+    # Posisi akhir baris pertama di sheetData (0 jika sheet kosong)
+    start = sheet.find(b"sheetData")
+    m = _ROW.search(sheet, start) if start >= 0 else None
+    return m.end() if m else 0
+
+
+def header_only_strings(zin: zipfile.ZipFile) -> set:
+    # Indeks shared string yang muncul di baris header suatu sheet tapi tidak di baris data mana pun
+    header, body = set(), set()
+    for info in zin.infolist():
+        if not _is_sheet(info.filename):
+            continue
+        sheet = zin.read(info)
+        end = _header_end(sheet)
+        header.update(_SHARED_CELL.findall(sheet, 0, end))
+        body.update(_SHARED_CELL.findall(sheet, end))
+    return {int(i) for i in header - body}
+
+
+def swap_shared_strings(xml: bytes, keep: set) -> bytes:
+    # String header biasanya masuk tabel paling awal (indeks kecil): item <si> hanya dipindai sampai
+    # indeks header terakhir, sisa dokumen ditukar sekaligus
+    last = max(keep, default=-1)
+    parts, pos = [], 0
+    for i, m in enumerate(_ITEM.finditer(xml)):
+        if i > last:
+            break
+        parts.append(swap_text(xml[pos:m.start()]))
+        parts.append(m.group(0) if i in keep else swap_text(m.group(0)))
+        pos = m.end()
+    parts.append(swap_text(xml[pos:]))
+    return b"".join(parts)
+
+
+def swap_sheet(xml: bytes) -> bytes:
+    # Inline string saja (shared string ditangani di sharedStrings.xml); header dibiarkan
+    if b"inlineStr" not in xml:
+        return xml
+    end = _header_end(xml)
+    return xml[:end] + swap_text(xml[end:])
+
+
+def swap_dot_comma_xlsx(data: bytes) -> bytes:
+    out = exporter.spooled_file()
+    with zipfile.ZipFile(BytesIO(data)) as zin, zipfile.ZipFile(out, "w") as zout:
+        keep = header_only_strings(zin)  # lintasan pertama: sheet dibaca untuk indeks header saja
+        for info in zin.infolist():
+            part = zin.read(info)
+            if _is_shared_strings(info.filename):
+                part = swap_shared_strings(part, keep)
+            elif _is_sheet(info.filename):
+                part = swap_sheet(part)
+            zout.writestr(info, part)
+    return exporter.read_bytes(out)
@@ -0,0 +1,95 @@
+# bench_anomaly.py
+# Parity check + benchmark deteksi anomali TikTok Daily (anomaly.AnomalyScan) di atas kubus produk × hari × metrik.
+#
+#   python benchmarks/bench_anomaly.py                      # 3.000 produk × 90 hari × 18 metrik ALLOWED_METRICS
+#   python benchmarks/bench_anomaly.py --products 5000 --method zscore
+#   python benchmarks/bench_anomaly.py --window 14 --budget 2
+#
+# Parity: skor z untuk sampel produk dihitung ulang dengan pandas rolling (median/MAD atau mean/std per
+# produk × metrik, satu loop per metrik) dan dibandingkan. Keluar dengan kode 1 jika berbeda atau jika
+# scan melebihi --budget detik.
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import anomaly  # noqa: E402
+from platforms import tiktok  # noqa: E402
+
+
+def synth_table(products, days, rng):
+    # Tabel produk × tanggal seperti product_daily_table: ~5% hari bolong per produk, sebagian hari bernilai 0
+    metrics = [c for c in tiktok.ALLOWED_METRICS if c not in ("ID", "Produk", "Status")]
+    idx = pd.MultiIndex.from_product([[f"Produk {i:05d}" for i in range(products)],
+                                      pd.date_range("2026-07-01", periods=days)], names=["Produk", "date"])
+    values = rng.gamma(2.0, 1_000.0, (len(idx), len(metrics)))
+    values[rng.random(values.shape) < 0.1] = 0
+    table = pd.DataFrame(values, index=idx, columns=metrics).reset_index()
+    return table[rng.random(len(table)) > 0.05].reset_index(drop=True), metrics
+
+
+def reference_z(table, scan, metric, products, window, method):
+    # Acuan lambat: pandas rolling per metrik atas baseline [d - window, d)
+    wide = table.pivot(index="Produk", columns="date", values=metric).reindex(index=products, columns=scan.dates)
+    hist = wide.T.shift(1)
+    roll = hist.rolling(window, min_periods=scan.min_periods)
+    if method == "zscore":
+        center, scale = roll.mean(), roll.std()
+    else:
+        center = roll.median()
+        mad = roll.apply(lambda w: np.nanmedian(np.abs(w - np.nanmedian(w))), raw=True)
+        mean_ad = roll.apply(lambda w: np.nanmean(np.abs(w - np.nanmedian(w))), raw=True)
+        scale = (mad * anomaly.MAD_SCALE).where(mad > 0, mean_ad * anomaly.MEAN_AD_SCALE)
+    z = (wide.T - center) / scale.where(scale > 0)
+    return z.T.to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity & benchmark deteksi anomali TikTok Daily")
+    parser.add_argument("--products", type=int, default=3_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--window", type=int, default=7)
+    parser.add_argument("--method", choices=list(anomaly.METHODS), default="mad")
+    parser.add_argument("--budget", type=float, default=1.0, help="batas waktu scan (detik)")
+    parser.add_argument("--sample", type=int, default=50, help="jumlah produk untuk parity check")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    table, metrics = synth_table(args.products, args.days, rng)
+    print(f"metode: {args.method}, kubus: {args.products:,} produk × {args.days} hari × {len(metrics)} metrik "
+          f"({len(table):,} baris)")
+
+    t0 = time.perf_counter()
+    scan = anomaly.AnomalyScan(table, "Produk", "date", metrics, window=args.window, method=args.method)
+    t_scan = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    alerts = scan.alerts(3.5, latest_only=True)
+    t_alerts = time.perf_counter() - t0
+    print(f"scan  : {t_scan:6.2f} s (budget {args.budget:.1f} s)")
+    print(f"alerts: {t_alerts:6.2f} s ({len(alerts):,} anomali di tanggal terakhir)")
+
+    products = scan.entities[rng.choice(len(scan.entities), min(args.sample, len(scan.entities)), replace=False)]
+    rows = scan.entities.get_indexer(products)
+    sample = table[table["Produk"].isin(products)]
+    bad = 0
+    for k, metric in enumerate(metrics):
+        want = reference_z(sample, scan, metric, products, args.window, args.method)
+        got = scan.z[rows, :, k].astype(np.float64)
+        same = np.isclose(got, want, rtol=1e-3, atol=1e-3) | (np.isnan(got) & np.isnan(want))
+        bad += int((~same).sum())
+    if bad:
+        print(f"PARITY GAGAL: {bad} sel berbeda dari pandas rolling")
+        return 1
+    print(f"parity OK: {len(products)} produk × {len(metrics)} metrik identik dengan pandas rolling")
+    return 0 if t_scan <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# bench_converter.py
+# Parity check + benchmark Excel 1 (Converter) Shopee Out: tukar titik/koma di XML (xlsx_swap) vs
+# jalur pandas (read_excel dtype=str -> swap_dot_comma_df -> to_excel_bytes_from_sheets).
+#
+#   python benchmarks/bench_converter.py                       # data sintetis
+#   python benchmarks/bench_converter.py --rows 200000
+#   python benchmarks/bench_converter.py --file toko.xlsx      # export Shopee Out asli (boleh diulang)
+#
+# Data sintetis ditulis openpyxl (inline string); export asli dari Shopee/Excel memakai sharedStrings.xml.
+# Parity: teks sel & header sama dengan jalur pandas. Sel angka sengaja tetap angka di mode XML, jadi untuk
+# sel itu yang dibandingkan adalah angka yang ditukar (seperti yang dihasilkan jalur pandas).
+# Keluar dengan kode 1 jika ada sel yang berbeda.
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import xlsx_swap  # noqa: E402
+from platforms import shopee  # noqa: E402
+
+
+def synth_workbook(rows, rng) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Performa Produk"
+    ws.append(["Kode Produk", "Produk", "Channel", "Harga (Rp.)", "Tingkat Konversi", "Pengunjung", "Penjualan (IDR)"])
+    for i in range(rows):
+        ws.append([str(10**9 + int(rng.integers(0, 5000))), f"Gamis Rayon {i % 400}, Busui Friendly", "Iklan Shopee - Sales",
+                   f"{int(rng.integers(10**4, 10**6)):,}".replace(",", "."), f"{rng.random() * 10:.2f}%".replace(".", ","),
+                   int(rng.integers(0, 5000)), float(rng.random() * 10**6)])
+    info = wb.create_sheet("Info")
+    info.append(["Keterangan"])
+    info.append(["Periode 01.10.2026 - 31.10.2026, semua channel"])
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def convert_pandas(data: bytes) -> bytes:
+    xls = pd.ExcelFile(io.BytesIO(data))
+    return shopee.to_excel_bytes_from_sheets({
+        name: shopee.swap_dot_comma_df(pd.read_excel(xls, sheet_name=name, dtype=str)) for name in xls.sheet_names})
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def check(label, data: bytes) -> bool:
+    old, t_old = _time(convert_pandas, data)
+    new, t_new = _time(xlsx_swap.swap_dot_comma_xlsx, data)
+    ok = True
+    for name in pd.ExcelFile(io.BytesIO(data)).sheet_names:
+        a = pd.read_excel(io.BytesIO(old), sheet_name=name, dtype=str)
+        b = pd.read_excel(io.BytesIO(new), sheet_name=name, dtype=str)
+        is_text = pd.read_excel(io.BytesIO(new), sheet_name=name, dtype=object).map(lambda v: isinstance(v, str))
+        expected = b.where(is_text, shopee.swap_dot_comma_df(b).astype(object))
+        same = list(a.columns) == list(b.columns) and a.fillna("").astype(str).equals(expected.fillna("").astype(str))
+        if not same:
+            diff = (a.fillna("").astype(str) != expected.fillna("").astype(str)).any()
+            print(f"    sheet {name}: kolom berbeda {list(diff[diff].index)[:5]}")
+        ok &= same
+    speedup = t_old / t_new if t_new else float("inf")
+    print(f"{label[:24]:<24} {len(data) / 1e6:>8.1f} {t_old:>10.1f} {t_new:>10.1f} {speedup:>8.1f}x  {'OK' if ok else 'BEDA'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity & benchmark converter titik/koma (XML vs pandas)")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--file", action="append", default=[], help="export Shopee Out (.xlsx) asli (boleh diulang)")
+    args = parser.parse_args()
+
+    print(f"{'data':<24} {'MB':>8} {'pandas(ms)':>10} {'xml (ms)':>10} {'speedup':>9}  parity")
+    ok = True
+    if args.file:
+        for path in args.file:
+            ok &= check(os.path.basename(path), open(path, "rb").read())
+    else:
+        ok &= check("sintetis", synth_workbook(args.rows, np.random.default_rng(args.seed)))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# bench_dtypes.py
+# Membandingkan memori frame hasil loader (gaya lama: object/int64/float64) vs dtype_plan.
+#
+#   python benchmarks/bench_dtypes.py                      # data sintetis
+#   python benchmarks/bench_dtypes.py --rows 200000
+#   python benchmarks/bench_dtypes.py --file export.xlsx   # export asli (sheet pertama)
+#
+# Data sintetis meniru export terbesar: Shopee "Performa Produk", Analitik Produk (dibaca dtype=object)
+# dan TikTok GMV Max (dataset harian Daily Ads Comparator).
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import dtype_plan  # noqa: E402
+
+TARGET_RATIO = 3.0
+
+
+def _names(rng, prefix, n_unique, rows):
+    pool = np.array([f"{prefix} {i:05d} Gamis Rayon Premium Busui Friendly" for i in range(n_unique)], dtype=object)
+    return pool[rng.integers(0, n_unique, rows)]
+
+
+def synth_performa_produk(rows, rng):
+    channels = np.array(["Iklan Shopee", "Live Shopee", "Video Shopee", "Affiliate", "Instagram"], dtype=object)
+    return pd.DataFrame({
+        "Channel": channels[rng.integers(0, len(channels), rows)],
+        "Kode Produk": np.array([str(x) for x in rng.integers(10**10, 10**10 + 3000, rows)], dtype=object),
+        "Produk": _names(rng, "Produk", 3000, rows),
+        "Produk.1": rng.integers(0, 500, rows).astype("int64"),
+        "Pesanan": rng.integers(0, 200, rows).astype("int64"),
+        "Penjualan (IDR)": (rng.integers(0, 50_000, rows) * 1000).astype("float64"),
+        "Pengunjung": rng.integers(0, 100_000, rows).astype("int64"),
+    })
+
+
+def synth_analitik(rows, rng):
+    # read_excel(dtype=object): semua nilai tersimpan sebagai objek Python (angka IDR masih teks "1.234.000")
+    kode = np.array([str(x) for x in rng.integers(10**10, 10**10 + 3000, rows)], dtype=object)
+    frame = {
+        "Kode Produk": kode,
+        "Produk": _names(rng, "Produk", 3000, rows),
+        "SKU Induk": np.array([f"SKU-{x}" for x in rng.integers(0, 3000, rows)], dtype=object),
+        "Nama Variasi": np.array([f"Warna {a}, Ukuran {b}" for a, b in zip(rng.integers(0, 20, rows), rng.integers(0, 6, rows))], dtype=object),
+    }
+    for col in ["Pengunjung Produk (Kunjungan)", "Halaman Produk Dilihat", "Klik Pencarian", "Suka",
+                "Total Pembeli (Pesanan Dibuat)", "Produk (Pesanan Dibuat)"]:
+        frame[col] = np.array([f"{x:,}".replace(",", ".") for x in rng.integers(0, 20_000, rows)], dtype=object)
+    frame["Total Penjualan (Pesanan Dibuat) (IDR)"] = np.array(
+        [f"{x * 1000:,}".replace(",", ".") for x in rng.integers(0, 50_000, rows)], dtype=object)
+    return pd.DataFrame(frame)
+
+
+def synth_tiktok_daily(rows, rng):
+    return pd.DataFrame({
+        "ID": np.array([str(x) for x in rng.integers(1_700_000_000_000_000_000, 1_700_000_000_000_900_000, rows)], dtype=object),
+        "Produk": _names(rng, "Produk", 500, rows),
+        "Status": np.array(["Aktif", "Tidak aktif", "Ditolak"], dtype=object)[rng.integers(0, 3, rows)],
+        "Biaya": (rng.integers(0, 500_000, rows)).astype("float64"),
+        "Pendapatan kotor": (rng.integers(0, 5_000_000, rows)).astype("float64"),
+        "Pesanan (SKU)": rng.integers(0, 300, rows).astype("float64"),
+        "ROI": rng.random(rows) * 20,
+        "Tingkat konversi iklan": rng.random(rows),
+        "CTR": rng.random(rows) / 10,
+    })
+
+
+def analitik_plan(df):
+    # Sama seperti loader Analitik di app.py: bersihkan angka IDR sekali, lalu padatkan
+    out = df.copy()
+    for c in out.columns:
+        if c not in ("Kode Produk", "Produk", "SKU Induk", "Nama Variasi"):
+            out[c] = pd.to_numeric(out[c].str.replace(".", "", regex=False), errors="coerce")
+    return dtype_plan.optimize(out, exclude=["Nama Variasi"])
+
+
+def tiktok_plan(df):
+    percent = [c for c in df.columns if any(k in c.lower() for k in ["rasio", "persentase", "konversi", "ctr", "ratio"])]
+    return dtype_plan.optimize(df, categorical=["Produk", "Status"], ids=["ID"],
+                               lossy_float_cols=percent, auto_categorical=False)
+
+
+def report(name, before, optimize_fn):
+    t0 = time.perf_counter()
+    after = optimize_fn(before)
+    ms = (time.perf_counter() - t0) * 1000
+    mb_before, mb_after = dtype_plan.memory_mb(before), dtype_plan.memory_mb(after)
+    ratio = mb_before / mb_after if mb_after else float("inf")
+    print(f"{name:<24} rows={len(before):>8,}  before={mb_before:9.2f} MB  after={mb_after:8.2f} MB  "
+          f"x{ratio:5.1f}  plan={ms:7.1f} ms")
+    return mb_before, mb_after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--file", action="append", default=[], help="export .xlsx/.csv asli (boleh diulang)")
+    args = parser.parse_args()
+
+    sizes = []
+    if args.file:
+        for path in args.file:
+            df = pd.read_csv(path, dtype=object) if path.lower().endswith(".csv") else pd.read_excel(path)
+            sizes.append(report(os.path.basename(path)[:24], df, dtype_plan.optimize))
+    else:
+        rng = np.random.default_rng(args.seed)
+        sizes.append(report("Performa Produk", synth_performa_produk(args.rows, rng), dtype_plan.optimize))
+        sizes.append(report("Analitik Produk", synth_analitik(args.rows, rng), analitik_plan))
+        sizes.append(report("TikTok daily dataset", synth_tiktok_daily(args.rows, rng), tiktok_plan))
+
+    # ID unik per baris (TikTok) tidak bisa dipadatkan jauh, jadi target dihitung dari total semua frame
+    total_before, total_after = sum(b for b, _ in sizes), sum(a for _, a in sizes)
+    ratio = total_before / total_after if total_after else float("inf")
+    print(f"\ntotal: {total_before:.2f} MB -> {total_after:.2f} MB = x{ratio:.1f} (target >= x{TARGET_RATIO:.0f})")
+    return 0 if ratio >= TARGET_RATIO or args.file else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
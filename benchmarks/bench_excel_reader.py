@@ -0,0 +1,108 @@
+# bench_excel_reader.py
+# Parity check + benchmark backend baca Excel (excel_reader.py): openpyxl vs calamine, untuk pola baca
+# yang dipakai loader aplikasi (Shopee Out, Analitik, Meta header=0/2, TikTok Fixer & Daily).
+#
+#   python benchmarks/bench_excel_reader.py                        # data sintetis
+#   python benchmarks/bench_excel_reader.py --rows 200000
+#   python benchmarks/bench_excel_reader.py --file export.xlsx     # export asli (boleh diulang)
+#
+# calamine butuh `pip install python-calamine`; jika belum terpasang hanya waktu openpyxl yang diukur.
+# Keluar dengan kode 1 jika hasil calamine berbeda dari openpyxl.
+
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import excel_reader  # noqa: E402
+
+# nama -> argumen read_excel, mengikuti pemanggilan di loader
+READS = {
+    "default (Shopee Out, Meta)": {},
+    "dtype=str (Converter)": {"dtype": str},
+    "dtype=object (Analitik)": {"dtype": object},
+    "header=2 (TikTok, Meta)": {"header": 2},
+}
+
+
+def synth_workbook(rows, rng) -> bytes:
+    # Layout laporan TikTok: A1 tanggal, header tabel di baris 3; isi campuran teks/angka/tanggal/kosong
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = datetime(2026, 10, 1)
+    ws.append([])
+    ws.append(["ID", "Produk", "Status", "GMV", "Pesanan", "Rasio klik-tayang", "Harga (teks)", "Tanggal"])
+    start = datetime(2026, 9, 1)
+    for i in range(rows):
+        ws.append([str(10**17 + i), f"Produk {i % 500}, Warna {i % 7}", "Aktif" if i % 3 else None,
+                   float(rng.random() * 1e6), int(rng.integers(0, 100)), float(rng.random()),
+                   f"{int(rng.integers(10**4, 10**6)):,}".replace(",", "."), start + timedelta(days=i % 30)])
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def _time(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def _same(a, b) -> bool:
+    try:
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
+        return True
+    except AssertionError as e:
+        print(f"    {str(e).splitlines()[0][:160]}")
+        return False
+
+
+def check(label, data: bytes) -> bool:
+    ok = True
+    for name, kwargs in READS.items():
+        old, t_old = _time(lambda: excel_reader.read_excel(data, engine="openpyxl", **kwargs))
+        if not excel_reader.HAS_CALAMINE:
+            print(f"{label[:20]:<20} {name:<28} {len(old):>9,} {t_old:>10.1f} {'-':>10} {'-':>9}  dilewati")
+            continue
+        new, t_new = _time(lambda: excel_reader.read_excel(data, engine="calamine", **kwargs))
+        same = _same(old, new)
+        ok &= same
+        print(f"{label[:20]:<20} {name:<28} {len(old):>9,} {t_old:>10.1f} {t_new:>10.1f} {t_old / t_new:>8.1f}x  {'OK' if same else 'BEDA'}")
+    if excel_reader.HAS_CALAMINE:
+        a1_old = excel_reader.first_cell(data, engine="openpyxl")
+        a1_new = excel_reader.first_cell(data, engine="calamine")
+        ok &= a1_old == a1_new
+        print(f"{label[:20]:<20} {'A1 (tanggal TikTok)':<28} {'':>9} {'':>10} {'':>10} {'':>9}  {'OK' if a1_old == a1_new else f'BEDA {a1_old!r} vs {a1_new!r}'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity & benchmark backend baca Excel (openpyxl vs calamine)")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--file", action="append", default=[], help="export .xlsx asli (boleh diulang)")
+    args = parser.parse_args()
+
+    print(f"backend aktif: {excel_reader.backend()} (ADS_EXCEL_READER={excel_reader.config.EXCEL_READER})")
+    if not excel_reader.HAS_CALAMINE:
+        print("python-calamine belum terpasang (pip install python-calamine): hanya openpyxl yang diukur.")
+    print(f"{'data':<20} {'pola baca':<28} {'baris':>9} {'openpyxl':>10} {'calamine':>10} {'speedup':>9}  parity")
+    ok = True
+    if args.file:
+        for path in args.file:
+            ok &= check(os.path.basename(path), open(path, "rb").read())
+    else:
+        ok &= check("sintetis", synth_workbook(args.rows, np.random.default_rng(args.seed)))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
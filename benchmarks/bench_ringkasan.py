@@ -0,0 +1,120 @@
+# bench_ringkasan.py
+# Parity check + benchmark generate_ringkasan (vektor) vs implementasi lama (iterrows per baris).
+#
+#   python benchmarks/bench_ringkasan.py                       # data sintetis
+#   python benchmarks/bench_ringkasan.py --rows 200000
+#   python benchmarks/bench_ringkasan.py --file performa.xlsx  # export Shopee Out asli (boleh diulang)
+#
+# Input ringkasan = hasil filter Produk Terjual & ATC (filter_terjual_atc), sama seperti di aplikasi.
+# Keluar dengan kode 1 jika ada output yang berbeda dari implementasi lama.
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from platforms import shopee  # noqa: E402
+
+
+def generate_ringkasan_lama(df_source):
+    # Salinan implementasi sebelum divektorisasi, dipakai sebagai acuan parity
+    res = {"Sales": [], "Traffic": [], "Instagram": []}
+    if not df_source.empty:
+        for _, r in df_source.iterrows():
+            ch = str(r["Channel"]).lower()
+            prod_short = shopee.short_nama_iklan(r["Produk"], max_words=2)
+            if "sales" in ch: res["Sales"].append(prod_short)
+            elif "traffic" in ch: res["Traffic"].append(prod_short)
+            elif "ig" in ch or "instagram" in ch: res["Instagram"].append(prod_short)
+            else: res["Sales"].append(prod_short)
+
+    final_dict = {}
+    for k in ["Sales", "Traffic", "Instagram"]:
+        unique_items = list(dict.fromkeys(res[k]))
+        if unique_items:
+            final_dict[k] = " ".join([f"{n}," for n in unique_items])
+        else:
+            final_dict[k] = ""
+    return pd.DataFrame([final_dict])
+
+
+def synth_performa_produk(rows, rng):
+    channels = np.array(["Iklan Shopee - Sales", "Iklan Shopee - Traffic", "IG Story", "Instagram Feed", "Live Shopee", "Affiliate"], dtype=object)
+    words = ["Gamis", "Dress", "Set", "Abaya", "Khimar", "Tunik", "Rok", "Outer", "Pashmina", "Blouse"]
+    motif = ["Zahra", "Amira", "Kirana", "Nadia", "Salsa", "Aisyah", "Hana", "Laras"]
+    pool = np.array([
+        f"[{i % 7}] {motif[i % len(motif)]} {words[i % len(words)]} Rayon Premium - Busui Friendly {i:04d} | Official Shop"
+        for i in range(5000)
+    ], dtype=object)
+    return pd.DataFrame({
+        "Channel": channels[rng.integers(0, len(channels), rows)],
+        "Kode Produk": rng.integers(10**9, 10**9 + 5000, rows),
+        "Produk": pool[rng.integers(0, len(pool), rows)],
+        "Produk.1": rng.integers(0, 3, rows),
+        "Produk Ditambahkan ke Keranjang": rng.integers(0, 3, rows),
+    })
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def check(label, df_performa):
+    df_sorted = df_performa.sort_values(by=["Channel", "Kode Produk"]) if "Kode Produk" in df_performa.columns else df_performa
+    df_terjual, df_atc, missing = shopee.filter_terjual_atc(df_sorted, ["Channel", "Produk"])
+    if missing:
+        print(f"{label:<24} dilewati: kolom tidak lengkap {missing}")
+        return True
+
+    ok = True
+    for name, src in [("terjual", df_terjual), ("atc", df_atc)]:
+        old, t_old = _time(generate_ringkasan_lama, src)
+        new, t_new = _time(shopee.generate_ringkasan, src)
+        same = old.equals(new)
+        ok &= same
+        speedup = t_old / t_new if t_new else float("inf")
+        print(f"{label[:24]:<24} {name:<8} {len(src):>9,} {t_old:>10.1f} {t_new:>10.1f} {speedup:>8.1f}x  {'OK' if same else 'BEDA'}")
+        if not same:
+            for col in shopee.RINGKASAN_PLATFORMS:
+                if old[col].iloc[0] != new[col].iloc[0]:
+                    print(f"    {col}:\n      lama: {old[col].iloc[0][:200]}\n      baru: {new[col].iloc[0][:200]}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity & benchmark generate_ringkasan")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--file", action="append", default=[], help="export Shopee Out (.xlsx) asli (boleh diulang)")
+    args = parser.parse_args()
+
+    print(f"{'data':<24} {'filter':<8} {'baris':>9} {'lama (ms)':>10} {'baru (ms)':>10} {'speedup':>9}  parity")
+    ok = True
+    if args.file:
+        for path in args.file:
+            res = shopee.read_performa_produk(os.path.basename(path), open(path, "rb").read())
+            if res.get("error"):
+                print(f"{os.path.basename(path)}: gagal dibaca ({res['error']})")
+                ok = False
+                continue
+            ok &= check(os.path.basename(path), res["df"])
+    else:
+        rng = np.random.default_rng(args.seed)
+        ok &= check("sintetis", synth_performa_produk(args.rows, rng))
+        # Kasus tepi: frame kosong & channel/produk kosong (NaN)
+        edge = synth_performa_produk(200, rng)
+        edge.loc[::17, "Channel"] = np.nan
+        ok &= check("sintetis (Channel NaN)", edge)
+        ok &= check("kosong", edge.iloc[0:0])
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
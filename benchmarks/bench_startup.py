@@ -0,0 +1,84 @@
+# bench_startup.py
+# Mengukur waktu start-up (cold) dan rerun (warm) aplikasi Streamlit per halaman.
+# Tiap skenario dijalankan di proses Python baru agar import benar-benar dingin.
+#
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --repeat 5 --compare 3514368   # bandingkan dengan app.py di revisi git lain
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_DIR = os.path.join(ROOT, "app")
+PAGES = ["Panduan", "Shopee", "Meta", "TikTok", "Query"]
+
+# Dijalankan di subprocess: cold run (import + render pertama) lalu beberapa warm rerun
+_PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {app_dir!r})
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter() - t0
+at = AppTest.from_file({script!r}, default_timeout=120)
+at.session_state["page"] = {page!r}
+t0 = time.perf_counter(); at.run(); cold = time.perf_counter() - t0
+warm = []
+for _ in range(3):
+    t0 = time.perf_counter(); at.run(); warm.append(time.perf_counter() - t0)
+print(json.dumps({{
+    "streamlit_import_ms": t_import * 1000,
+    "cold_ms": cold * 1000,
+    "warm_ms": min(warm) * 1000,
+    "pandas_loaded": "pandas" in sys.modules,
+    "openpyxl_loaded": "openpyxl" in sys.modules,
+    "errors": len(at.exception),
+}}))
+"""
+
+
+def probe(script, page):
+    code = _PROBE.format(app_dir=APP_DIR, script=script, page=page)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=APP_DIR)
+    lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+    if not lines:
+        raise RuntimeError(out.stderr[-2000:])
+    return json.loads(lines[-1])
+
+
+def run_suite(label, script, repeat):
+    print(f"\n== {label}")
+    print(f"{'halaman':<10} {'cold (ms)':>10} {'warm rerun (ms)':>16}  pandas  openpyxl")
+    for page in PAGES:
+        runs = [probe(script, page) for _ in range(repeat)]
+        cold = statistics.median(r["cold_ms"] for r in runs)
+        warm = statistics.median(r["warm_ms"] for r in runs)
+        last = runs[-1]
+        flag = "" if not last["errors"] else f"  ({last['errors']} exception)"
+        print(f"{page:<10} {cold:>10.1f} {warm:>16.1f}  {str(last['pandas_loaded']):<6}  {last['openpyxl_loaded']}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark start-up & rerun per halaman")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare", help="revisi git berisi app.py lama untuk dibandingkan")
+    args = parser.parse_args()
+
+    run_suite("app.py (sekarang)", os.path.join(APP_DIR, "app.py"), args.repeat)
+
+    if args.compare:
+        src = subprocess.run(["git", "show", f"{args.compare}:app/app.py"], capture_output=True, text=True,
+                             cwd=ROOT, check=True).stdout
+        with tempfile.TemporaryDirectory() as tmp:
+            script = os.path.join(tmp, "app.py")
+            with open(script, "w") as f:
+                f.write(src)
+            run_suite(f"app.py @ {args.compare}", script, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
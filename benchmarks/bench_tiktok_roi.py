@@ -0,0 +1,195 @@
+# bench_tiktok_roi.py
+# Parity check + benchmark pewarnaan ROI TikTok: implementasi lama (Styler.apply per baris + loop
+# number_format openpyxl) vs roi_row_fills + write_roi_workbook.
+#
+#   python benchmarks/bench_tiktok_roi.py                  # 20.000 baris sintetis
+#   python benchmarks/bench_tiktok_roi.py --rows 100000
+#   python benchmarks/bench_tiktok_roi.py --skip-legacy    # hanya jalur baru (cepat untuk data besar)
+#   python benchmarks/bench_tiktok_roi.py --engine openpyxl  # jalur cadangan tanpa xlsxwriter
+#
+# Parity: warna tiap baris (dan sel Status "perlu otorisasi") dari workbook baru dibaca ulang dan
+# dibandingkan dengan highlight_row lama. Keluar dengan kode 1 jika ada yang berbeda.
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from platforms import tiktok  # noqa: E402
+
+
+def make_highlighter_lama(col_biaya, col_pendapatan, col_roi, col_status):
+    # Salinan highlighter sebelum divektorisasi (parse_val per sel), dipakai sebagai acuan
+    def highlight_row(row):
+        styles = [''] * len(row)
+        idx = {c: i for i, c in enumerate(row.index)}
+
+        def parse_val(val):
+            try:
+                if pd.isna(val): return np.nan
+                if isinstance(val, (int, float, np.floating, np.integer)): return float(val)
+                s = str(val).strip()
+                if s == "": return np.nan
+                had_pct = "%" in s
+                if s.startswith("(") and s.endswith(")"): s = "-" + s[1:-1]
+                num = float(s.replace("%", "").replace(",", "").replace(" ", ""))
+                return num / 100.0 if had_pct else num
+            except Exception:
+                return np.nan
+
+        biaya_val = parse_val(row[col_biaya]) if col_biaya in row.index else np.nan
+        pendapatan_val = parse_val(row[col_pendapatan]) if col_pendapatan in row.index else np.nan
+        roi_val = parse_val(row[col_roi]) if col_roi in row.index else np.nan
+
+        if col_status is not None and col_status in row.index:
+            status_text = str(row[col_status]).strip().lower() if pd.notna(row[col_status]) else ""
+            if status_text == "perlu otorisasi":
+                styles = ['background-color: #98f073'] * len(row)
+                if col_status in idx: styles[idx[col_status]] = 'background-color: #ff7979'
+                return styles
+
+        if pd.isna(roi_val): return styles
+        biaya_pos = (pd.notna(biaya_val) and biaya_val > 0)
+        pendapatan_pos = (pd.notna(pendapatan_val) and pendapatan_val > 0)
+        if not (biaya_pos or pendapatan_pos) or roi_val == 0: return styles
+        if roi_val >= 10: return ['background-color: #00ff00'] * len(row)
+        if roi_val < 10: return ['background-color: #ffff00'] * len(row)
+        return styles
+    return highlight_row
+
+
+def synth_campaigns(rows, rng):
+    status = np.array(["Aktif", "Tidak aktif", "Perlu otorisasi", None], dtype=object)
+    biaya = np.round(rng.gamma(1.2, 150_000, rows), 0)
+    biaya[rng.random(rows) < 0.15] = 0
+    roi = np.round(rng.gamma(2.0, 4.0, rows), 2)
+    roi[rng.random(rows) < 0.1] = 0
+    df = pd.DataFrame({
+        "ID Campaign": [f"{17_000_000_000_000_000 + i}" for i in range(rows)],
+        "Nama Campaign": [f"GMV Max {i % 800:04d}" for i in range(rows)],
+        "Status": status[rng.integers(0, len(status), rows)],
+        "Biaya": biaya,
+        "Pendapatan kotor": np.round(biaya * roi, 0),
+        "ROI": roi.astype(object),
+        "Tingkat klik iklan produk": [f"{x:.2f}%" for x in rng.random(rows) * 5],
+        "Rasio konversi iklan": [f"{x:.2f}%" for x in rng.random(rows) * 10],
+        "Impresi": rng.integers(0, 1_000_000, rows),
+    })
+    # Sebagian ROI berupa teks seperti di export asli
+    text_rows = rng.random(rows) < 0.05
+    df.loc[text_rows, "ROI"] = [f"{v:,.2f}" for v in roi[text_rows]]
+    df.loc[rng.random(rows) < 0.02, "ROI"] = "-"
+    return df
+
+
+def run_lama(df):
+    biaya, roi, pend = "Biaya", "ROI", "Pendapatan kotor"
+    delete_mask = (tiktok.series_to_numeric_like(df[biaya]) == 0) & (tiktok.series_to_numeric_like(df[pend]) == 0) & (tiktok.series_to_numeric_like(df[roi]) == 0)
+    df_colored = df.loc[~delete_mask].copy()
+    pct_present = [c for c in tiktok.percent_cols if c in df_colored.columns]
+    for c in pct_present: df_colored[c] = tiktok.series_to_numeric_like(df_colored[c])
+    highlighter = make_highlighter_lama(biaya, pend, roi, "Status")
+    styled = df_colored.style.apply(highlighter, axis=1)
+    css = styled._compute().ctx  # (baris, kolom) -> [(prop, val)]
+
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        styled.to_excel(writer, sheet_name="DATA_COLORED", index=False)
+        df.to_excel(writer, sheet_name="DATA_ASLI", index=False)
+        ws = writer.sheets["DATA_COLORED"]
+        for col in pct_present:
+            col_idx = df_colored.columns.get_loc(col) + 1
+            for row_cells in ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, max_row=ws.max_row):
+                for cell in row_cells:
+                    if isinstance(cell.value, (int, float, complex)) and not isinstance(cell.value, bool):
+                        cell.number_format = '0.00%'
+    return buffer, df_colored, css
+
+
+def run_baru(df):
+    num = {c: tiktok.series_to_numeric_like(df[c]) for c in ["Biaya", "Pendapatan kotor", "ROI"]}
+    keep = ~((num["Biaya"] == 0) & (num["Pendapatan kotor"] == 0) & (num["ROI"] == 0))
+    df_colored = df.loc[keep].copy()
+    pct_present = [c for c in tiktok.percent_cols if c in df_colored.columns]
+    for c in pct_present: df_colored[c] = tiktok.series_to_numeric_like(df_colored[c])
+    fills, otorisasi = tiktok.roi_row_fills(num["Biaya"][keep], num["Pendapatan kotor"][keep], num["ROI"][keep], df_colored["Status"])
+    buffer = io.BytesIO()
+    tiktok.write_roi_workbook(buffer, df_colored, df, fills, otorisasi, "Status", pct_present)
+    return buffer, df_colored, fills, otorisasi
+
+
+def expected_fills(css, n_rows, n_cols):
+    # Warna (hex kapital) per sel dari hasil Styler lama
+    out = np.full((n_rows, n_cols), "", dtype=object)
+    for (r, c), props in css.items():
+        for prop, val in props:
+            if prop == "background-color" and val:
+                out[r, c] = val.lstrip("#").upper()
+    return out
+
+
+def read_fills(buffer, n_rows, n_cols):
+    buffer.seek(0)
+    ws = load_workbook(buffer)["DATA_COLORED"]
+    out = np.full((n_rows, n_cols), "", dtype=object)
+    for r, row_cells in enumerate(ws.iter_rows(min_row=2, max_row=n_rows + 1, max_col=n_cols)):
+        for c, cell in enumerate(row_cells):
+            if cell.fill is not None and cell.fill.fill_type == "solid":
+                out[r, c] = str(cell.fill.fgColor.rgb)[-6:].upper()
+    return out
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity & benchmark pewarnaan ROI TikTok")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-legacy", action="store_true", help="lewati jalur lama (lambat untuk data besar)")
+    parser.add_argument("--engine", choices=["xlsxwriter", "openpyxl"], help="paksa engine jalur baru (default: EXCEL_ENGINE)")
+    args = parser.parse_args()
+    if args.engine:
+        tiktok.EXCEL_ENGINE = args.engine
+
+    df = synth_campaigns(args.rows, np.random.default_rng(args.seed))
+    print(f"engine: {tiktok.EXCEL_ENGINE}, baris: {len(df):,}")
+
+    (buf_baru, df_colored, fills, otorisasi), t_baru = _time(run_baru, df)
+    print(f"baru : {t_baru:8.2f} s ({buf_baru.getbuffer().nbytes / 1e6:.1f} MB)")
+    if args.skip_legacy:
+        return 0
+
+    (buf_lama, df_lama, css), t_lama = _time(run_lama, df)
+    print(f"lama : {t_lama:8.2f} s ({buf_lama.getbuffer().nbytes / 1e6:.1f} MB)  -> x{t_lama / t_baru:.1f} lebih cepat")
+
+    # Tahap pewarnaan saja (tanpa menulis workbook)
+    _, t_warna_baru = _time(lambda: tiktok.roi_row_fills(*(tiktok.series_to_numeric_like(df[c]) for c in ["Biaya", "Pendapatan kotor", "ROI"]), df["Status"]))
+    _, t_warna_lama = _time(lambda: df.style.apply(make_highlighter_lama("Biaya", "Pendapatan kotor", "ROI", "Status"), axis=1)._compute())
+    print(f"warna: lama {t_warna_lama:.2f} s vs baru {t_warna_baru:.2f} s -> x{t_warna_lama / t_warna_baru:.0f}")
+
+    n_rows, n_cols = len(df_colored), len(df_colored.columns)
+    want = expected_fills(css, n_rows, n_cols)
+    got = read_fills(buf_baru, n_rows, n_cols)
+    diff = np.argwhere(want != got)
+    if len(diff) or len(df_lama) != n_rows:
+        print(f"PARITY GAGAL: {len(diff)} sel berbeda, contoh (baris, kolom): {diff[:5].tolist()}")
+        for r, c in diff[:5]:
+            print(f"  baris {r} kolom {df_colored.columns[c]!r}: lama={want[r, c]!r} baru={got[r, c]!r}")
+        return 1
+    print(f"parity OK: warna {n_rows:,} baris x {n_cols} kolom identik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# conftest.py
+# Modul aplikasi di-import dengan nama polos (seperti saat `streamlit run app/app.py`), jadi app/ masuk sys.path.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
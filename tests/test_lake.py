@@ -0,0 +1,42 @@
+# test_lake.py
+# Export Shopee Out yang sama lewat mode 1 toko dan mode banyak toko harus jadi satu file lake (tanpa tanggal).
+
+import io
+
+import pandas as pd
+import pytest
+
+import lake
+import upload_cache
+from platforms import shopee
+
+
+@pytest.fixture
+def lake_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lake, "LAKE_DIR", str(tmp_path / "lake"))
+    monkeypatch.setattr(lake.config, "LAKE_ENABLED", True)
+    return tmp_path / "lake"
+
+
+def _performa_xlsx() -> bytes:
+    out = io.BytesIO()
+    with pd.ExcelWriter(out) as writer:
+        pd.DataFrame({"Channel": ["A", "B"], "Kode Produk": ["1", "2"], "Produk": ["x", "y"]}).to_excel(
+            writer, sheet_name="Performa Produk", index=False)
+    return out.getvalue()
+
+
+def test_shopee_out_single_and_batch_share_one_lake_file(lake_dir):
+    data = _performa_xlsx()
+    single = pd.read_excel(io.BytesIO(data), sheet_name="Performa Produk").sort_values(["Channel", "Kode Produk"])
+    lake.save("shopee_performa", single, None, "toko", derived={shopee.COL_TOKO: "toko"},
+              signature=upload_cache.content_key("shopee_performa", data))
+
+    results = [shopee.read_performa_produk("toko.xlsx", data)]
+    combined = shopee.combine_performa_produk(results)
+    signatures = {r["toko"]: r["signature"] for r in results if "toko" in r}
+    for toko, part in combined.groupby(shopee.COL_TOKO, observed=True):
+        lake.save("shopee_performa", part, None, str(toko), signature=signatures.get(toko))
+
+    assert len(list(lake_dir.glob("shopee_performa/*/*.parquet"))) == 1
+    assert lake.query("SELECT count(*) AS n FROM shopee_performa")["n"].iloc[0] == 2
@@ -0,0 +1,39 @@
+# test_shopee_analitik.py
+# Load Analitik Produk dari .xlsx: kolom metrik yang seluruhnya angka (int Python di dtype=object)
+# dan kolom teks angka format Indonesia ("1.234") harus sama-sama terbaca sebagai angka.
+
+import io
+
+import pandas as pd
+from openpyxl import Workbook
+
+from platforms import shopee
+
+
+def _xlsx(rows) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def test_load_analitik_xlsx_integer_and_text_metrics():
+    data = _xlsx([
+        ["Kode Produk", "Nama Variasi", "Pengunjung Produk (Kunjungan)", "Halaman Produk Dilihat"],
+        ["1001", "Merah,XL", 100, "1.234"],
+        ["1001", "Biru,L", 40, "2.500,5"],
+    ])
+    df = shopee.load_analitik_frame("analitik.xlsx", data)
+    assert df["Pengunjung Produk (Kunjungan)"].tolist() == [100, 40]
+    assert df["Halaman Produk Dilihat"].tolist() == [1234.0, 2500.5]
+
+
+def test_clean_idr_numbers_mixed_cells():
+    values = pd.Series(["1.234", "12,5%", "-", "", None, 5, 2.5, "abc"], dtype=object)
+    out = shopee.clean_idr_numbers(values)
+    assert out.iloc[:4].tolist() == [1234.0, 12.5, 0.0, 0.0]
+    assert pd.isna(out.iloc[4]) and pd.isna(out.iloc[7])
+    assert out.iloc[5:7].tolist() == [5.0, 2.5]
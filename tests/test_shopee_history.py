@@ -0,0 +1,34 @@
+# test_shopee_history.py
+# Histori Shopee Ads ditulis dari job latar belakang yang berjalan paralel (process pool "spawn" seperti jobs.py):
+# tanggal berbeda tidak boleh saling menghapus total harian, akun berbeda di tanggal sama tidak boleh saling menimpa.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+import shopee_history
+
+
+def _report() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Nama Iklan": ["A", "B"], "Biaya": [1.0, 2.0], "Produk Terjual": [1, 1],
+        "Penjualan Langsung (GMV Langsung)": [5.0, 5.0], "Efektifitas Iklan": [5.0, 2.5], "Kategori": ["HIJAU", "MERAH"],
+    })
+
+
+def test_parallel_save_daily_keeps_every_date_and_account(tmp_path, monkeypatch):
+    # Worker "spawn" meng-import config ulang, jadi lokasi data diteruskan lewat env
+    monkeypatch.setenv("ADS_DATA_DIR", str(tmp_path))
+    days, accounts = 10, 3
+    with ProcessPoolExecutor(6, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(shopee_history.save_daily, _report(), date(2026, 1, 1) + timedelta(days=i), f"akun{a}.csv")
+                   for a in range(accounts) for i in range(days)]
+        assert [f.result() for f in futures] == [2] * (days * accounts)
+
+    totals = pd.read_parquet(os.path.join(tmp_path, "shopee_ads", "daily_totals.parquet"))
+    assert len(totals) == days
+    assert totals["Biaya"].tolist() == [3.0 * accounts] * days
+    assert totals["Jumlah Iklan"].tolist() == [2] * days